@@ -3,13 +3,14 @@
 # authors: Michael Curley & Drake Moore
 #
 
+from gameState import GameState
 from iActor import IActor
+from iController import IController
 from interactable import Interactable
 from moveResult import MoveResult
 from tile import Tile
 from point import Point
 from copy import copy
-from room import Room
 
 
 class Actor(IActor):
@@ -25,7 +26,8 @@ class Actor(IActor):
             hitpoints: int = None, lifepoints: int = None):
         """ an actor may not have a starting location or require special
         traversable tiles, traversable tiles is a list of Tile or Interactable,
-        identifier must be a 1 character string """
+        identifier must be a 1 character string, an actor given no controller
+        ignores updates and cannot be asked to move """
         self.__validateIdentifier(identifier)
         self.__validateMoveRange(moveRange)
         self.__validateTraversableTiles(traversableTiles)
@@ -37,8 +39,7 @@ class Actor(IActor):
         self.location = startLocation
         self.traversableTiles = set(self.DefaultTraversableTiles if
                 traversableTiles is None else traversableTiles)
-        from consoleController import ConsoleController # TODO circular dependency
-        self.controller = ConsoleController() if controller is None else controller
+        self.controller = IController() if controller is None else controller
         self.expelled = False
         self.exited = False
         self.collectedKey = False
@@ -67,7 +68,6 @@ class Actor(IActor):
 
     def updateGameState(self, gameState):
         """ updates the current game state for this actor """
-        from gameState import GameState # TODO circular dependency
         if not isinstance(gameState, GameState):
             raise ValueError('An Actor must be given a valid GameState.')
         self.controller.updateGameState(gameState)
@@ -75,7 +75,6 @@ class Actor(IActor):
 
     def requestMove(self, gameState) -> Point:
         """ returns a point based on the given game state """
-        from gameState import GameState # TODO circular dependency
         if not isinstance(gameState, GameState):
             raise ValueError('An Actor must be given a valid GameState.')
         return self.controller.requestMove(gameState)
@@ -86,6 +85,11 @@ class Actor(IActor):
         return self.controller.updateMoveResult(moveResult)
 
 
+    def flush(self):
+        """ delivers any updates the controller is holding back """
+        self.controller.flush()
+
+
     def getCensoredActor(self):
         """ returns a copy of this actor with censored game state information """
         censoredActor = copy(self)
@@ -119,8 +123,7 @@ class Actor(IActor):
     
     def __validateController(self, controller):
         """ raises value error if the given controller is invalid """
-        from controller import Controller
-        if controller is not None and not isinstance(controller, Controller):
+        if controller is not None and not isinstance(controller, IController):
             raise ValueError('An Actor must be given a valid controller or None.')
 
 
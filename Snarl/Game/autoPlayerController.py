@@ -0,0 +1,263 @@
+#
+# autoPlayerController.py
+# authors: Michael Curley & Drake Moore
+#
+
+from actor import Actor, Adversary, Player
+from controller import Controller
+from exploredMap import ExploredMap
+from gameState import GameState
+from heapq import heappop, heappush
+from moveResult import MoveResult
+from point import Point
+
+
+class AutoPlayerController(Controller):
+    """ represents an automated player, it walks to the key and then the exit
+    along the cheapest path over the tiles it has seen (unseen tiles are taken
+    to be open until seen otherwise) and explores toward the nearest unseen
+    tiles while it does not know where its target is, tiles next to where an
+    adversary was last seen cost more to walk through and it never moves onto
+    an adversary, the path is kept between turns and only searched again when
+    it is blocked, the target changes or an adversary comes near it, and a
+    search visits a bounded number of tiles so a move takes milliseconds,
+    the map is the client's explored map when the game state has one (a
+    remote player) and otherwise its own, built from the actor's view """
+
+    # the extra cost of walking through a tile next to an adversary
+    AdversaryCost = 8
+
+    # the most turns spent backing away from the adversaries before a step
+    # along the path is taken regardless, forgotten after as many turns in a
+    # row with no adversary in view
+    MaxEvasions = 3
+
+    # the most tiles a search visits before it gives up
+    MaxSearchNodes = 5000
+
+    # the order neighbors are walked in, up, down, left then right
+    NeighborDeltas = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+
+    # the message sent to every player when the key is found
+    KeyFoundMessage = 'found the key'
+
+    def __init__(self, name: str = None):
+        """ the name is given to a remote server, a unique one is made if none
+        is given """
+        self.name = name
+        self.exploredMap = ExploredMap()
+        self.currentLevel = None
+        self.keyLocation = None
+        self.exitLocation = None
+        self.keyCollected = False
+        self.target = None
+        self.path = list()
+        self.adversaries = set()
+        self.evasions = 0
+        self.calmTurns = 0
+
+
+    def getName(self) -> str:
+        return super().getName() if self.name is None else self.name
+
+
+    def updateGameState(self, gameState: GameState):
+        """ notes the key once any player has found it, a remote player is
+        only told in the update sent right after, which may come between its
+        turns and be followed by others before its next turn """
+        if gameState.currentLevel != self.currentLevel:
+            self.__startLevel(gameState.currentLevel)
+        if self.__isKeyFound(gameState):
+            self.keyCollected = True
+
+
+    def updateMoveResult(self, moveResult: MoveResult):
+        """ notes the key once this player has found it """
+        if moveResult == MoveResult.Key:
+            self.keyCollected = True
+
+
+    def requestMove(self, gameState: GameState) -> Point:
+        """ returns the furthest valid move along the path to the current
+        target that is not next to an adversary, otherwise the valid move
+        furthest from the adversaries (for a few turns at most, then the path
+        is followed anyway) """
+        if gameState.currentLevel != self.currentLevel:
+            self.__startLevel(gameState.currentLevel)
+        tiles, visible = self.__readView(gameState)
+        adversaries = self.adversaries
+        self.__updateTargets(gameState)
+        location = (gameState.actor.location.X, gameState.actor.location.Y)
+        costs = self.__createAdversaryCosts(adversaries)
+        target = self.exitLocation if self.keyCollected else self.keyLocation
+        if not self.__isPathUsable(tiles, location, target, costs):
+            self.target = target
+            self.path = self.__search(tiles, location, target, costs)
+            if len(self.path) == 0 and target is None and self.exitLocation is not None:
+                # nothing is left to explore and the key was not seen, so it
+                # is waited for next to the exit rather than where it stands
+                self.path = self.__search(tiles, location, self.exitLocation, costs)[:-1]
+        validMoves = gameState.listValidMoves()
+        steps = [ Point(x, y) for x, y in reversed(self.path[:gameState.actor.moveRange])
+                if Point(x, y) in validMoves and (x, y) not in adversaries ]
+        safeSteps = [ step for step in steps if (step.X, step.Y) not in costs ]
+        self.calmTurns = self.calmTurns + 1 if len(visible) == 0 else 0
+        if self.calmTurns > AutoPlayerController.MaxEvasions:
+            self.evasions = 0
+        if len(safeSteps) > 0 or (len(steps) > 0 and
+                self.evasions >= AutoPlayerController.MaxEvasions):
+            return (safeSteps + steps)[0]
+        self.evasions += 1
+        return self.__chooseSafestMove(validMoves, adversaries)
+
+
+    def __startLevel(self, currentLevel: int):
+        """ forgets everything known about the last level """
+        self.currentLevel = currentLevel
+        self.exploredMap.reset()
+        self.keyLocation = None
+        self.exitLocation = None
+        self.keyCollected = False
+        self.target = None
+        self.path = list()
+        self.adversaries = set()
+        self.evasions = 0
+        self.calmTurns = 0
+
+
+    def __readView(self, gameState: GameState) -> (dict, set):
+        """ returns the explored tiles by (x, y) and the (x, y) of every
+        adversary in view, an adversary is remembered where it was last seen
+        until that tile is seen again and the actor's view is merged into this
+        controller's map unless the game state has an explored map """
+        floorPlan = gameState.floorPlan
+        ul = floorPlan.upperLeftPosition
+        lr = floorPlan.lowerRightPosition
+        actor = gameState.actor
+        radius = actor.viewRadius if actor.viewRadius > 0 else max(floorPlan.width, floorPlan.height)
+        first = Point(max(ul.X, actor.location.X - radius), max(ul.Y, actor.location.Y - radius))
+        last = Point(min(lr.X, actor.location.X + radius), min(lr.Y, actor.location.Y + radius))
+        view = [ row[first.X - ul.X:last.X - ul.X + 1]
+                for row in floorPlan.layout[first.Y - ul.Y:last.Y - ul.Y + 1] ]
+        adversaries = { (first.X + col, first.Y + row)
+                for row, tiles in enumerate(view) for col, tile in enumerate(tiles)
+                    if isinstance(tile, Adversary) }
+        self.adversaries = { (x, y) for x, y in self.adversaries
+                if x < first.X or x > last.X or y < first.Y or y > last.Y } | adversaries
+        exploredMap = gameState.exploredMap if getattr(gameState, 'exploredMap', None) \
+                is not None else self.exploredMap
+        if exploredMap is self.exploredMap and len(view) > 0:
+            self.exploredMap.merge(first, [ [ tile.replacedTile if isinstance(tile, Actor)
+                    else tile for tile in tiles ] for tiles in view ])
+        return exploredMap.tiles, adversaries
+
+
+    def __updateTargets(self, gameState: GameState):
+        """ remembers where the key and exit were seen and notes the key once
+        any player has found it, a remote player only sees the key while it is
+        in view so a key missing from its remembered location was found """
+        if gameState.exitLocation is not None:
+            self.exitLocation = (gameState.exitLocation.X, gameState.exitLocation.Y)
+        if gameState.keyLocation is not None:
+            self.keyLocation = (gameState.keyLocation.X, gameState.keyLocation.Y)
+        elif self.keyLocation is not None and gameState.floorPlan.tilePositionWithinBounds(
+                Point(self.keyLocation[0], self.keyLocation[1])):
+            self.keyCollected = True
+        if self.__isKeyFound(gameState):
+            self.keyCollected = True
+
+
+    def __isKeyFound(self, gameState: GameState) -> bool:
+        """ returns if the game state shows the key was found, the exit of a
+        remote player's game state is never unlocked so only the message
+        tells it """
+        return gameState.exitUnlocked or any(AutoPlayerController.KeyFoundMessage in message
+                for message in ([] if gameState.messages is None else gameState.messages))
+
+
+    def __createAdversaryCosts(self, adversaries: set) -> dict:
+        """ returns the extra cost of each tile around the adversaries, twice
+        as much for an adversary's own tile """
+        costs = dict()
+        for x, y in adversaries:
+            for dx in range(-1, 2):
+                for dy in range(-1, 2):
+                    costs[(x + dx, y + dy)] = AutoPlayerController.AdversaryCost
+        for adversary in adversaries:
+            costs[adversary] = 2 * AutoPlayerController.AdversaryCost
+        return costs
+
+
+    def __isPathUsable(self, tiles: dict, location: tuple, target: tuple,
+            costs: dict) -> bool:
+        """ returns if the kept path still leads to the target from the
+        location, only passes through open or unseen tiles and keeps clear of
+        the adversaries, the steps already taken are dropped """
+        if target != self.target or target is None or location not in self.path:
+            return False
+        self.path = self.path[self.path.index(location) + 1:]
+        return len(self.path) > 0 and all(step not in costs and
+            tiles.get(step, Player.PlayerTraversableTiles[0]) in Player.PlayerTraversableTiles
+                for step in self.path)
+
+
+    def __search(self, tiles: dict, start: tuple, goal: tuple, costs: dict) -> list:
+        """ returns the cheapest path (without the start) to the goal, walking
+        unseen tiles as if they were open, or to the nearest seen tile next to
+        an unseen one if there is no goal, an empty path if there is none """
+        traversable = Player.PlayerTraversableTiles
+        def heuristic(node: tuple) -> int:
+            return 0 if goal is None else abs(goal[0] - node[0]) + abs(goal[1] - node[1])
+        frontier = [(heuristic(start), 0, start)]
+        distances = { start: 0 }
+        parents = { start: None }
+        visited = 0
+        while len(frontier) > 0 and visited < AutoPlayerController.MaxSearchNodes:
+            _, distance, node = heappop(frontier)
+            if distance > distances[node]:
+                continue
+            visited += 1
+            if node == goal or (goal is None and node != start and
+                    self.__isUnexploredEdge(tiles, node)):
+                return self.__tracePath(parents, node)
+            for dx, dy in AutoPlayerController.NeighborDeltas:
+                neighbor = (node[0] + dx, node[1] + dy)
+                tile = tiles.get(neighbor, None)
+                if (tile is None and goal is None) or (tile is not None and tile not in traversable):
+                    continue
+                cost = distance + 1 + costs.get(neighbor, 0)
+                if cost < distances.get(neighbor, cost + 1):
+                    distances[neighbor] = cost
+                    parents[neighbor] = node
+                    heappush(frontier, (cost + heuristic(neighbor), cost, neighbor))
+        return list()
+
+
+    def __isUnexploredEdge(self, tiles: dict, node: tuple) -> bool:
+        """ returns if a neighbor of the seen tile has not been seen """
+        return any((node[0] + dx, node[1] + dy) not in tiles
+                for dx, dy in AutoPlayerController.NeighborDeltas)
+
+
+    def __tracePath(self, parents: dict, node: tuple) -> list:
+        """ returns the path from the search's start (excluded) to the node """
+        path = list()
+        while parents[node] is not None:
+            path.append(node)
+            node = parents[node]
+        path.reverse()
+        return path
+
+
+    def __chooseSafestMove(self, validMoves: list, adversaries: set) -> Point:
+        """ returns the valid move furthest from the nearest adversary, the
+        first valid move (staying put) if none are in view """
+        if len(adversaries) == 0:
+            return validMoves[0]
+        def safety(move: Point) -> int:
+            return min(abs(move.X - x) + abs(move.Y - y) for x, y in adversaries)
+        return max(validMoves, key = safety)
+
+
+
+# ----- end of file ------------------------------------------------------------
@@ -0,0 +1,518 @@
+#
+# benchmark.py
+# authors: Michael Curley & Drake Moore
+#
+
+from actor import Player
+from codec import JsonCodec, listJsonLibraries, pointToJson
+from controller import Controller, LocalGhostController, LocalZombieController, NoMoveController
+from floorPlan import FloorPlan
+from gameManager import GameManager
+from gameState import GameState
+from hallway import Hallway
+from json import dumps
+from level import Level
+from levelFactory import LevelFactory
+from levelGenerator import LevelGenerator
+from levelManager import LevelManager
+from levelManagerBuilder import LevelManagerBuilder
+from metrics import MetricsRegistry
+from moveResult import MoveResult
+from os import path
+from pathfinder import HierarchicalPathfinder
+from platform import python_version
+from point import Point
+from random import Random, randint, seed as seedRandom
+from room import Room
+from roomBuilder import RoomBuilder
+from ruleChecker import RuleChecker
+from serverController import ServerController
+from snarlParser import SnarlParser
+from statistics import median, pstdev
+from subprocess import DEVNULL, run
+from sys import executable
+from tile import Tile
+from time import perf_counter, time
+
+
+class Benchmark:
+    """ represents a collection of timed benchmark cases, each case is timed
+    over several repeats and the per call statistics are reported as json """
+
+    # the default number of timed repeats per case
+    DefaultRepeat = 5
+
+    # the minimum number of seconds a single repeat should take, the number of
+    # calls per repeat is scaled up until this is reached
+    DefaultMinRepeatTime = 0.05
+
+    def __init__(self, repeat: int = DefaultRepeat,
+            minRepeatTime: float = DefaultMinRepeatTime):
+        if not isinstance(repeat, int) or repeat <= 0:
+            raise ValueError('A Benchmark must repeat each case a positive number of times.')
+        self.repeat = repeat
+        self.minRepeatTime = minRepeatTime
+        self.cases = list()
+
+
+    def addCase(self, name: str, function, setup = None, params: dict = None):
+        """ adds a case to the benchmark, if setup is given it is called
+        (untimed) before every timed call and its return value is passed to the
+        function, otherwise the function is called with no arguments """
+        self.cases.append({
+            'name': name,
+            'function': function,
+            'setup': setup,
+            'params': dict() if params is None else params
+        })
+        return self
+
+
+    def run(self, nameFilter: str = None, report = None) -> list:
+        """ runs every case whose name contains the filter and returns a list
+        of result dictionaries, report is called with each result as it is
+        produced """
+        results = list()
+        for case in self.cases:
+            if nameFilter is not None and nameFilter not in case['name']:
+                continue
+            result = self.__runCase(case)
+            results.append(result)
+            if report is not None:
+                report(result)
+        return results
+
+
+    def toJson(self, results: list) -> str:
+        """ returns the results as a json document for regression tracking """
+        return dumps({
+            'python': python_version(),
+            'timestamp': time(),
+            'results': results
+        }, indent = 2)
+
+
+    def __runCase(self, case: dict) -> dict:
+        """ times a single case and returns its result dictionary """
+        iterations = self.__calibrate(case)
+        timings = [ self.__timeCalls(case, iterations) / iterations
+                for _ in range(self.repeat) ]
+        return {
+            'name': case['name'],
+            'params': case['params'],
+            'iterations': iterations,
+            'repeat': self.repeat,
+            'mean': sum(timings) / len(timings),
+            'median': median(timings),
+            'min': min(timings),
+            'max': max(timings),
+            'stdev': pstdev(timings)
+        }
+
+
+    def __calibrate(self, case: dict) -> int:
+        """ returns the number of calls needed for a repeat to take at least
+        the minimum repeat time """
+        iterations = 1
+        while 1:
+            elapsed = self.__timeCalls(case, iterations)
+            if elapsed >= self.minRepeatTime:
+                return iterations
+            # jump close to the target rather than doubling from 1
+            iterations = max(iterations * 2, int(iterations * self.minRepeatTime /
+                max(elapsed, 1e-9) * 1.2))
+
+
+    def __timeCalls(self, case: dict, iterations: int) -> float:
+        """ returns the total seconds taken by the given number of calls """
+        function = case['function']
+        setup = case['setup']
+        if setup is None:
+            start = perf_counter()
+            for _ in range(iterations):
+                function()
+            return perf_counter() - start
+        elapsed = 0.0
+        for _ in range(iterations):
+            state = setup()
+            start = perf_counter()
+            function(state)
+            elapsed += perf_counter() - start
+        return elapsed
+
+
+
+class BenchmarkPlayerController(Controller):
+    """ represents a controller for benchmark players, it is given the whole
+    level and walks the shortest path to the key and then the exit so that a
+    full game always makes progress """
+
+    def __init__(self, level: Level):
+        self.pathfinder = HierarchicalPathfinder(level)
+
+
+    def requestMove(self, gameState: GameState) -> Point:
+        """ returns the furthest valid move along the path to the current target """
+        target = gameState.exitLocation if gameState.exitUnlocked else gameState.keyLocation
+        validMoves = gameState.listValidMoves()
+        path = None if target is None else self.pathfinder.findPath(
+                gameState.actor.location, target)
+        if path is None:
+            return validMoves[randint(0, len(validMoves) - 1)]
+        for move in reversed(path[:gameState.actor.moveRange]):
+            if move in validMoves:
+                return move
+        return validMoves[randint(0, len(validMoves) - 1)]
+
+
+
+class LoadTestController(Controller):
+    """ represents a remote client's automated controller for load testing,
+    the time every move is requested is recorded so the turn latency (the time
+    between a client's consecutive turns) can be measured, the moves come from
+    the given controller (such as an automated player or a local adversary's
+    controller) or are a random valid move if none is given """
+
+    def __init__(self, seed: int, controller: Controller = None):
+        self.random = Random(seed)
+        self.controller = controller
+        self.requestTimes = list()
+
+
+    def updateGameState(self, gameState: GameState):
+        if self.controller is not None:
+            self.controller.updateGameState(gameState)
+
+
+    def updateMoveResult(self, moveResult: MoveResult):
+        if self.controller is not None:
+            self.controller.updateMoveResult(moveResult)
+
+
+    def requestMove(self, gameState: GameState) -> Point:
+        """ records the time of the request and returns the move """
+        self.requestTimes.append(perf_counter())
+        if self.controller is not None:
+            return self.controller.requestMove(gameState)
+        validMoves = gameState.listValidMoves()
+        return validMoves[self.random.randint(0, len(validMoves) - 1)]
+
+
+    def getTurnLatencies(self) -> list:
+        """ returns the seconds between each consecutive move request """
+        return [ current - previous for previous, current
+                in zip(self.requestTimes, self.requestTimes[1:]) ]
+
+
+
+class SerializingController(ServerController):
+    """ represents a server controller without a connection, messages are only
+    serialized so the encoding cost can be measured """
+
+    def __init__(self, useLayoutAnchor: bool = False, codec: JsonCodec = None):
+        ServerController.__init__(self, None, useLayoutAnchor, codec = codec)
+        self.bytesSent = 0
+        self.lastMessage = None
+
+
+    def sendMsg(self, msg: any):
+        """ serializes the message exactly as it would be sent """
+        self.lastMessage = msg
+        self.bytesSent += len(self.codec.encode(msg))
+
+
+
+# ----- level and game creation ------------------------------------------------
+
+def createGeneratedLevel(roomCount: int, seed: int,
+        hallwayWaypoints: int = LevelGenerator.DefaultHallwayWaypoints,
+        density: float = 0.25) -> (Point, Point, Level):
+    """ returns a key location, exit location and a seeded, generated level
+    with the given number of rooms """
+    return LevelGenerator(
+        ).setRoomCount(roomCount
+        ).setHallwayWaypoints(hallwayWaypoints
+        ).setDensity(density
+        ).setSeed(seed
+        ).generate()
+
+
+def createLevelManager(level: Level, keyLocation: Point, exitLocation: Point,
+        actorCount: int) -> LevelManager:
+    """ returns a level manager with randomly placed automated actors, up to
+    half (and at most the maximum) of the actors are players """
+    return createLevelManagerBuilder(level, keyLocation, exitLocation, actorCount).build()
+
+
+def getPlayerCount(actorCount: int) -> int:
+    """ returns how many of the actors of a benchmark level are players """
+    return min(LevelManager.MaxPlayers, max(1, actorCount // 2))
+
+
+def createLevelManagerBuilder(level: Level, keyLocation: Point, exitLocation: Point,
+        actorCount: int) -> LevelManagerBuilder:
+    """ returns the builder of a level manager with randomly placed automated
+    actors (see createLevelManager) """
+    playerCount = getPlayerCount(actorCount)
+    builder = LevelManagerBuilder(
+        ).addLevelComponent(level
+        ).setKeyLocation(keyLocation
+        ).setExitLocation(exitLocation
+        ).setRandomStartingPoints(True)
+    for i in range(playerCount):
+        builder.registerPlayer(str(i), 'player{0}'.format(i),
+                controller = BenchmarkPlayerController(level))
+    for i in range(actorCount - playerCount):
+        if i % 2 == 0:
+            builder.registerAdversary('zombie', 'zombie{0}'.format(i),
+                    controller = LocalZombieController())
+        else:
+            builder.registerAdversary('ghost', 'ghost{0}'.format(i),
+                    controller = LocalGhostController())
+    return builder
+
+
+def loadLevelsJson(fileName: str) -> list:
+    """ returns the json levels of a snarl.levels file, the leading level
+    count is dropped """
+    with open(fileName, 'r') as f:
+        return list(SnarlParser().readJsonLevels(f))
+
+
+# ----- engine cases -----------------------------------------------------------
+
+def addEngineCases(benchmark: Benchmark, roomCounts: list, actorCounts: list,
+        levelsFile: str = None, hallwayWaypoints: int = LevelGenerator.DefaultHallwayWaypoints,
+        seed: int = 0):
+    """ adds the core engine hot path cases to the benchmark, parameterized by
+    the number of rooms in the level and the number of actors """
+    if levelsFile is not None:
+        benchmark.addCase('levelsFileParse', lambda: parseLevelsFile(levelsFile),
+                params = { 'file': levelsFile })
+        for i, levelJson in enumerate(loadLevelsJson(levelsFile)):
+            benchmark.addCase('levelParse',
+                    lambda levelJson = levelJson: SnarlParser().createLevel(levelJson),
+                    params = { 'file': levelsFile, 'level': i + 1 })
+    for roomCount in roomCounts:
+        keyLocation, exitLocation, level = createGeneratedLevel(roomCount, seed,
+                hallwayWaypoints)
+        levelJson = SnarlParser().levelToJson(level.rooms, level.hallways,
+                keyLocation, exitLocation, False)
+        sizeParams = { 'rooms': roomCount, 'tiles': level.width * level.height }
+        benchmark.addCase('levelParse',
+                lambda levelJson = levelJson: SnarlParser().createLevel(levelJson),
+                params = dict(sizeParams))
+        for actorCount in actorCounts:
+            params = dict(sizeParams, actors = actorCount)
+            seedRandom(seed)
+            levelManager = createLevelManager(level, keyLocation, exitLocation, actorCount)
+            player = levelManager.allActors[0]
+            adversary = levelManager.allActors[-1]
+            playerGs = levelManager.getActorGameState(player.name)
+            adversaryGs = levelManager.getActorGameState(adversary.name)
+            ruleChecker = RuleChecker()
+            destination = playerGs.listValidMoves()[-1]
+            tileLayout = levelManager.produceTileLayout()
+            standIn = Player('0', 'standIn', player.location, NoMoveController())
+            benchmark.addCase('getActorGameState',
+                    lambda lm = levelManager, name = player.name: lm.getActorGameState(name),
+                    params = dict(params, actor = 'player'))
+            benchmark.addCase('getActorGameState',
+                    lambda lm = levelManager, name = adversary.name: lm.getActorGameState(name),
+                    params = dict(params, actor = 'adversary'))
+            benchmark.addCase('listValidMoves', playerGs.listValidMoves,
+                    params = dict(params, actor = 'player'))
+            benchmark.addCase('isMoveValid',
+                    lambda gs = playerGs, p = destination:
+                        ruleChecker.isMoveValid(gs.actor, p, gs.floorPlan),
+                    params = dict(params, actor = 'player'))
+            benchmark.addCase('produceTileLayout', levelManager.produceTileLayout,
+                    params = params)
+            benchmark.addCase('setTileInLayout',
+                    lambda fp = levelManager.floorPlan, p = player, layout = tileLayout:
+                        fp.setTileInLayout(p.location, p, layout),
+                    params = dict(params, actor = 'player'))
+            benchmark.addCase('floorPlanValidate',
+                    lambda ul = levelManager.floorPlan.upperLeftPosition, layout = tileLayout:
+                        FloorPlan(ul, layout),
+                    params = params)
+            benchmark.addCase('actorRequestMove',
+                    lambda actor = standIn, gs = playerGs: actor.requestMove(gs),
+                    params = dict(params, actor = 'player'))
+            benchmark.addCase('updateGameState',
+                    lambda gs = playerGs: SerializingController(False).updateGameState(gs),
+                    params = dict(params, actor = 'player'))
+            benchmark.addCase('updateGameState',
+                    lambda gs = adversaryGs: SerializingController(True).updateGameState(gs),
+                    params = dict(params, actor = 'adversary'))
+            benchmark.addCase('gameRun', lambda gm: gm.run(),
+                    setup = lambda level = level, k = keyLocation, e = exitLocation,
+                        n = actorCount: createSeededGame(level, k, e, n, seed),
+                    params = dict(params, seed = seed))
+
+
+def createProtocolMessages(levelManager: LevelManager, codec: JsonCodec) -> dict:
+    """ returns a message of each type sent during a turn by message type, the
+    adversary update (if there is an adversary) holds the encoded level layout
+    fragment it is sent with """
+    player = levelManager.allActors[0]
+    playerGs = levelManager.getActorGameState(player.name)
+    playerController = SerializingController(False, codec)
+    playerController.updateGameState(playerGs)
+    messages = {
+        'player-update': playerController.lastMessage,
+        'end-level': playerController.generateEndLevelMessage(playerGs),
+        'move': { 'type': 'move', 'to': pointToJson(player.location) },
+        'result': MoveResult.OK.name
+    }
+    adversary = levelManager.allActors[-1]
+    if adversary.name not in levelManager.players:
+        adversaryController = SerializingController(True, codec)
+        adversaryController.updateGameState(levelManager.getActorGameState(adversary.name))
+        messages['adversary-update'] = adversaryController.lastMessage
+    return messages
+
+
+def addCodecCases(benchmark: Benchmark, roomCounts: list, actorCounts: list,
+        hallwayWaypoints: int = LevelGenerator.DefaultHallwayWaypoints, seed: int = 0):
+    """ adds encode and decode cases of every protocol message type with each
+    installed json library """
+    for roomCount in roomCounts:
+        keyLocation, exitLocation, level = createGeneratedLevel(roomCount, seed,
+                hallwayWaypoints)
+        for actorCount in actorCounts:
+            seedRandom(seed)
+            levelManager = createLevelManager(level, keyLocation, exitLocation, actorCount)
+            for library in listJsonLibraries():
+                codec = JsonCodec(library)
+                for messageType, msg in createProtocolMessages(levelManager, codec).items():
+                    data = codec.encode(msg)
+                    params = { 'rooms': roomCount, 'actors': actorCount,
+                            'library': library, 'message': messageType, 'bytes': len(data) }
+                    benchmark.addCase('messageEncode',
+                            lambda codec = codec, msg = msg: codec.encode(msg),
+                            params = params)
+                    benchmark.addCase('messageDecode',
+                            lambda codec = codec, data = data: codec.decode(data),
+                            params = dict(params))
+
+
+def addImportCases(benchmark: Benchmark, modules: list):
+    """ adds a startup case per module, a new interpreter importing it from
+    this directory, the interpreter's own startup is included so the cases
+    are compared with each other (point imports nothing of the game) """
+    directory = path.dirname(path.abspath(__file__))
+    for module in modules:
+        benchmark.addCase('moduleImport',
+                lambda module = module: run([executable, '-c', 'import ' + module],
+                    cwd = directory, stdout = DEVNULL, check = True),
+                params = { 'module': module })
+
+
+def parseLevelsFile(fileName: str) -> list:
+    """ returns every (keyLocation, exitLocation, level) of a levels file as
+    the executables read it """
+    with open(fileName, 'r') as f:
+        return list(SnarlParser().readLevels(f))
+
+
+def addConstructionCases(benchmark: Benchmark, roomCounts: list,
+        hallwayWaypoints: int = LevelGenerator.DefaultHallwayWaypoints, seed: int = 0):
+    """ adds level construction (validation, layout and graph) cases on
+    generated levels, meant for large room counts, the rooms and hallways are
+    created from json before every call so only the Level constructor is
+    timed, routes between the first and last rooms are timed on the graph """
+    parser = SnarlParser()
+    for roomCount in roomCounts:
+        keyLocation, exitLocation, level = createGeneratedLevel(roomCount, seed,
+                hallwayWaypoints)
+        jsonRooms = [ parser.roomToJson(room) for room in level.rooms ]
+        jsonHallways = [ parser.hallwayToJson(hallway) for hallway in level.hallways ]
+        def createComponents(jsonRooms = jsonRooms, jsonHallways = jsonHallways):
+            componentParser = SnarlParser()
+            return ([ componentParser.createRoom(jsonRoom) for jsonRoom in jsonRooms ],
+                    [ componentParser.createHallway(jsonHallway) for jsonHallway in jsonHallways ])
+        benchmark.addCase('levelConstruction', lambda components: Level(*components),
+                setup = createComponents,
+                params = { 'rooms': roomCount, 'tiles': level.width * level.height })
+        benchmark.addCase('roomRoute',
+                lambda graph = level.graph, last = roomCount - 1: graph.getRoomRoute(0, last),
+                params = { 'rooms': roomCount })
+        start = level.rooms[0].getTraversablePointsInLayout([Tile.EMPTY])[0]
+        goal = level.rooms[-1].getTraversablePointsInLayout([Tile.EMPTY])[-1]
+        benchmark.addCase('hierarchicalPath',
+                lambda pathfinder, start = start, goal = goal: pathfinder.findPath(start, goal),
+                setup = lambda level = level: HierarchicalPathfinder(level),
+                params = { 'rooms': roomCount, 'tables': 'cold' })
+        pathfinder = HierarchicalPathfinder(level)
+        benchmark.addCase('hierarchicalPath',
+                lambda pathfinder = pathfinder, start = start, goal = goal:
+                    pathfinder.findPath(start, goal),
+                params = { 'rooms': roomCount, 'tables': 'warm' })
+
+
+def createSerpentineWaypoints(waypointCount: int, runLength: int) -> list:
+    """ returns the waypoints of a hallway that runs back and forth in rows two
+    apart, each run is runLength tiles long """
+    waypoints = list()
+    for i in range(waypointCount):
+        row = (i // 2) * 2
+        column = runLength if (i + 1) % 4 >= 2 else 0
+        waypoints.append(Point(column, row))
+    return waypoints
+
+
+def addHallwayCases(benchmark: Benchmark, waypointCounts: list, runLengths: list):
+    """ adds hallway construction (rasterization) cases on serpentine hallways
+    with many waypoints and long runs """
+    for waypointCount in waypointCounts:
+        for runLength in runLengths:
+            waypoints = createSerpentineWaypoints(waypointCount, runLength)
+            benchmark.addCase('hallwayConstruction',
+                    lambda waypoints = waypoints: Hallway(waypoints),
+                    params = { 'waypoints': waypointCount, 'run': runLength })
+
+
+def createLargeRoomBuilder(size: int) -> RoomBuilder:
+    """ returns a builder of a size x size room with a door run along the top
+    and a wall block in the middle """
+    return RoomBuilder(
+        ).setSize(size, size
+        ).addDoorRectangle(Point(1, 0), size - 2, 1
+        ).addWallRectangle(Point(size // 4, size // 4), size // 2, size // 2)
+
+
+def addRoomCases(benchmark: Benchmark, roomSizes: list):
+    """ adds room construction cases on large square rooms, building them and
+    validating (or trusting) their layouts """
+    for size in roomSizes:
+        room = createLargeRoomBuilder(size).build()
+        benchmark.addCase('roomBuild', lambda size = size: createLargeRoomBuilder(size).build(),
+                params = { 'size': size })
+        for trusted in [False, True]:
+            benchmark.addCase('roomConstruction',
+                    lambda room = room, trusted = trusted: Room(room.upperLeftPosition,
+                        room.layout, trusted),
+                    params = { 'size': size, 'trusted': trusted })
+
+
+def createSeededGame(level: Level, keyLocation: Point, exitLocation: Point,
+        actorCount: int, seed: int) -> GameManager:
+    """ returns a single level game manager whose random choices are seeded """
+    seedRandom(seed)
+    levelManager = createLevelManager(level, keyLocation, exitLocation, actorCount)
+    return GameManager([levelManager], seed = seed)
+
+
+def createHeadlessGame(levels: list, actorCount: int, seed: int,
+        metrics: MetricsRegistry = None) -> GameManager:
+    """ returns a game of the (keyLocation, exitLocation, level) levels played
+    by automated actors, each level is built just before it is played so the
+    whole game is seeded """
+    return GameManager([ LevelFactory(lambda k = k, e = e, level = level:
+            createLevelManagerBuilder(level, k, e, actorCount))
+        for k, e, level in levels ], seed = seed, metrics = metrics)
+
+
+
+# ----- end of file ------------------------------------------------------------
@@ -4,17 +4,17 @@
 #
 
 from actor import Actor, Player, Zombie, Ghost
+from codec import JsonCodec, TILE_ID_MAP, jsonToPoint, pointToJson
 from controller import Controller
+from exploredMap import ExploredMap
 from floorPlan import FloorPlan
 from gameState import ActorGameState
 from interactable import Interactable
-from json import dumps, loads
+from jsonStream import JsonStreamReader
 from moveResult import MoveResult
 from point import Point
 from ruleChecker import RuleChecker
-from snarlParser import SnarlParser, TILE_ID_MAP
-from socket import socket, AF_INET, SOCK_STREAM
-from time import sleep
+from socket import socket, AF_INET, SOCK_STREAM, IPPROTO_TCP, TCP_NODELAY
 
 
 class ClientController:
@@ -24,6 +24,8 @@ class ClientController:
             address: str = '127.0.0.1', port: int = 45678,
             clientType = None):
         self.socket = None
+        self.reader = None
+        self.codec = JsonCodec()
         self.__validateController(controller)
         self.controller = controller
         self.__validateClient(clientType)
@@ -32,6 +34,14 @@ class ClientController:
         self.currentLevel = -1
         self.currentGameState = None
         self.isGameOver = False
+        # the state kept between updates, remote actors by name, the last
+        # layout received with its tiles and where it was, and every tile of
+        # the level seen so far
+        self.actors = dict()
+        self.layoutIds = None
+        self.layoutTiles = None
+        self.layoutAnchor = None
+        self.exploredMap = ExploredMap()
 
 
     def __del__(self):
@@ -66,7 +76,7 @@ class ClientController:
             self.__sendMsg(res)
         elif msg == 'move':
             move = self.controller.requestMove(self.currentGameState)
-            self.__sendMsg({ 'type': 'move', 'to': SnarlParser().pointToJson(move) })
+            self.__sendMsg({ 'type': 'move', 'to': pointToJson(move) })
         elif msg in [mr.name for mr in MoveResult]:
             self.controller.updateMoveResult(MoveResult[msg])
         else:
@@ -80,8 +90,10 @@ class ClientController:
             t = msg['type']
             if t == 'start-level':
                 self.currentLevel = msg['level']
+                self.layoutIds = None
+                self.exploredMap.reset()
             elif t == 'player-update':
-                self.currentGameState = self.__recreateState(msg)
+                self.currentGameState = self.__updateState(msg)
                 self.controller.updateGameState(self.currentGameState)
             elif t == 'end-level':
                 self.currentGameState.levelOver = True
@@ -94,13 +106,15 @@ class ClientController:
             return True
 
 
-    def __recreateState(self, state: dict) -> ActorGameState:
-        """ recreates a game state from the partial json state """
+    def __updateState(self, state: dict) -> ActorGameState:
+        """ creates a game state from the partial json state, the actors and
+        layout tiles kept from earlier updates are only changed where the
+        state differs """
         objs = self.__recreateObjects(state['objects'])
-        actors = self.__recreateActors(state['actors'])
         self.actor.lifepoints = state.get('health', None)
-        self.actor.location = SnarlParser().createPoint(state['position'])
-        floorPlan = self.__recreateFloorPlan(state.get('anchor', None), state['layout'])
+        self.actor.location = jsonToPoint(state['position'])
+        actors = self.__updateActors(state['actors'])
+        floorPlan = self.__updateFloorPlan(state.get('anchor', None), state['layout'])
         for interactable in objs:
             self.__setTileOrActorInFloorPlan(objs[interactable], interactable, floorPlan)
         for actor in actors + [self.actor]:
@@ -109,7 +123,8 @@ class ClientController:
                 objs.get(Interactable.KEY, None), objs.get(Interactable.EXIT, None),
                 False, False, False, False, RuleChecker(),
                 currentLevel = self.currentLevel,
-                messages = self.__separateMessages(state['message']))
+                messages = self.__separateMessages(state['message']),
+                exploredMap = self.exploredMap)
 
 
     def __setTileOrActorInFloorPlan(self, location: Point, tileOrActor: any, floorPlan: FloorPlan):
@@ -128,40 +143,70 @@ class ClientController:
     def __recreateObjects(self, objects: list) -> dict:
         """ returns a dictionary of object locations by interactable key """
         return { Interactable.KEY if o['type'] == 'key' else Interactable.EXIT:
-                 SnarlParser().createPoint(o['position']) for o in objects }
+                 jsonToPoint(o['position']) for o in objects }
 
 
-    def __recreateActors(self, actors: list) -> list:
-        """ returns a list of actors from the json list """
+    def __updateActors(self, actors: list) -> list:
+        """ returns the actors of the json list, an actor seen before is kept
+        and moved rather than recreated """
         l = list()
-        pids = '123456789'.replace(self.actor.identifier, '')
         for actor in actors:
-            t = actor['type']
             name = actor['name']
-            loc = SnarlParser().createPoint(actor['position'])
-            if t == 'player':
-                l.append(Player(pids[0], name, startLocation = loc))
-                pids = pids[1:]
+            loc = jsonToPoint(actor['position'])
+            known = self.actors.get(name, None)
+            if known is None or known.__class__.__name__.lower() != actor['type']:
+                known = self.__createActor(actor['type'], name, loc)
+                self.actors[name] = known
             else:
-                l.append((Zombie if t == 'zombie' else Ghost)(name, startLocation = loc))
+                known.location = loc
+            l.append(known)
         return l
 
 
-    def __recreateFloorPlan(self, anchor: list, layout: list) -> (Point, FloorPlan):
-        """ recreates a floor plan from a partial json list """
+    def __createActor(self, actorType: str, name: str, location: Point) -> Actor:
+        """ returns a new remote actor, a player is given the first identifier
+        not taken by this client's actor or another known player """
+        if actorType == 'player':
+            taken = [ self.actor.identifier ] + [ a.identifier for a in self.actors.values()
+                    if isinstance(a, Player) ]
+            pid = [ i for i in '123456789' if i not in taken ][0]
+            return Player(pid, name, startLocation = location)
+        return (Zombie if actorType == 'zombie' else Ghost)(name, startLocation = location)
+
+
+    def __updateFloorPlan(self, anchor: list, layout: list) -> FloorPlan:
+        """ returns a floor plan of the partial json layout, only the rows that
+        changed since the last update are converted to tiles and merged into
+        the explored map (every row if the layout moved), the floor plan is
+        given a copy of the tiles as the game state changes them """
         if anchor is None:
             anchor = self.actor.location -\
                     Point(int(len(layout[0]) / 2), int(len(layout) / 2))
         else:
-            anchor = SnarlParser().createPoint(anchor)
-        return FloorPlan(anchor, [ [ TILE_ID_MAP[tile] for tile in row ] for row in layout ])
+            anchor = jsonToPoint(anchor)
+        if self.layoutIds is None or len(layout) != len(self.layoutIds):
+            self.layoutTiles = [ [ TILE_ID_MAP[tile] for tile in row ] for row in layout ]
+            changed = None
+        else:
+            changed = [ index for index, row in enumerate(layout) if row != self.layoutIds[index] ]
+            for index in changed:
+                self.layoutTiles[index] = [ TILE_ID_MAP[tile] for tile in layout[index] ]
+        if changed is None or anchor != self.layoutAnchor:
+            self.exploredMap.merge(anchor, self.layoutTiles)
+        elif len(changed) > 0:
+            self.exploredMap.merge(anchor, self.layoutTiles, changed)
+        self.layoutIds = layout
+        self.layoutAnchor = anchor
+        return FloorPlan(anchor, [ list(row) for row in self.layoutTiles ], trusted = True)
 
 
     def __makeConnection(self, address: str, port: int) -> (str, socket):
         """ initiates connection and returns the server-info, socket """
         s = socket(AF_INET, SOCK_STREAM)
         s.connect((address, port))
-        welcome = self.__getMsg(s)
+        s.setsockopt(IPPROTO_TCP, TCP_NODELAY, 1)
+        self.reader = JsonStreamReader(s.recv, codec = self.codec)
+        welcome = self.__getMsg()
         if welcome['type'] != 'welcome':
             raise RuntimeError('Welcome message is invalid.')
         if self.clientType is not None:
@@ -169,16 +214,15 @@ class ClientController:
         return welcome['info'], s
 
 
-    def __getMsg(self, s: socket = None) -> any:
-        """ receives a json message from the server """
-        sleep(1)
-        return loads((self.socket if s is None else s).recv(4096).decode('utf-8'))
+    def __getMsg(self) -> any:
+        """ receives the next json message from the server, a server may send
+        several messages in one write so they are read as a stream """
+        return self.reader.readMessage()
 
 
     def __sendMsg(self, msg: any, s: socket = None):
         """ sends a json message to the server """
-        sleep(1)
-        (self.socket if s is None else s).sendall(dumps(msg).encode('utf-8'))
+        (self.socket if s is None else s).sendall(self.codec.encode(msg))
 
 
     def __validateController(self, controller: any):
@@ -0,0 +1,121 @@
+#
+# codec.py
+# authors: Michael Curley & Drake Moore
+#
+
+from interactable import Interactable
+from json import dumps, loads
+from point import Point
+from tile import Tile
+
+# optional faster json libraries, the standard library is used without them
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# the ids of the tiles in a json layout (of a level file or a protocol
+# message), the protocol has no ids for hallways, keys and exits
+TILE_ID_MAP = {
+    0: Tile.WALL,
+    1: Tile.EMPTY,
+    2: Tile.DOOR
+}
+ID_TILE_MAP = {
+    Tile.WALL: 0,
+    Tile.NONE: 0,
+    Tile.UNKNOWN: 0,
+    Tile.HALLWAY: 1,
+    Tile.EMPTY: 1,
+    Interactable.KEY: 1,
+    Interactable.EXIT: 1,
+    Tile.DOOR: 2
+}
+
+
+class JsonFragment:
+    """ represents json text encoded ahead of time (such as a level layout
+    that does not change between updates), a top level value of a message may
+    be a fragment and its text is placed in the encoded message as is """
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+
+
+class JsonCodec:
+    """ represents the encoding of protocol messages to utf-8 json bytes and
+    their decoding, the fastest installed library (orjson, then ujson) is used
+    unless one is named, falling back to the standard library json """
+
+    # the supported libraries, fastest first
+    Libraries = ['orjson', 'ujson', 'json']
+
+    def __init__(self, library: str = None):
+        available = listJsonLibraries()
+        if library is None:
+            library = available[0]
+        if library not in available:
+            raise ValueError('A JsonCodec library must be one of the installed: {0}.'.format(
+                ', '.join(available)))
+        self.library = library
+        if library == 'orjson':
+            self.__dumps = orjson.dumps
+            self.__loads = orjson.loads
+        elif library == 'ujson':
+            self.__dumps = lambda msg: ujson.dumps(msg, ensure_ascii = False).encode()
+            self.__loads = ujson.loads
+        else:
+            self.__dumps = lambda msg: dumps(msg).encode()
+            self.__loads = loads
+
+
+    def encode(self, msg: any) -> bytes:
+        """ returns the message encoded as utf-8 json """
+        if isinstance(msg, dict) and \
+                any(isinstance(value, JsonFragment) for value in msg.values()):
+            return self.__encodeWithFragments(msg)
+        return self.__dumps(msg)
+
+
+    def decode(self, data: any) -> any:
+        """ returns the message decoded from json text or utf-8 bytes, raises
+        a value error if it is not exactly one json value """
+        return self.__loads(data)
+
+
+    def __encodeWithFragments(self, msg: dict) -> bytes:
+        """ returns the message encoded with the text of its fragments placed
+        first, the order of an object's keys does not matter in json """
+        fragments = [ self.__dumps(key) + b':' + value.data
+                for key, value in msg.items() if isinstance(value, JsonFragment) ]
+        rest = self.__dumps({ key: value for key, value in msg.items()
+                if not isinstance(value, JsonFragment) })
+        if rest == b'{}':
+            return b'{' + b','.join(fragments) + b'}'
+        return b'{' + b','.join(fragments) + b',' + rest[1:]
+
+
+
+def listJsonLibraries() -> list:
+    """ returns the installed json libraries, fastest first """
+    installed = { 'orjson': orjson, 'ujson': ujson, 'json': True }
+    return [ library for library in JsonCodec.Libraries if installed[library] is not None ]
+
+
+def pointToJson(point: Point) -> list:
+    """ returns the json [row, column] position of the point """
+    return None if point is None else [point.Y, point.X]
+
+
+def jsonToPoint(position: list) -> Point:
+    """ returns the point of a json [row, column] position """
+    return None if position is None else Point(position[1], position[0])
+
+
+
+# ----- end of file ------------------------------------------------------------
@@ -3,6 +3,7 @@
 # authors: Michael Curley & Drake Moore
 #
 
+from actor import Player
 from controller import Controller
 from gameState import GameState
 from point import Point
@@ -32,7 +33,6 @@ class ConsoleController(Controller):
 
     def updateGameState(self, gameState: GameState):
         """ updates the user if the game or level is over """
-        from actor import Player
         if isinstance(gameState.actor, Player):
             print('UPDATED GAMESTATE')
             self.__printPlayerEvent(gameState)
@@ -3,7 +3,9 @@
 # authors: Michael Curley & Drake Moore
 #
 
+from actor import Player
 from gameState import GameState
+from iController import IController
 from point import Point
 from random import randint
 from tile import Tile
@@ -12,7 +14,7 @@ from moveResult import MoveResult
 from uuid import uuid1
 
 
-class Controller:
+class Controller(IController):
     """ represents a controller for a single actor or observer in the game """
 
     def getName(self) -> str:
@@ -82,7 +84,6 @@ class ClosestPlayerController(Controller):
 
     def requestMove(self, gameState: GameState) -> Point:
         """ returns a move that will bring the actor to the nearest player """
-        from actor import Player
         distances = { gameState.actor.location.distanceFrom(p.location): p.location
                 for p in filter(lambda a: isinstance(a, Player), gameState.allActors) }
         if len(distances) == 0:
@@ -0,0 +1,87 @@
+#
+# exploredMap.py
+# authors: Michael Curley & Drake Moore
+#
+
+from floorPlan import FloorPlan
+from point import Point
+from tile import Tile
+
+
+class ExploredMap:
+    """ represents every tile of a level an actor has seen, each layout it is
+    given (such as the window around a player sent in an update) is merged in
+    at its absolute position so the terrain seen earlier is remembered after
+    it leaves the actor's view, tiles never seen are unknown, the tiles are
+    kept by (x, y) so a search can look them up without creating points """
+
+    def __init__(self):
+        self.tiles = dict()
+        self.upperLeftPosition = None
+        self.lowerRightPosition = None
+
+
+    def reset(self):
+        """ forgets every explored tile, such as when a new level starts """
+        self.tiles = dict()
+        self.upperLeftPosition = None
+        self.lowerRightPosition = None
+
+
+    def merge(self, upperLeftPosition: Point, layout: list, rows: list = None):
+        """ merges the layout (a list(list(Tile))) whose upper left tile is at
+        the given position, only the given row indices are merged if any are
+        given, unknown tiles in the layout are skipped """
+        if len(layout) == 0 or len(layout[0]) == 0:
+            return
+        for row in range(len(layout)) if rows is None else rows:
+            y = upperLeftPosition.Y + row
+            for col, tile in enumerate(layout[row]):
+                if tile != Tile.UNKNOWN:
+                    self.tiles[(upperLeftPosition.X + col, y)] = tile
+        self.__extendBounds(upperLeftPosition,
+                upperLeftPosition + Point(len(layout[0]) - 1, len(layout) - 1))
+
+
+    def getTile(self, position: Point) -> Tile:
+        """ returns the last tile seen at the position, or unknown """
+        return self.tiles.get((position.X, position.Y), Tile.UNKNOWN)
+
+
+    def isExplored(self, position: Point) -> bool:
+        """ returns if a tile has been seen at the position """
+        return (position.X, position.Y) in self.tiles
+
+
+    def countExplored(self) -> int:
+        """ returns the number of tiles that have been seen """
+        return len(self.tiles)
+
+
+    def toFloorPlan(self) -> FloorPlan:
+        """ returns a floor plan of the explored bounds, every tile not yet
+        seen is unknown, raises a value error if nothing has been explored """
+        if self.upperLeftPosition is None:
+            raise ValueError('An ExploredMap has no explored tiles to lay out.')
+        ul = self.upperLeftPosition
+        size = self.lowerRightPosition - ul + Point(1, 1)
+        layout = [ [Tile.UNKNOWN] * size.X for _ in range(size.Y) ]
+        for (x, y), tile in self.tiles.items():
+            layout[y - ul.Y][x - ul.X] = tile
+        return FloorPlan(ul, layout, trusted = True)
+
+
+    def __extendBounds(self, upperLeftPosition: Point, lowerRightPosition: Point):
+        """ grows the explored bounds to include the given corners """
+        if self.upperLeftPosition is None:
+            self.upperLeftPosition = upperLeftPosition.copy()
+            self.lowerRightPosition = lowerRightPosition.copy()
+            return
+        self.upperLeftPosition = Point(min(self.upperLeftPosition.X, upperLeftPosition.X),
+                min(self.upperLeftPosition.Y, upperLeftPosition.Y))
+        self.lowerRightPosition = Point(max(self.lowerRightPosition.X, lowerRightPosition.X),
+                max(self.lowerRightPosition.Y, lowerRightPosition.Y))
+
+
+
+# ----- end of file ------------------------------------------------------------
@@ -4,6 +4,7 @@
 #
 
 from copy import deepcopy
+from iActor import IActor
 from interactable import Interactable
 from point import Point
 from random import randint
@@ -14,12 +15,17 @@ class FloorPlan:
     """ represents a floor plan for any room/hallway within a level, a floor
     plan has an anchor coordinate point in the upper left and a layout for the
     room """
+
+    # the types a layout may hold, an actor is checked by its interface so the
+    # floor plan need not import the actors (which depend on it)
+    LayoutTypes = (Tile, Interactable, IActor)
     
-    def __init__(self, upperLeftPosition: Point, layout: list):
+    def __init__(self, upperLeftPosition: Point, layout: list, trusted: bool = False):
         """ the layout is a list(list(Tile)), every sublist of the main list
-        must be the same length """
+        must be the same length, a trusted layout is not validated """
         self.__validateUpperLeftPosition(upperLeftPosition)
-        self.__validateLayout(layout)
+        if not trusted:
+            self.__validateLayout(layout)
         self.layout = layout
         self.height = len(layout)
         self.width = len(layout[0])
@@ -74,9 +80,7 @@ class FloorPlan:
         """ sets the tile in the layout at the given position, the given 'tile'
         may be a Tile, Interactable or Actor, if the given layout is None
         self.layout is used """
-        from actor import Actor # TODO circular import error, moved here for now
-        if (not isinstance(tile, Tile) and not isinstance(tile, Interactable)
-                and not isinstance(tile, Actor)):
+        if not isinstance(tile, FloorPlan.LayoutTypes):
             raise ValueError('A FloorPlan cannot have a {0} placed in its layout'.format(
                 type(tile)))
         layout = self.layout if layout is None else layout
@@ -106,16 +110,13 @@ class FloorPlan:
         if not layoutTypeValid:
             raise ValueError('FloorPlan given a layout that is not a list of lists.')
         
-        allRowsSameLength = len(set(map(lambda row: len(row), layout))) == 1
+        allRowsSameLength = len(set(map(len, layout))) == 1
         if not allRowsSameLength:
             raise ValueError('FloorPlan given a layout with different size rows.')
 
-        from actor import Actor # TODO circular import
-        allListObjectsAreValid = all(
-                isinstance(tile, Tile) or
-                isinstance(tile, Interactable) or
-                isinstance(tile, Actor)
-                for tile in [tile for row in layout for tile in row])
+        layoutTypes = FloorPlan.LayoutTypes
+        allListObjectsAreValid = all(isinstance(tile, layoutTypes)
+                for row in layout for tile in row)
         if not allListObjectsAreValid:
             raise ValueError('FloorPlan must be given a layout of only Tile.')
 
@@ -4,14 +4,18 @@
 #
 
 from actor import Actor, Player, Adversary, Ghost, Zombie
+from concurrent.futures import ThreadPoolExecutor
 from floorPlan import FloorPlan
 from gameState import ActorGameState, GameState
 from hallway import Hallway
 from interactable import Interactable
 from level import Level
+from levelFactory import LevelFactory
+from metrics import MetricsRegistry
 from moveResult import MoveResult
 from tile import Tile
 from point import Point
+from random import seed as seedRandom
 from room import Room
 from ruleChecker import RuleChecker
 from levelManager import LevelManager
@@ -20,35 +24,86 @@ from levelManager import LevelManager
 class GameManager:
     """ represents a game manager"""
 
-    def __init__(self, levelManagers: list, currentLevelNumber: int = 1, ruleChecker: RuleChecker = None):
+    def __init__(self, levelManagers: list, currentLevelNumber: int = 1, ruleChecker: RuleChecker = None,
+            replayLog = None, seed: int = None, prefetch: bool = False,
+            metrics: MetricsRegistry = None):
         """ initializes a game manager for running multiple levels,
-        where the first level indexes from 1 """
+        where the first level indexes from 1, if a seed is given the random
+        module is seeded with it when the game is run and if a ReplayLog is
+        given every level is recorded to it, each level is either a
+        LevelManager or a LevelFactory which is built just before the level is
+        played and every level is released once it is over, with prefetch the
+        next factory is prepared on a background thread while a level is
+        played (unless seeded, the thread would take from the random module),
+        if a MetricsRegistry is given every level records its timings to it """
         self.__verifyLevelManagers(levelManagers)
-        self.levelManagers = levelManagers
+        self.levelManagers = list(levelManagers)
         self.currentLevelIndex = currentLevelNumber - 1
         self.totalLevels = len(levelManagers)
         self.currentLevelManager = self.levelManagers[self.currentLevelIndex]
+        if not isinstance(self.currentLevelManager, LevelManager):
+            self.currentLevelManager = None
         self.ruleChecker = RuleChecker() if ruleChecker is None else ruleChecker
         self.gameWon = False
+        self.replayLog = replayLog
+        self.metrics = metrics
+        self.seed = seed
+        self.prefetch = prefetch and seed is None
 
 
     def run(self):
         """ runs through all of the levels"""
+        if self.seed is not None:
+            seedRandom(self.seed)
+        executor = ThreadPoolExecutor(max_workers = 1) if self.prefetch else None
+        try:
+            self.__runLevels(executor)
+        finally:
+            # at most the next level is being prepared, nothing is queued
+            if executor is not None:
+                executor.shutdown()
+
+
+    def __runLevels(self, executor: ThreadPoolExecutor):
+        """ runs each level from the current one until the game is over """
+        self.currentLevelManager = self.__buildLevel(self.currentLevelIndex)
         stats = self.__initStats()
         while 1:
+            prefetched = self.__prefetchLevel(executor, self.currentLevelIndex + 1)
             self.currentLevelManager.run(self.currentLevelIndex + 1,
-                    self.totalLevels, stats)
+                    self.totalLevels, stats, self.replayLog, self.metrics)
             self.gameWon = self.__gameWon()
             self.currentLevelManager.gameWon = self.gameWon
+            self.levelManagers[self.currentLevelIndex] = None
             self.currentLevelIndex += 1
             if self.__isGameOver():
                 break
-            self.currentLevelManager = self.levelManagers[self.currentLevelIndex]
+            if prefetched is not None:
+                prefetched.result() # raises any error from preparing the level
+            self.currentLevelManager = self.__buildLevel(self.currentLevelIndex)
         friendlyStats = self.__convertToFriendlyStats(stats)
         for actor in self.currentLevelManager.allActors:
             actor.updateFinalStats(friendlyStats)
 
 
+    def __buildLevel(self, index: int) -> LevelManager:
+        """ returns the level manager of the level, building it if needed """
+        level = self.levelManagers[index]
+        if isinstance(level, LevelFactory):
+            level = level.build()
+            self.levelManagers[index] = level
+        return level
+
+
+    def __prefetchLevel(self, executor: ThreadPoolExecutor, index: int):
+        """ prepares the level on the executor, returns the future or None if
+        there is nothing to prepare """
+        if executor is None or index >= self.totalLevels or \
+                not isinstance(self.levelManagers[index], LevelFactory):
+            return None
+        return executor.submit(self.levelManagers[index].prepare)
+
+
     def __initStats(self) -> dict:
         """ initializes the stats dictionary for the game """
         return { name: {
@@ -85,8 +140,8 @@ class GameManager:
     def __verifyLevelManagers(self, levelManagers):
         """ Verifies that all level managers are valid"""
         for manager in levelManagers:
-            if not isinstance(manager, LevelManager):
-                raise ValueError("Must be given a list of valid level managers.")
+            if not isinstance(manager, (LevelManager, LevelFactory)):
+                raise ValueError("Must be given a list of valid level managers or factories.")
 
 
 # ----- end of file ------------------------------------------------------------
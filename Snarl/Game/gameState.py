@@ -3,10 +3,10 @@
 # authors: Michael Curley & Drake Moore
 #
 
-from actor import Actor
+from exploredMap import ExploredMap
 from floorPlan import FloorPlan
+from iActor import IActor
 from point import Point
-from room import Room
 from tile import Tile
 
 
@@ -43,18 +43,20 @@ class GameState:
 class ActorGameState(GameState):
     """ represents an intermediate game state specific to an actor """
 
-    def __init__(self, actor: Actor, allActors: list, floorPlan: FloorPlan,
+    def __init__(self, actor: IActor, allActors: list, floorPlan: FloorPlan,
             keyLocation: Point, exitLocation: Point, keyCollected: bool,
             levelOver: bool, gameOver: bool, gameWon: bool, ruleChecker, # RuleChecker hint circular import
             currentLevel: int = -1, totalLevels: int = -1,
-            messages: list = None):
-        """ the floor plan represents the current status of the game """
+            messages: list = None, exploredMap: ExploredMap = None):
+        """ the floor plan represents the current status of the game, a
+        client's game state also has the map of every tile it has seen """
         GameState.__init__(self, allActors, floorPlan, keyLocation, exitLocation,
                 keyCollected, levelOver, gameOver, gameWon,
                 currentLevel = currentLevel, totalLevels = totalLevels,
                 messages = messages)
         self.actor = actor
         self.ruleChecker = ruleChecker
+        self.exploredMap = exploredMap
         self.knownLayout = self.__setLayout()
     
     
@@ -85,22 +87,45 @@ class ActorGameState(GameState):
     
 
     def __setLayout(self) -> list:
-        """ updates the floor plan layout based on the status of the actor """
-        actorLoc = self.actor.location
-        moveRange = self.actor.moveRange
-        viewRadius = self.actor.viewRadius
-        layout = self.floorPlan.produceTileLayout()
-        for row in range(self.floorPlan.height):
-            for col in range(self.floorPlan.width):
-                loc = Point(col, row) + self.floorPlan.upperLeftPosition
-                if actorLoc.cardinalDistanceFrom(loc) > viewRadius and viewRadius > 0:
-                    self.floorPlan.setTileInLayout(loc, Tile.UNKNOWN)
-                if actorLoc.cardinalDistanceFrom(loc) > moveRange:
-                    self.floorPlan.setTileInLayout(loc, Tile.UNKNOWN, layout)
-        def takeKnownTile(tile) -> bool:
-            return tile != Tile.UNKNOWN
-        filteredRows = map(lambda row: list(filter(takeKnownTile, row)), layout)
-        return list(filter(lambda row: len(row) != 0, filteredRows))
+        """ updates the floor plan layout based on the status of the actor,
+        tiles beyond its view radius become unknown and the known layout is the
+        window of known tiles within its move range, only the tiles inside
+        those windows are visited one by one """
+        location = self.actor.location - self.floorPlan.upperLeftPosition
+        knownLayout = [ [ tile for tile in row if tile != Tile.UNKNOWN ]
+                for row in self.__getWindow(location, self.actor.moveRange) ]
+        if self.actor.viewRadius > 0:
+            self.__hideOutsideWindow(location, self.actor.viewRadius)
+        return [ row for row in knownLayout if len(row) != 0 ]
+
+
+    def __getWindowBounds(self, location: Point, radius: int) -> (int, int, int, int):
+        """ returns the first and past the last row and column of the layout
+        within the radius of the layout location, clipped to the layout """
+        width = self.floorPlan.width
+        height = self.floorPlan.height
+        firstCol = min(width, max(0, location.X - radius))
+        firstRow = min(height, max(0, location.Y - radius))
+        return (firstRow, max(firstRow, min(height, location.Y + radius + 1)),
+                firstCol, max(firstCol, min(width, location.X + radius + 1)))
+
+
+    def __getWindow(self, location: Point, radius: int) -> list:
+        """ returns the rows of tiles within the radius of the layout location """
+        firstRow, endRow, firstCol, endCol = self.__getWindowBounds(location, radius)
+        return [ row[firstCol:endCol] for row in self.floorPlan.layout[firstRow:endRow] ]
+
+
+    def __hideOutsideWindow(self, location: Point, radius: int):
+        """ sets every tile beyond the radius of the layout location unknown """
+        firstRow, endRow, firstCol, endCol = self.__getWindowBounds(location, radius)
+        width = self.floorPlan.width
+        for index, row in enumerate(self.floorPlan.layout):
+            if index < firstRow or index >= endRow:
+                row[:] = [Tile.UNKNOWN] * width
+            else:
+                row[:firstCol] = [Tile.UNKNOWN] * firstCol
+                row[endCol:] = [Tile.UNKNOWN] * (width - endCol)
 
 
     def __getSurroundingTiles(self, loc: Point) -> list:
@@ -110,7 +135,7 @@ class ActorGameState(GameState):
         surrounding = filter(self.floorPlan.tilePositionWithinBounds, surrounding)
         def canMove(p: Point) -> bool:
             tile = self.floorPlan.getTileInLayout(p)
-            return tile in self.actor.traversableTiles or isinstance(tile, Actor)
+            return tile in self.actor.traversableTiles or isinstance(tile, IActor)
         surrounding = filter(canMove, surrounding)
         return list(surrounding)
 
@@ -7,6 +7,7 @@ from floorPlan import FloorPlan
 from interactable import Interactable
 from tile import Tile
 from point import Point
+from room import Room
 
 
 class Hallway(FloorPlan):
@@ -87,31 +88,28 @@ class Hallway(FloorPlan):
     def __initializeUpperLeftPositionAndLayout(self,
             waypointsEntryToExit: list) -> (Point, list):
         """ returns a tuple of the upperLeftPosition and the list(list(Tile))
-        layout based on the given waypoints """
+        layout based on the given waypoints, each segment is written whole
+        into a preallocated layout using layout coordinates """
         minPoint, maxPoint = self.__getMinAndMaxWaypointCoordinates(waypointsEntryToExit)
         # if a hallway is only a straight line the dif of min and max will be 0
         # when in reality it is 1, so must add Point(1, 1)
         area = maxPoint - minPoint + Point(1, 1)
         layout = Tile.NONE.generateLayoutOfSize(area.X, area.Y)
-        for i in range(1, len(waypointsEntryToExit)):
-            startWaypoint = waypointsEntryToExit[i - 1]
-            endWaypoint = waypointsEntryToExit[i]
-            middleWaypoint = Point(startWaypoint.X, startWaypoint.Y)
-            deltaX, deltaY = self.__getXYDeltaStepValues(startWaypoint, endWaypoint)
-            wallShift = Point(abs(deltaY), abs(deltaX))# x, y reversed in Point to get wall locations
-            while 1:
-                self.__writeNonOverlappingHallAndWalls(middleWaypoint != startWaypoint,
-                        minPoint, startWaypoint, middleWaypoint, endWaypoint,
-                        wallShift, layout)
-                nextWaypoint = middleWaypoint + Point(deltaX, deltaY)
-                if middleWaypoint == endWaypoint:
-                    # only write the final walls if it is not the end of the hall
-                    if endWaypoint != waypointsEntryToExit[-1]:
-                        self.__writeFinalWallsToLayout(minPoint, nextWaypoint,
-                                wallShift, layout)
-                    break
-                middleWaypoint = nextWaypoint
-        self.__overwriteDoorsInLayoutToNone(minPoint, waypointsEntryToExit, layout)
+        coordinates = [ (waypoint.X - minPoint.X, waypoint.Y - minPoint.Y)
+                for waypoint in waypointsEntryToExit ]
+        for i in range(1, len(coordinates)):
+            if coordinates[i - 1][1] == coordinates[i][1]:
+                written = self.__writeHorizontalSegment(coordinates[i - 1], coordinates[i], layout)
+            else:
+                written = self.__writeVerticalSegment(coordinates[i - 1], coordinates[i], layout)
+            if not written:
+                raise ValueError('Hallway has overlapping waypoints between {0} and {1}.'.format(
+                    str(waypointsEntryToExit[i - 1]), str(waypointsEntryToExit[i])))
+            # the corner past the end of a segment needs walls unless the
+            # hallway ends there
+            if i < len(coordinates) - 1:
+                self.__writeFinalWallsToLayout(coordinates[i - 1], coordinates[i], layout)
+        self.__overwriteDoorsInLayoutToNone(coordinates, layout)
         return self.__trimNoneTilesFromLayout(minPoint, layout)
 
 
@@ -126,86 +124,92 @@ class Hallway(FloorPlan):
         return Point(minX, minY), Point(maxX, maxY)
 
 
-    def __getXYDeltaStepValues(self, startWaypoint: Point, endWaypoint: Point) -> (int, int):
-        """ returns a tuple of the stepX and stepY in order to move from the
-        startWaypoint to the endWaypoint """
-        # vertical connection
-        if startWaypoint.X == endWaypoint.X:
-            deltaX = 0
-            deltaY = 1 if startWaypoint.Y < endWaypoint.Y else -1
-        # horizontal connection
-        else:
-            deltaX = 1 if startWaypoint.X < endWaypoint.X else -1
-            deltaY = 0
-        return deltaX, deltaY
-
-
-    def __writeNonOverlappingHallAndWalls(self, first: bool, minPoint: Point,
-            startWaypoint: Point, middleWaypoint: Point, endWaypoint: Point,
-            wallShift: Point, layout: list):
-        """ raises value error if the points overlap, otherwise sets the
-        hallways and walls accordingly in the mutated layout """
-        loc = middleWaypoint - minPoint
-        topOrLeftLoc = loc - wallShift
-        bottomOrRightLoc = loc + wallShift
-        # if its the start there is no way anything can overlap, this
-        # logic only holds have the first hall tile is placed
-        centerOverlap = layout[loc.Y][loc.X] == Tile.HALLWAY
-        topOrLeftOverlap = layout[topOrLeftLoc.Y][topOrLeftLoc.X] == Tile.HALLWAY
-        bottomOrRightOverlap = layout[bottomOrRightLoc.Y][bottomOrRightLoc.X] == Tile.HALLWAY
-        if first and any([centerOverlap, topOrLeftOverlap, bottomOrRightOverlap]):
-            raise ValueError('Hallway has overlapping waypoints between {0} and {1}.'.format(
-                str(startWaypoint), str(endWaypoint)))
-        layout[loc.Y][loc.X] = Tile.HALLWAY
-        if not topOrLeftOverlap:
-            layout[topOrLeftLoc.Y][topOrLeftLoc.X] = Tile.WALL
-        if not bottomOrRightOverlap:
-            layout[bottomOrRightLoc.Y][bottomOrRightLoc.X] = Tile.WALL
-    
-
-    def __writeFinalWallsToLayout(self, minPoint: Point, middleWaypoint: Point,
-            wallShift: Point, layout: list):
+    def __writeHorizontalSegment(self, start: tuple, end: tuple, layout: list) -> bool:
+        """ returns False if the segment overlaps the hallway so far, otherwise
+        writes its hall tiles and the walls above and below it and returns
+        True, the start tile was already written by the previous segment so it
+        is not checked for overlap """
+        (startX, y), (endX, _) = start, end
+        low = min(startX, endX)
+        high = max(startX, endX)
+        # the tiles after the start, as a slice of each row
+        checkLow = low if endX < startX else low + 1
+        checkHigh = high if endX > startX else high - 1
+        for row in [layout[y - 1], layout[y], layout[y + 1]]:
+            if Tile.HALLWAY in row[checkLow:checkHigh + 1]:
+                return False
+        layout[y][low:high + 1] = [Tile.HALLWAY] * (high - low + 1)
+        for row in [layout[y - 1], layout[y + 1]]:
+            startTile = row[startX]
+            row[low:high + 1] = [Tile.WALL] * (high - low + 1)
+            if startTile == Tile.HALLWAY:
+                row[startX] = startTile
+        return True
+
+
+    def __writeVerticalSegment(self, start: tuple, end: tuple, layout: list) -> bool:
+        """ returns False if the segment overlaps the hallway so far, otherwise
+        writes its hall tiles and the walls left and right of it and returns
+        True, the start tile was already written by the previous segment so it
+        is not checked for overlap """
+        (x, startY), (_, endY) = start, end
+        step = 1 if endY > startY else -1
+        for y in range(startY + step, endY + step, step):
+            row = layout[y]
+            if Tile.HALLWAY in row[x - 1:x + 2]:
+                return False
+        for y in range(startY, endY + step, step):
+            row = layout[y]
+            row[x] = Tile.HALLWAY
+            if row[x - 1] != Tile.HALLWAY:
+                row[x - 1] = Tile.WALL
+            if row[x + 1] != Tile.HALLWAY:
+                row[x + 1] = Tile.WALL
+        return True
+
+
+    def __writeFinalWallsToLayout(self, start: tuple, end: tuple, layout: list):
         """ mutates the layout so that the corners of the hallway have walls """
-        loc = middleWaypoint - minPoint
-        topOrLeftLoc = loc - wallShift
-        bottomOrRightLoc = loc + wallShift
-        if layout[topOrLeftLoc.Y][topOrLeftLoc.X] != Tile.HALLWAY:
-            layout[topOrLeftLoc.Y][topOrLeftLoc.X] = Tile.WALL
-        if layout[bottomOrRightLoc.Y][bottomOrRightLoc.X] != Tile.HALLWAY:
-            layout[bottomOrRightLoc.Y][bottomOrRightLoc.X] = Tile.WALL
+        deltaX = (end[0] > start[0]) - (end[0] < start[0])
+        deltaY = (end[1] > start[1]) - (end[1] < start[1])
+        x = end[0] + deltaX
+        y = end[1] + deltaY
+        # walls go on both sides perpendicular to the segment
+        for wallX, wallY in [(x - abs(deltaY), y - abs(deltaX)), (x + abs(deltaY), y + abs(deltaX))]:
+            if layout[wallY][wallX] != Tile.HALLWAY:
+                layout[wallY][wallX] = Tile.WALL
 
 
-    def __overwriteDoorsInLayoutToNone(self, minPoint: Point,
-            waypointsEntryToExit: list, layout: list):
+    def __overwriteDoorsInLayoutToNone(self, coordinates: list, layout: list):
         """ mutates the given layout such that the entry and exit doors are None
         tiles rather than Hallway tiles """
-        entryPoint = waypointsEntryToExit[0] - minPoint
-        exitPoint = waypointsEntryToExit[-1] - minPoint
-        layout[entryPoint.Y][entryPoint.X] = Tile.NONE
-        layout[exitPoint.Y][exitPoint.X] = Tile.NONE
+        for x, y in [coordinates[0], coordinates[-1]]:
+            layout[y][x] = Tile.NONE
 
 
     def __trimNoneTilesFromLayout(self, minPoint: Point, layout: list) -> (Point, list):
-        """ trims all full rows/columns of Tile.NONE in the layout, returns the
-        minPoint and the new layout object (since the min point might change) """
-        if all(tile == Tile.NONE for tile in layout[0]):
-            layout = layout[1:]
-            minPoint.relativeMove(0, 1)
-        if all(tile == Tile.NONE for tile in layout[-1]):
-            layout = layout[:-1]
-        if all(row[0] == Tile.NONE for row in layout):
-            for i in range(len(layout)):
-                layout[i] = layout[i][1:]
-            minPoint.relativeMove(1, 0)
-        if all(row[-1] == Tile.NONE for row in layout):
-            for i in range(len(layout)):
-                layout[i] = layout[i][:-1]
-        return minPoint, layout
+        """ trims all full rows/columns of Tile.NONE around the layout in a
+        single pass over its bounding box, returns the new minPoint and the new
+        layout object """
+        rows = [ y for y, row in enumerate(layout) if any(tile != Tile.NONE for tile in row) ]
+        top, bottom = rows[0], rows[-1]
+        left = len(layout[0])
+        right = -1
+        for row in layout[top:bottom + 1]:
+            for x, tile in enumerate(row):
+                if tile != Tile.NONE:
+                    left = min(left, x)
+                    break
+            for x in range(len(row) - 1, right, -1):
+                if row[x] != Tile.NONE:
+                    right = x
+                    break
+        return (minPoint + Point(left, top),
+                [ row[left:right + 1] for row in layout[top:bottom + 1] ])
 
 
     def __ensureRoom(self, room: any):
         """ raises value error if the room is not a Room object """
-        from room import Room
         if not isinstance(room, Room):
             raise ValueError('The given object is not a Room')
 
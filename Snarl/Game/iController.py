@@ -0,0 +1,46 @@
+#
+# iController.py
+# authors: Michael Curley & Drake Moore
+#
+
+from abc import ABC
+from moveResult import MoveResult
+from point import Point
+
+class IController(ABC):
+    """ represents the minimum functionality for an actor's controller, an
+    actor only depends on this so the controllers may depend on the actors,
+    an actor given no controller is given this one, which ignores its updates
+    and cannot move """
+
+    def updateGameState(self, gameState):
+        """ updates the controller with the actor's game state """
+        pass
+
+
+    def requestMove(self, gameState) -> Point:
+        """ requests a move based on the given game state for the actor """
+        raise NotImplementedError
+
+
+    def updateMoveResult(self, moveResult: MoveResult):
+        """ updates the controller with the result of the actor's move """
+        pass
+
+
+    def updateFinalStats(self, finalStats: list):
+        """ updates the controller with the final stats of the game """
+        pass
+
+
+    def flush(self):
+        """ delivers any updates held back to be sent together """
+        pass
+
+
+# ----- end of file ------------------------------------------------------------
+
+
+
+
+
@@ -0,0 +1,123 @@
+#
+# jsonStream.py
+# authors: Michael Curley & Drake Moore
+#
+
+from codec import JsonCodec
+from re import compile as compileRegex
+
+
+class JsonStreamReader:
+    """ represents the json messages read from a stream of bytes, nothing
+    delimits one message from the next so a read may hold part of a message or
+    several of them, the bytes read but not yet decoded are buffered until the
+    next message is complete, only the new bytes of each read are scanned (for
+    the brackets and quotes that open and close values) so a message is
+    decoded once, when its last byte arrives, however many reads it spans """
+
+    # the default number of bytes asked for per read and the most bytes that
+    # are buffered waiting for a message to complete
+    ReadSize = 4096
+    MaxBufferSize = 1 << 24
+
+    # the bytes a scan stops at, every other byte of a message (utf-8 bytes of
+    # characters outside ascii included) is skipped in one search
+    ValueStart = compileRegex(rb'[^ \t\n\r]')
+    Structural = compileRegex(rb'[\[\]{}"]')
+    StringEnd = compileRegex(rb'["\\]')
+    ScalarEnd = compileRegex(rb'[ \t\n\r\[\]{}",]')
+
+    def __init__(self, read, readSize: int = ReadSize, codec: JsonCodec = None):
+        """ read is a function of a byte count returning the bytes read (such
+        as a socket's recv), an empty result means the stream has ended, each
+        message's bytes are decoded by the codec """
+        self.read = read
+        self.readSize = readSize
+        self.codec = JsonCodec() if codec is None else codec
+        self.buffer = bytearray()
+        self.__resetScan()
+
+
+    def readMessage(self) -> any:
+        """ returns the next message, reading until it is complete, raises a
+        connection error if the stream ends first and a value error if the
+        buffered bytes grow too large to be a message or are not json """
+        while 1:
+            end = self.__scan()
+            if end is not None:
+                data = bytes(self.buffer[self.start:end])
+                del self.buffer[:end]
+                self.__resetScan()
+                return self.codec.decode(data)
+            if len(self.buffer) > JsonStreamReader.MaxBufferSize:
+                raise ValueError('A json message was larger than the stream buffer.')
+            data = self.read(self.readSize)
+            if not data:
+                raise ConnectionError('The stream ended before the json message did.')
+            self.buffer += data
+
+
+    def __resetScan(self):
+        """ starts scanning for the next message at the front of the buffer """
+        self.start = None
+        self.scanned = 0
+        self.depth = 0
+        self.inString = False
+        self.inScalar = False
+
+
+    def __scan(self) -> int:
+        """ returns the end of the message at the front of the buffer, or None
+        if it is not complete, continuing from where the last scan stopped, a
+        bare number or literal ends at the first byte that cannot be part of
+        it """
+        buffer = self.buffer
+        position = self.scanned
+        if self.start is None:
+            match = JsonStreamReader.ValueStart.search(buffer, position)
+            if match is None:
+                self.scanned = len(buffer)
+                return None
+            self.start = position = match.start()
+            if buffer[position] not in b'[{"':
+                self.inScalar = True
+                position += 1
+        if self.inScalar:
+            match = JsonStreamReader.ScalarEnd.search(buffer, position)
+            if match is None:
+                self.scanned = len(buffer)
+                return None
+            return match.start()
+        while 1:
+            if self.inString:
+                match = JsonStreamReader.StringEnd.search(buffer, position)
+                if match is None:
+                    break
+                if buffer[match.start()] == ord('\\'):
+                    # the escaped byte may not have been read yet
+                    position = match.start() + 2
+                    continue
+                self.inString = False
+                position = match.end()
+                if self.depth == 0:
+                    return position
+                continue
+            match = JsonStreamReader.Structural.search(buffer, position)
+            if match is None:
+                break
+            position = match.end()
+            byte = buffer[match.start()]
+            if byte == ord('"'):
+                self.inString = True
+            elif byte in b'[{':
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if self.depth <= 0:
+                    return position
+        self.scanned = max(position, len(buffer))
+        return None
+
+
+
+# ----- end of file ------------------------------------------------------------
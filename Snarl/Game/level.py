@@ -7,9 +7,12 @@ from actor import Actor, Adversary, Player
 from floorPlan import FloorPlan
 from hallway import Hallway
 from interactable import Interactable
+from levelGraph import LevelGraph
 from tile import Tile
 from point import Point
+from random import randint
 from room import Room
+from tileSampler import TileSampler
 
 class Level(FloorPlan):
     """ represents a collection of rooms connected by hallways """
@@ -23,26 +26,57 @@ class Level(FloorPlan):
 
     def __init__(self, rooms: list, hallways: list):
         """ initializes a level with the given list of rooms and hallways, a
-        level is valid if it has at least 2 rooms and at least 1 hallway """
+        level is valid if it has at least 2 rooms and at least 1 hallway, the
+        graph of its rooms and hallways is built once here """
         self.__validateRoomsConnectedByHallways(rooms, hallways)
         self.__validateNoOverlappingLayouts(rooms, hallways)
         upperLeftPosition, layout = self.__initLevelFloorPlan(rooms, hallways)
         FloorPlan.__init__(self, upperLeftPosition, layout)
         self.rooms = rooms
         self.hallways = hallways
+        self.graph = LevelGraph(rooms, hallways, upperLeftPosition, self.width, self.height)
+        self.pointsByTile, self.roomStartPoints = self.__indexPoints()
+        # every room's start points, shared so a borrower must restore it
+        self.roomStartPointSampler = TileSampler([ point for room in rooms
+                for point in self.getRoomStartPoints(room) ])
+        self.topLeftRoom, self.bottomRightRoom = self.__getTopLeftAndBottomRightRooms()
     
 
     def getPlayerAndAdversaryStartingPoints(self, invalidPoints: list) -> (list, list):
         """ gets the starting points that players and adversaries can spawn in,
         the returned lists are lists of points for players and adversaries,
         respectively """
-        topLeftRoom, bottomRightRoom = self.__getTopLeftAndBottomRightRooms()
-        topLeftPoints = topLeftRoom.getTraversablePointsInLayout(
-                self.ActorStartPlacementTiles)
-        bottomRightPoints = bottomRightRoom.getTraversablePointsInLayout(
-                self.ActorStartPlacementTiles)
+        topLeftPoints = self.getRoomStartPoints(self.topLeftRoom)
+        bottomRightPoints = self.getRoomStartPoints(self.bottomRightRoom)
         return (self.__removeElementsFromList(topLeftPoints, invalidPoints),
                 self.__removeElementsFromList(bottomRightPoints, invalidPoints))
+
+
+    def getPointsOfTile(self, tile: Tile) -> list:
+        """ returns the absolute points of every tile of the given type in the
+        level (in row order), the list is shared and must not be modified """
+        return self.pointsByTile.get(tile, [])
+
+
+    def getRandomTraversablePointInLayout(self, traversableTiles: list,
+            layout: list = None) -> Point:
+        """ returns a random traversable point in the layout, for the level's
+        own layout the point is picked from the indexed points of each tile
+        type without scanning the layout (none tiles are not indexed) """
+        if (layout is not None and layout is not self.layout) or Tile.NONE in traversableTiles:
+            return FloorPlan.getRandomTraversablePointInLayout(self, traversableTiles, layout)
+        pointLists = [ self.getPointsOfTile(tile) for tile in dict.fromkeys(traversableTiles) ]
+        index = randint(0, sum(map(len, pointLists)) - 1)
+        for points in pointLists:
+            if index < len(points):
+                return points[index]
+            index -= len(points)
+
+
+    def getRoomStartPoints(self, room: Room) -> list:
+        """ returns the points of the room actors may be placed on (in row
+        order), the list is shared and must not be modified """
+        return self.roomStartPoints[self.graph.getIndex(room)]
         
     
     def __validateRoomsConnectedByHallways(self, rooms: list, hallways: list):
@@ -65,7 +99,7 @@ class Level(FloorPlan):
             hallways: list) -> list:
         """ adds neighboring room and hallway references to each others objects,
         retuns a list of unconnected door Points """
-        doorLocationsByRoom = self.__mapDoorLocationsByRoom(rooms)
+        roomsByDoorLocation = self.__mapRoomsByDoorLocation(rooms)
 
         def raiseHallError(side: str, point: Point):
             raise ValueError('Hallway {0} at {1} does not overlap with a room\'s door.'.format(
@@ -73,14 +107,8 @@ class Level(FloorPlan):
 
         # make sure each hallway end point is connected to a door
         for hallway in hallways:
-            entryRoom = None
-            exitRoom = None
-            for room in doorLocationsByRoom:
-                doorLocations = doorLocationsByRoom[room]
-                if hallway.entryDoorLocation in doorLocations:
-                    entryRoom = room
-                if hallway.exitDoorLocation in doorLocations:
-                    exitRoom = room
+            entryRoom = roomsByDoorLocation.get(hallway.entryDoorLocation, None)
+            exitRoom = roomsByDoorLocation.get(hallway.exitDoorLocation, None)
 
             # each hallway must have an entry and exit room
             if entryRoom is None:
@@ -95,48 +123,57 @@ class Level(FloorPlan):
             exitRoom.addConnectedHallway(hallway)
 
             # remove these door locations connected to the current hallway
-            doorLocationsByRoom[entryRoom].remove(hallway.entryDoorLocation)
-            doorLocationsByRoom[exitRoom].remove(hallway.exitDoorLocation)
-        
-        # return unconnected flatlist of unconnected door locations
-        doorLocationsListOfLists = map(lambda room: doorLocationsByRoom[room], doorLocationsByRoom)
-        return [doorLocation for doorLocations in doorLocationsListOfLists for doorLocation in doorLocations]
+            roomsByDoorLocation.pop(hallway.entryDoorLocation, None)
+            roomsByDoorLocation.pop(hallway.exitDoorLocation, None)
 
+        # the remaining door locations are unconnected, in room order
+        return list(roomsByDoorLocation)
 
-    def __mapDoorLocationsByRoom(self, rooms: list) -> dict:
-        """ returns a dictionary keyed by room objects whose values are a list
-        of door locations """
-        doorLocationsByRoom = dict()
+
+    def __mapRoomsByDoorLocation(self, rooms: list) -> dict:
+        """ returns a dictionary keyed by absolute door locations whose values
+        are the room the door belongs to """
+        roomsByDoorLocation = dict()
         for room in rooms:
-            doorLocationsByRoom[room] = list(map(
-                lambda relativeDoorLocation: room.upperLeftPosition + relativeDoorLocation,
-                room.relativeDoorLocations))
-        return doorLocationsByRoom
+            for relativeDoorLocation in room.relativeDoorLocations:
+                roomsByDoorLocation[room.upperLeftPosition + relativeDoorLocation] = room
+        return roomsByDoorLocation
 
     
     def __validateNoOverlappingLayouts(self, rooms: list, hallways: list):
-        """ raises error if any rooms or hallways overlap """
-        nonEmptyTiles = list()
+        """ raises error if any rooms or hallways overlap, every occupied
+        coordinate is added to a single set so this is linear in tile count """
+        occupied = set()
+        overlapping = list()
+        for coordinate in self.__getOccupiedCoordinates(rooms, hallways):
+            if coordinate in occupied:
+                overlapping.append(Point(coordinate[0], coordinate[1]))
+            else:
+                occupied.add(coordinate)
+        if len(overlapping) > 0:
+            raise ValueError('Overlap occurs at coordinates: {0}.'.format(
+                ', '.join(map(str, overlapping))))
+
+
+    def __getOccupiedCoordinates(self, rooms: list, hallways: list):
+        """ yields the (x, y) coordinate of every tile occupied by a room or
+        hallway, a coordinate is yielded once for each floor plan on it """
         # the entire room should be treated as non-empty
         for room in rooms:
-            for row in range(room.height):
-                for column in range(room.width):
-                    nonEmptyTiles.append(room.upperLeftPosition + Point(column, row))
+            left = room.upperLeftPosition.X
+            top = room.upperLeftPosition.Y
+            for y in range(top, top + room.height):
+                for x in range(left, left + room.width):
+                    yield (x, y)
 
         # a hallway only occupies a subset of its layout
         for hallway in hallways:
-            for row in range(hallway.height):
-                for column in range(hallway.width):
-                    if hallway.layout[row][column] == Tile.HALLWAY:
-                        nonEmptyTiles.append(hallway.upperLeftPosition + Point(column, row))
-            
-        # sets contain no duplicates, so checks length
-        nonEmptyTilesNoDuplicates = set(nonEmptyTiles)
-        if len(nonEmptyTiles) != len(nonEmptyTilesNoDuplicates):
-            for nonEmptyTile in nonEmptyTilesNoDuplicates:
-                nonEmptyTiles.remove(nonEmptyTile)
-            raise ValueError('Overlap occurs at coordinates: {0}.'.format(
-                ', '.join(map(str, nonEmptyTiles))))
+            left = hallway.upperLeftPosition.X
+            top = hallway.upperLeftPosition.Y
+            for row, tiles in enumerate(hallway.layout):
+                for column, tile in enumerate(tiles):
+                    if tile == Tile.HALLWAY:
+                        yield (left + column, top + row)
 
 
     def __initLevelFloorPlan(self, rooms: list, hallways: list) -> (Point, list):
@@ -151,12 +188,13 @@ class Level(FloorPlan):
         # overwrite the empty layout with the data from each floor plan, write
         # rooms last to ensure doors are included
         for floorPlan in hallways + rooms:
-            for row in range(floorPlan.height):
-                for column in range(floorPlan.width):
-                    nonEmptyTile = floorPlan.layout[row][column]
+            left = floorPlan.upperLeftPosition.X - minPoint.X
+            top = floorPlan.upperLeftPosition.Y - minPoint.Y
+            for row, tiles in enumerate(floorPlan.layout):
+                tileRow = tileLayout[top + row]
+                for column, nonEmptyTile in enumerate(tiles):
                     if nonEmptyTile != Tile.NONE:
-                        layoutPosition = floorPlan.upperLeftPosition + Point(column, row) - minPoint
-                        tileLayout[layoutPosition.Y][layoutPosition.X] = nonEmptyTile
+                        tileRow[left + column] = nonEmptyTile
         return minPoint, tileLayout
     
 
@@ -172,6 +210,27 @@ class Level(FloorPlan):
         return Point(minX, minY), Point(maxX, maxY)
 
 
+    def __indexPoints(self) -> (dict, list):
+        """ returns the points of each tile type (except none) and the points
+        of each room (by room index) that actors may be placed on, found in one
+        pass over the layout so neither needs a rescan later """
+        pointsByTile = dict()
+        roomStartPoints = [ list() for _ in self.rooms ]
+        left = self.upperLeftPosition.X
+        top = self.upperLeftPosition.Y
+        for row, tiles in enumerate(self.layout):
+            for column, tile in enumerate(tiles):
+                if tile == Tile.NONE:
+                    continue
+                point = Point(left + column, top + row)
+                pointsByTile.setdefault(tile, list()).append(point)
+                if tile in self.ActorStartPlacementTiles:
+                    roomIndex = self.graph.getComponentIndexAt(point.X, point.Y)
+                    if self.graph.isRoomIndex(roomIndex):
+                        roomStartPoints[roomIndex].append(point)
+        return pointsByTile, roomStartPoints
+
+
     def __getTopLeftAndBottomRightRooms(self) -> (Room, Room):
         """ returns a tuple of the top left and bottom right Room in the layout """
         distanceToTopLeftMap = {
@@ -0,0 +1,77 @@
+#
+# levelCache.py
+# authors: Michael Curley & Drake Moore
+#
+
+from hashlib import sha256
+from os import makedirs, path, replace
+from pickle import dump, load, HIGHEST_PROTOCOL
+from tempfile import NamedTemporaryFile
+
+
+class LevelCache:
+    """ represents a directory of compiled levels files, the first time a
+    levels file is parsed its validated (level, keyLocation, exitLocation)
+    tuples are pickled under the sha256 of the file's contents, later loads
+    unpickle them directly which skips json parsing and level validation """
+
+    # the compiled format version, bump it whenever Level, Room, Hallway or
+    # any object they hold changes shape so stale caches are ignored
+    Version = 4
+
+    FileExtension = '.levelcache'
+
+    def __init__(self, directory: str):
+        """ the directory is created if it does not exist, only point it at a
+        directory you trust since cached files are unpickled """
+        makedirs(directory, exist_ok = True)
+        self.directory = directory
+
+
+    def getLevels(self, fileName: str, parseLevels) -> list:
+        """ returns the compiled levels of the file, parseLevels is called with
+        the file name (and its result cached) only when the cache misses """
+        cacheFileName = self.getCacheFileName(fileName)
+        levels = self.__load(cacheFileName)
+        if levels is None:
+            levels = parseLevels(fileName)
+            self.__store(cacheFileName, levels)
+        return levels
+
+
+    def getCacheFileName(self, fileName: str) -> str:
+        """ returns the name of the cache file for the current contents of the
+        levels file """
+        digest = sha256()
+        with open(fileName, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                digest.update(chunk)
+        return path.join(self.directory, '{0}-v{1}{2}'.format(
+            digest.hexdigest(), self.Version, self.FileExtension))
+
+
+    def __load(self, cacheFileName: str) -> list:
+        """ returns the cached levels or None if there are none, an unreadable
+        cache file is treated as a miss """
+        if not path.isfile(cacheFileName):
+            return None
+        try:
+            with open(cacheFileName, 'rb') as f:
+                cached = load(f)
+            if cached['version'] == self.Version:
+                return cached['levels']
+        except Exception:
+            pass
+        return None
+
+
+    def __store(self, cacheFileName: str, levels: list):
+        """ writes the levels to a temporary file which is then renamed so a
+        concurrent reader never sees a partial cache file """
+        with NamedTemporaryFile('wb', dir = self.directory, delete = False) as f:
+            dump({ 'version': self.Version, 'levels': levels }, f, HIGHEST_PROTOCOL)
+        replace(f.name, cacheFileName)
+
+
+
+# ----- end of file ------------------------------------------------------------
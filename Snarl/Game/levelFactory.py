@@ -0,0 +1,36 @@
+#
+# levelFactory.py
+# authors: Michael Curley & Drake Moore
+#
+
+from levelManager import LevelManager
+
+
+class LevelFactory:
+    """ represents a level that is built just before it is played, the given
+    function returns a LevelManagerBuilder with every component and actor
+    registered and is only called when the level is needed """
+
+    def __init__(self, createBuilder):
+        self.createBuilder = createBuilder
+        self.builder = None
+
+
+    def prepare(self):
+        """ creates and prepares the builder (the level and starting points),
+        the actors are not touched so this may run on another thread while
+        they play a previous level """
+        if self.builder is None:
+            self.builder = self.createBuilder().prepare()
+        return self
+
+
+    def build(self) -> LevelManager:
+        """ returns the LevelManager of the level, preparing it if needed """
+        levelManager = self.prepare().builder.build()
+        self.builder = None
+        return levelManager
+
+
+
+# ----- end of file ------------------------------------------------------------
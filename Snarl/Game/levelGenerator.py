@@ -0,0 +1,240 @@
+#
+# levelGenerator.py
+# authors: Michael Curley & Drake Moore
+#
+
+from hallway import Hallway
+from json import dumps
+from level import Level
+from math import ceil, sqrt
+from point import Point
+from random import Random
+from room import Room
+from roomBuilder import RoomBuilder
+from snarlParser import SnarlParser
+
+
+class LevelGenerator:
+    """ represents a generator of random, always connected levels, rooms are
+    placed on a grid (one room per cell) and neighboring cells are connected
+    by hallways that run through the gaps between the cells, a random spanning
+    tree guarantees every room is reachable and the density decides how many
+    of the remaining neighbors are also connected """
+
+    # the defaults produce small levels similar to the shipped ones
+    DefaultRoomCount = 4
+    DefaultMinRoomSize = 5
+    DefaultMaxRoomSize = 8
+    DefaultHallwayWaypoints = 2
+    DefaultDensity = 0.0
+
+    # the largest room must leave at least 3 interior rows/columns so that a
+    # hallway bend never lines up with both of its doors
+    MinimumMaxRoomSize = 5
+
+    def __init__(self):
+        self.roomCount = self.DefaultRoomCount
+        self.minRoomSize = self.DefaultMinRoomSize
+        self.maxRoomSize = self.DefaultMaxRoomSize
+        self.hallwayWaypoints = self.DefaultHallwayWaypoints
+        self.density = self.DefaultDensity
+        self.random = Random()
+
+
+    def setRoomCount(self, roomCount: int):
+        """ sets the number of rooms in each generated level """
+        self.__ensureType(roomCount, int, 'Room count')
+        if roomCount < Level.MinimumRoomCount:
+            raise ValueError('A generated level must have at least {0} rooms.'.format(
+                Level.MinimumRoomCount))
+        self.roomCount = roomCount
+        return self
+
+
+    def setRoomSize(self, minRoomSize: int, maxRoomSize: int):
+        """ sets the inclusive range of room widths and heights """
+        self.__ensureType(minRoomSize, int, 'Minimum room size')
+        self.__ensureType(maxRoomSize, int, 'Maximum room size')
+        if minRoomSize < Room.MinimumLayoutSize or minRoomSize > maxRoomSize:
+            raise ValueError('Room sizes must be at least {0} and the minimum cannot exceed the maximum.'.format(
+                Room.MinimumLayoutSize))
+        if maxRoomSize < self.MinimumMaxRoomSize:
+            raise ValueError('The maximum room size must be at least {0}.'.format(
+                self.MinimumMaxRoomSize))
+        self.minRoomSize = minRoomSize
+        self.maxRoomSize = maxRoomSize
+        return self
+
+
+    def setHallwayWaypoints(self, hallwayWaypoints: int):
+        """ sets the number of waypoints (excluding the doors) of each hallway,
+        it must be a positive even number since every bend adds two, a hallway
+        may end up with fewer when its doors happen to line up """
+        self.__ensureType(hallwayWaypoints, int, 'Hallway waypoints')
+        if hallwayWaypoints < 2 or hallwayWaypoints % 2 != 0:
+            raise ValueError('Hallway waypoints must be a positive even number.')
+        self.hallwayWaypoints = hallwayWaypoints
+        return self
+
+
+    def setDensity(self, density: float):
+        """ sets the chance (0 to 1) that two neighboring rooms not already
+        connected by the spanning tree are connected by a hallway """
+        if not isinstance(density, (int, float)) or density < 0 or density > 1:
+            raise ValueError('Density must be a number between 0 and 1.')
+        self.density = density
+        return self
+
+
+    def setSeed(self, seed: int):
+        """ seeds the generator's own random number generator, the global
+        random module is never used """
+        self.random.seed(seed)
+        return self
+
+
+    def generate(self) -> (Point, Point, Level):
+        """ returns a key location, exit location and a new random level """
+        columns = ceil(sqrt(self.roomCount))
+        bends = self.hallwayWaypoints // 2
+        # a gap needs a column/row for every bend plus a wall on each side
+        gap = 2 * bends + 2
+        cellSize = self.maxRoomSize + gap
+        rooms = [ self.__placeRoom(i % columns, i // columns, cellSize)
+                for i in range(self.roomCount) ]
+        doors = [ list() for _ in rooms ]
+        hallways = [ self.__connect(rooms[a], rooms[b], doors[a], doors[b],
+                    b - a == 1, bends, cellSize)
+                for a, b in self.__chooseConnections(columns) ]
+        rooms = [ RoomBuilder(
+                    ).setUpperLeftPosition(room['position']
+                    ).setSize(room['width'], room['height']
+                    ).addDoors(roomDoors
+                    ).build()
+                for room, roomDoors in zip(rooms, doors) ]
+        keyLocation = self.__randomInteriorPoint(rooms[0])
+        exitLocation = self.__randomInteriorPoint(rooms[-1])
+        return keyLocation, exitLocation, Level(rooms, hallways)
+
+
+    def generateJson(self) -> dict:
+        """ returns a new random level as a json level object """
+        keyLocation, exitLocation, level = self.generate()
+        return SnarlParser().levelToJson(level.rooms, level.hallways,
+                keyLocation, exitLocation, False)
+
+
+    def __placeRoom(self, column: int, row: int, cellSize: int) -> dict:
+        """ returns the position and size of a random room within a cell """
+        width = self.random.randint(self.minRoomSize, self.maxRoomSize)
+        height = self.random.randint(self.minRoomSize, self.maxRoomSize)
+        return {
+            'column': column,
+            'row': row,
+            'cell': Point(column * cellSize, row * cellSize),
+            'position': Point(column * cellSize + self.random.randint(0, self.maxRoomSize - width),
+                row * cellSize + self.random.randint(0, self.maxRoomSize - height)),
+            'width': width,
+            'height': height
+        }
+
+
+    def __chooseConnections(self, columns: int) -> list:
+        """ returns a list of (a, b) room index pairs to connect, b is always
+        the right or lower neighbor of a, a random spanning tree is chosen
+        first (kruskal over shuffled edges) then extra edges by density """
+        edges = list()
+        for i in range(self.roomCount):
+            if (i + 1) % columns != 0 and i + 1 < self.roomCount:
+                edges.append((i, i + 1))
+            if i + columns < self.roomCount:
+                edges.append((i, i + columns))
+        self.random.shuffle(edges)
+        parents = list(range(self.roomCount))
+        def find(i: int) -> int:
+            while parents[i] != i:
+                parents[i] = parents[parents[i]]
+                i = parents[i]
+            return i
+        connections = list()
+        for a, b in edges:
+            rootA = find(a)
+            rootB = find(b)
+            if rootA != rootB:
+                parents[rootA] = rootB
+                connections.append((a, b))
+            elif self.random.random() < self.density:
+                connections.append((a, b))
+        return sorted(connections)
+
+
+    def __connect(self, roomA: dict, roomB: dict, doorsA: list, doorsB: list,
+            horizontal: bool, bends: int, cellSize: int) -> Hallway:
+        """ returns a hallway from roomA to its right (or lower) neighbor roomB
+        and records the relative door locations of both rooms, the hallway
+        zig-zags through the gap between the cells so it can never cross a
+        room or another hallway """
+        # work in (along, across) coordinates so both directions share code
+        def toAlongAcross(p: Point) -> (int, int):
+            return (p.X, p.Y) if horizontal else (p.Y, p.X)
+        def fromAlongAcross(along: int, across: int) -> Point:
+            return Point(along, across) if horizontal else Point(across, along)
+        alongA, acrossA = toAlongAcross(roomA['position'])
+        alongB, acrossB = toAlongAcross(roomB['position'])
+        lengthA, breadthA = ((roomA['width'], roomA['height']) if horizontal
+                else (roomA['height'], roomA['width']))
+        breadthB = roomB['height'] if horizontal else roomB['width']
+        cellAlong, cellAcross = toAlongAcross(roomA['cell'])
+
+        doorA = (alongA + lengthA - 1, self.random.randint(acrossA + 1, acrossA + breadthA - 2))
+        doorB = (alongB, self.random.randint(acrossB + 1, acrossB + breadthB - 2))
+        alternatives = [ v for v in range(cellAcross + 1, cellAcross + self.maxRoomSize - 1)
+                if v not in [doorA[1], doorB[1]] ]
+        alternative = self.random.choice(alternatives)
+
+        # each bend runs across the gap at its own column, alternating between
+        # the alternative and doorB's position so that the last one ends in line
+        waypoints = [doorA]
+        across = doorA[1]
+        gapStart = cellAlong + self.maxRoomSize
+        for i in range(bends):
+            along = gapStart + 1 + 2 * i
+            nextAcross = doorB[1] if (bends - 1 - i) % 2 == 0 else alternative
+            waypoints += [(along, across), (along, nextAcross)]
+            across = nextAcross
+        waypoints.append(doorB)
+
+        points = list()
+        for along, across in waypoints:
+            p = fromAlongAcross(along, across)
+            if len(points) == 0 or points[-1] != p:
+                points.append(p)
+        doorsA.append(points[0] - roomA['position'])
+        doorsB.append(points[-1] - roomB['position'])
+        return Hallway(points)
+
+
+    def __randomInteriorPoint(self, room: Room) -> Point:
+        """ returns a random empty point of the room """
+        emptyPoints = room.getTraversablePointsInLayout(Level.ActorStartPlacementTiles)
+        return emptyPoints[self.random.randint(0, len(emptyPoints) - 1)]
+
+
+    def __ensureType(self, o: object, t: type, name: str):
+        """ raises a value error if the given object is of the wrong type """
+        if not isinstance(o, t):
+            raise ValueError('{0} must be of type {1}.'.format(name, str(t)))
+
+
+
+def writeLevelsFile(fileName: str, jsonLevels: list):
+    """ writes the json levels in the snarl.levels format, a level count
+    followed by each level """
+    with open(fileName, 'w') as f:
+        f.write('{0}\n'.format(len(jsonLevels)))
+        for jsonLevel in jsonLevels:
+            f.write(dumps(jsonLevel) + '\n')
+
+
+
+# ----- end of file ------------------------------------------------------------
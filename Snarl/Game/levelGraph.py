@@ -0,0 +1,173 @@
+#
+# levelGraph.py
+# authors: Michael Curley & Drake Moore
+#
+
+from collections import deque
+from point import Point
+from tile import Tile
+
+
+class LevelGraph:
+    """ represents the rooms and hallways of a level as a graph, components are
+    indexed with the rooms first (in level order) followed by the hallways, a
+    room is adjacent to its connected hallways and a hallway to its entry and
+    exit rooms """
+
+    # the component index of a tile that is in no room or hallway and the hop
+    # count between rooms that are not connected
+    NoComponent = -1
+    Unreachable = -1
+
+    def __init__(self, rooms: list, hallways: list, upperLeftPosition: Point,
+            width: int, height: int):
+        """ builds the component index of every tile of the level (whose bounds
+        are given) and the component adjacency, the rooms and hallways must
+        already be connected to each other """
+        self.rooms = rooms
+        self.hallways = hallways
+        self.components = rooms + hallways
+        self.upperLeftPosition = upperLeftPosition
+        self.width = width
+        self.height = height
+        self.__componentIndices = self.__createComponentIndices()
+        self.__componentIndexByFloorPlan = { id(component): index
+                for index, component in enumerate(self.components) }
+        self.adjacency = self.__createAdjacency()
+        self.__roomHops = dict()
+
+
+    def getComponentIndex(self, point: Point) -> int:
+        """ returns the index of the room or hallway at the absolute point, or
+        NoComponent if there is none """
+        return self.getComponentIndexAt(point.X, point.Y)
+
+
+    def getComponentIndexAt(self, x: int, y: int) -> int:
+        """ returns the index of the room or hallway at the absolute coordinate,
+        or NoComponent if there is none """
+        x -= self.upperLeftPosition.X
+        y -= self.upperLeftPosition.Y
+        if x < 0 or y < 0 or x >= self.width or y >= self.height:
+            return LevelGraph.NoComponent
+        return self.__componentIndices[y][x]
+
+
+    def getComponent(self, point: Point):
+        """ returns the Room or Hallway at the absolute point, or None """
+        index = self.getComponentIndex(point)
+        return None if index == LevelGraph.NoComponent else self.components[index]
+
+
+    def getIndex(self, component) -> int:
+        """ returns the component index of the room or hallway of this level """
+        index = self.__componentIndexByFloorPlan.get(id(component), None)
+        if index is None:
+            raise ValueError('The given floor plan is not part of this level.')
+        return index
+
+
+    def isRoomIndex(self, index: int) -> bool:
+        """ returns if the component index is a room """
+        return 0 <= index < len(self.rooms)
+
+
+    def getRoomHops(self, fromRoomIndex: int, toRoomIndex: int) -> int:
+        """ returns the fewest hallways walked between the rooms, or Unreachable
+        if they are not connected """
+        return self.getRoomHopsFrom(toRoomIndex)[fromRoomIndex]
+
+
+    def getRoomHopsFrom(self, roomIndex: int) -> list:
+        """ returns the hop count from the room to every room (by room index),
+        each row of the all pairs table is computed once on first use so very
+        large levels only pay for the rooms that are queried """
+        self.__ensureRoomIndex(roomIndex)
+        hops = self.__roomHops.get(roomIndex, None)
+        if hops is None:
+            hops = self.__createRoomHopsFrom(roomIndex)
+            self.__roomHops[roomIndex] = hops
+        return hops
+
+
+    def getRoomRoute(self, fromRoomIndex: int, toRoomIndex: int) -> list:
+        """ returns the component indices from one room to the other through
+        the fewest hallways (alternating rooms and hallways, both rooms
+        included), or None if they are not connected """
+        hopsToTarget = self.getRoomHopsFrom(toRoomIndex)
+        if hopsToTarget[fromRoomIndex] == LevelGraph.Unreachable:
+            return None
+        route = [fromRoomIndex]
+        current = fromRoomIndex
+        while current != toRoomIndex:
+            for hallwayIndex in self.adjacency[current]:
+                nextRoom = self.__getOtherRoomIndex(hallwayIndex, current)
+                if hopsToTarget[nextRoom] == hopsToTarget[current] - 1:
+                    route += [hallwayIndex, nextRoom]
+                    current = nextRoom
+                    break
+        return route
+
+
+    def __createComponentIndices(self) -> list:
+        """ returns the layout sized grid of component indices, rooms cover
+        their whole rectangle while hallways only cover their hallway tiles """
+        left = self.upperLeftPosition.X
+        top = self.upperLeftPosition.Y
+        indices = [ [LevelGraph.NoComponent] * self.width for _ in range(self.height) ]
+        for index, room in enumerate(self.rooms):
+            x = room.upperLeftPosition.X - left
+            y = room.upperLeftPosition.Y - top
+            roomRow = [index] * room.width
+            for row in range(y, y + room.height):
+                indices[row][x:x + room.width] = roomRow
+        for index, hallway in enumerate(self.hallways, len(self.rooms)):
+            x = hallway.upperLeftPosition.X - left
+            y = hallway.upperLeftPosition.Y - top
+            for row, tiles in enumerate(hallway.layout):
+                indexRow = indices[y + row]
+                for column, tile in enumerate(tiles):
+                    if tile == Tile.HALLWAY:
+                        indexRow[x + column] = index
+        return indices
+
+
+    def __createAdjacency(self) -> list:
+        """ returns the list of neighboring component indices of each component """
+        adjacency = [ [ self.getIndex(hallway) for hallway in room.connectedHallways ]
+                for room in self.rooms ]
+        adjacency += [ [ self.getIndex(hallway.entryRoom), self.getIndex(hallway.exitRoom) ]
+                for hallway in self.hallways ]
+        return adjacency
+
+
+    def __createRoomHopsFrom(self, roomIndex: int) -> list:
+        """ returns the hop count from the room to every room by breadth first
+        search over the hallways """
+        hops = [LevelGraph.Unreachable] * len(self.rooms)
+        hops[roomIndex] = 0
+        queue = deque([roomIndex])
+        while queue:
+            current = queue.popleft()
+            for hallwayIndex in self.adjacency[current]:
+                nextRoom = self.__getOtherRoomIndex(hallwayIndex, current)
+                if hops[nextRoom] == LevelGraph.Unreachable:
+                    hops[nextRoom] = hops[current] + 1
+                    queue.append(nextRoom)
+        return hops
+
+
+    def __getOtherRoomIndex(self, hallwayIndex: int, roomIndex: int) -> int:
+        """ returns the room index on the other end of the hallway """
+        entryIndex, exitIndex = self.adjacency[hallwayIndex]
+        return exitIndex if entryIndex == roomIndex else entryIndex
+
+
+    def __ensureRoomIndex(self, roomIndex: int):
+        """ raises a value error if the index is not a room index """
+        if not isinstance(roomIndex, int) or not self.isRoomIndex(roomIndex):
+            raise ValueError('{0} is not a valid room index.'.format(roomIndex))
+
+
+
+# ----- end of file ------------------------------------------------------------
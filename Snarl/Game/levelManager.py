@@ -4,19 +4,23 @@
 #
 
 from actor import Actor, Player, Adversary, Ghost, Zombie
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import nullcontext
 from copy import copy
 from floorPlan import FloorPlan
 from gameState import ActorGameState, GameState
 from hallway import Hallway
 from interactable import Interactable
 from level import Level
+from metrics import MetricsRegistry
 from moveResult import MoveResult
 from tile import Tile
 from point import Point
-from random import randint
 from room import Room
 from ruleChecker import RuleChecker
 from snarlDisconnectError import SnarlDisconnectError
+from tileSampler import TileSampler
+from turnScheduler import TurnScheduler, RoundRobinScheduler
 
 
 class LevelManager:
@@ -26,14 +30,26 @@ class LevelManager:
     MinPlayers = 1
     MaxPlayers = 4
 
+    # the move results that may end a level, a disconnect counts as an eject
+    LevelChangingResults = [MoveResult.Exit, MoveResult.Eject]
+
     def __init__(self, floorPlan: FloorPlan, players: list, adversaries: list,
             playerStartingPoints: list, adversaryStartingPoints: list,
             keyLocation: Point, exitLocation: Point, keyCollected = False,
             ruleChecker: RuleChecker = None, observers: list = list(),
-            currentLevel: int = -1, totalLevels: int = -1):
+            currentLevel: int = -1, totalLevels: int = -1,
+            turnScheduler: TurnScheduler = None, simultaneousTurns: bool = False,
+            moveDeadline: float = None):
         """ this class manages a floor plan for a given number of players and
         adversaries, players and adversaries will be placed at a location from
-        their corresponding list of Point """
+        their corresponding list of Point, turns are taken in order of the
+        turn scheduler (round robin by default) unless turns are simultaneous,
+        then every active actor is asked for a move at once each round and the
+        moves are resolved in actor order, a move not made within the deadline
+        (in seconds, None waits forever) is treated as staying in place """
+        if moveDeadline is not None and (not isinstance(moveDeadline, (int, float))
+                or moveDeadline <= 0):
+            raise ValueError('The move deadline must be a positive number of seconds.')
         self.__validatePlayersAndAdversaries(players, adversaries)
         self.floorPlan = floorPlan
         self.__validatePositionIsEmpty(keyLocation, 'Key')
@@ -44,6 +60,9 @@ class LevelManager:
         self.adversaryStartingPoints = adversaryStartingPoints
         self.__isolateFloorPlanComponents(self.floorPlan)
         self.ruleChecker = RuleChecker() if ruleChecker is None else ruleChecker
+        self.turnScheduler = RoundRobinScheduler() if turnScheduler is None else turnScheduler
+        self.simultaneousTurns = simultaneousTurns
+        self.moveDeadline = moveDeadline
         self.players = { actor.name : actor for actor in players }
         self.adversaries = { actor.name : actor for actor in adversaries }
         self.allActors = players + adversaries
@@ -54,8 +73,11 @@ class LevelManager:
         self.gameWon = False
         self.messages = list()
         self.stats = dict()
+        self.metrics = None
         self.currentLevel = currentLevel
         self.totalLevels = totalLevels
+        self.emptyPoints = self.__createEmptyPointSampler()
+        self.__coveredPoints = set()
         self.resetActorLocations()
     
 
@@ -90,15 +112,16 @@ class LevelManager:
     def getActorGameState(self, name: str) -> ActorGameState:
         """ returns the game state layout for a player or adversary by their unique name """
         actor = self.getActorIfExists(name)
-        if name in self.players.keys():
-            allActors = list(map(lambda a: a.getCensoredActor(), self.allActors))
-        else:
-            allActors = self.allActors
-        floorPlan = self.__copyCurrentFloorPlan()
-        return ActorGameState(actor, allActors, floorPlan,
-                self.keyLocation, self.exitLocation, self.keyCollected,
-                self.levelOver, self.gameOver, self.gameWon, self.ruleChecker,
-                self.currentLevel, self.totalLevels, self.messages)
+        with self.__timer('actorGameState', actor.__class__.__name__):
+            if name in self.players.keys():
+                allActors = list(map(lambda a: a.getCensoredActor(), self.allActors))
+            else:
+                allActors = self.allActors
+            floorPlan = self.__copyCurrentFloorPlan()
+            return ActorGameState(actor, allActors, floorPlan,
+                    self.keyLocation, self.exitLocation, self.keyCollected,
+                    self.levelOver, self.gameOver, self.gameWon, self.ruleChecker,
+                    self.currentLevel, self.totalLevels, self.messages)
 
 
     def getObserverGameState(self) -> GameState:
@@ -143,37 +166,157 @@ class LevelManager:
         return '\n'.join(map(rowToString, self.produceTileLayout()))
 
 
-    def run(self, currentLevel: int = -1, totalLevels: int = -1, stats: dict = dict()):
-        """ runs the overall game loop """
+    def run(self, currentLevel: int = -1, totalLevels: int = -1, stats: dict = dict(),
+            replayLog = None, metrics: MetricsRegistry = None):
+        """ runs the overall game loop, if a ReplayLog is given every move is
+        recorded to it and if a MetricsRegistry is given the time spent in each
+        phase of a turn is recorded to it, the level is only checked for being
+        over after a move that exits or expels """
         self.stats = stats
-        currentActorNum = 0
+        self.metrics = metrics
         self.updateLevelStart(currentLevel, totalLevels)
+        if replayLog is not None:
+            replayLog.logLevelStart(self)
+        if self.simultaneousTurns:
+            self.__runSimultaneousTurns(replayLog)
+        else:
+            self.__runTurns(replayLog)
+        self.updateLevelOver()
+        if replayLog is not None:
+            replayLog.logLevelEnd(self)
+
+
+    def __runTurns(self, replayLog):
+        """ runs one turn at a time in the order of the turn scheduler """
+        self.turnScheduler.reset(self.allActors)
         while 1:
-            currentActor = self.allActors[currentActorNum]
-            if not currentActor.expelled and not currentActor.exited:
+            currentActor = self.turnScheduler.nextActor()
+            if currentActor is None:
+                break
+            with self.__timer('turn', currentActor.__class__.__name__):
                 # keep requesting moves from the actor until a valid one is made
                 currentActorGs = self.getActorGameState(currentActor.name)
                 self.messages = list()
                 moveResult = MoveResult.Invalid
                 while not moveResult:
                     try:
-                        move = currentActor.requestMove(currentActorGs)
+                        move = self.__requestMove(currentActor, currentActorGs)
                         moveResult = self.moveActor(currentActor.name, move)
+                        if replayLog is not None:
+                            replayLog.logMove(self, currentActor.name, move, moveResult)
                         currentActor.updateMoveResult(moveResult)
                     except SnarlDisconnectError:
-                        currentActor.expelled = True
-                        currentActor.disconnected = True
-                        self.messages = ['{0} {1} disconnected'.format(
-                            currentActor.__class__.__name__, currentActor.name)]
-                        break
-                if self.ruleChecker.isLevelOver(list(self.players.values())):
+                        moveResult = self.__disconnectActor(currentActor, replayLog)
+                    self.__countMoveResult(moveResult)
+                if moveResult in LevelManager.LevelChangingResults and \
+                        self.ruleChecker.isLevelOver(list(self.players.values())):
                     break
                 # update the game state of all current actors after every move
                 self.updateObservers()
                 self.updatePlayers()
-            # update current Actor
-            currentActorNum = (currentActorNum + 1) % len(self.allActors)
-        self.updateLevelOver()
+
+
+    def __runSimultaneousTurns(self, replayLog):
+        """ runs rounds of simultaneous turns, the move requests of a round are
+        made concurrently so a round costs one round trip rather than one per
+        actor, an actor still deciding on an earlier round's move when its
+        deadline passed is not asked again until that answer arrives (which is
+        then dropped) so it never has two requests outstanding, not even in
+        the next level, the level waits for those answers before it ends """
+        pending = dict()
+        # a worker per actor, so no request is ever queued behind another
+        executor = ThreadPoolExecutor(max_workers = max(1, len(self.allActors)))
+        try:
+            while 1:
+                actors = [ a for a in self.allActors if not a.expelled and not a.exited ]
+                with self.__timer('round'):
+                    levelOver = len(actors) == 0 or self.__runSimultaneousRound(
+                            actors, executor, pending, replayLog)
+                if levelOver:
+                    break
+                # update the game state of all current actors after every round
+                self.updateObservers()
+                self.updatePlayers()
+            # a late request is still reading the actor's connection, the next
+            # level's request must not read it too (or take this late answer)
+            with self.__timer('drainRequests'):
+                wait(list(pending.values()))
+        finally:
+            executor.shutdown(wait = False)
+
+
+    def __runSimultaneousRound(self, actors: list, executor: ThreadPoolExecutor,
+            pending: dict, replayLog) -> bool:
+        """ requests a move from every actor at once and resolves the moves
+        made within the deadline in actor order, each checked by the rule
+        checker against the board left by the moves before it, an invalid or
+        late move leaves the actor in place, returns if the level is over """
+        self.messages = list()
+        requests = dict()
+        for actor in actors:
+            if actor.name not in pending:
+                requests[actor.name] = executor.submit(self.__requestMove, actor,
+                        self.getActorGameState(actor.name))
+        # waiting on the earlier requests too keeps a round with only late
+        # actors from spinning
+        wait(list(requests.values()) + list(pending.values()), timeout = self.moveDeadline)
+        for actor in actors:
+            future = requests.get(actor.name, pending.get(actor.name, None))
+            if not future.done():
+                pending[actor.name] = future
+                continue
+            pending.pop(actor.name, None)
+            # a stale answer to an earlier round, or an actor expelled earlier
+            # in this round, does not move
+            if actor.name not in requests or actor.expelled or actor.exited:
+                continue
+            try:
+                move = future.result()
+                moveResult = self.moveActor(actor.name, move)
+                if replayLog is not None:
+                    replayLog.logMove(self, actor.name, move, moveResult)
+                actor.updateMoveResult(moveResult)
+            except SnarlDisconnectError:
+                moveResult = self.__disconnectActor(actor, replayLog)
+            self.__countMoveResult(moveResult)
+            if moveResult in LevelManager.LevelChangingResults and \
+                    self.ruleChecker.isLevelOver(list(self.players.values())):
+                # the answers of the actors after this one are dropped, those
+                # still to come are waited for as the level ends
+                pending.update({ name: request for name, request in requests.items()
+                        if not request.done() })
+                return True
+        return False
+
+
+    def __requestMove(self, actor: Actor, gameState: ActorGameState) -> Point:
+        """ requests the actor's move, timed by actor and controller type """
+        with self.__timer('requestMove', '{0}/{1}'.format(actor.__class__.__name__,
+                actor.controller.__class__.__name__)):
+            return actor.requestMove(gameState)
+
+
+    def __countMoveResult(self, moveResult: MoveResult):
+        """ counts the move result in the metrics, if any """
+        if self.metrics is not None:
+            self.metrics.count('moveResult', moveResult.name)
+
+
+    def __timer(self, name: str, label: str = None):
+        """ returns a context recording the time spent in it to the metrics, or
+        one doing nothing if there are none """
+        return nullcontext() if self.metrics is None else self.metrics.timer(name, label)
+
+
+    def __disconnectActor(self, actor: Actor, replayLog) -> MoveResult:
+        """ expels the disconnected actor, returns the eject move result """
+        actor.expelled = True
+        actor.disconnected = True
+        self.messages.append('{0} {1} disconnected'.format(
+                actor.__class__.__name__, actor.name))
+        if replayLog is not None:
+            replayLog.logDisconnect(self, actor.name)
+        return MoveResult.Eject
 
 
     def updateLevelStart(self, currentLevel: int, totalLevels: int):
@@ -188,16 +331,31 @@ class LevelManager:
     def updatePlayers(self):
         """ update the game state of all current players after every move """
         # update all players every turn
-        for player in [p for p in self.players.values() if not p.disconnected]:
-            player.updateGameState(self.getActorGameState(player.name))
+        with self.__timer('updatePlayers'):
+            for player in [p for p in self.players.values() if not p.disconnected]:
+                player.updateGameState(self.getActorGameState(player.name))
+        self.__flushActors()
+
+
+    def __flushActors(self):
+        """ delivers the updates each actor's controller held back this turn
+        (the move result along with the new game state), an actor whose
+        connection broke is expelled the next time it is asked to move """
+        with self.__timer('flushActors'):
+            for actor in [a for a in self.allActors if not a.disconnected]:
+                try:
+                    actor.flush()
+                except SnarlDisconnectError:
+                    actor.disconnected = True
 
 
     def updateObservers(self):
         """ update the game state of all observers """
         gs = None
-        for observerName in self.observers:
-            self.observers[observerName].updateGameState(
-                    self.getObserverGameState() if gs is None else gs)
+        with self.__timer('updateObservers'):
+            for observerName in self.observers:
+                self.observers[observerName].updateGameState(
+                        self.getObserverGameState() if gs is None else gs)
 
 
     def updateLevelOver(self):
@@ -218,7 +376,13 @@ class LevelManager:
     def moveActor(self, name: str, destination: Point) -> MoveResult:
         """ moves the specified actor and applies an interaction result  """
         actor = self.getActorIfExists(name)
-        floorPlan = self.getActorGameState(name).floorPlan
+        with self.__timer('moveActor', actor.__class__.__name__):
+            return self.__moveActor(actor, destination)
+
+
+    def __moveActor(self, actor: Actor, destination: Point) -> MoveResult:
+        """ validates the move with the rule checker and applies it """
+        floorPlan = self.getActorGameState(actor.name).floorPlan
         if not self.ruleChecker.isMoveValid(actor, destination, floorPlan):
             return MoveResult.Invalid
         prevLocation = actor.location
@@ -237,7 +401,7 @@ class LevelManager:
         elif isinstance(actor, Player) and self.keyCollected and destination == self.exitLocation:
             return self.__enterExit(actor)
         elif isinstance(actor, Ghost) and tileOrActor == Tile.WALL:
-            self.__teleportGhost(actor, floorPlan)
+            self.__teleportGhost(actor)
         self.messages.append(f'{actor.__class__.__name__} {actor.name} moved')
         return MoveResult.OK
 
@@ -293,10 +457,38 @@ class LevelManager:
         self.stats[name] = playerStats
 
 
-    def __teleportGhost(self, ghost: Ghost, floorPlan: FloorPlan):
-        """ teleports the ghost to a random empty tile """
-        emptyTiles = floorPlan.getTraversablePointsInLayout([Tile.EMPTY])
-        ghost.move(emptyTiles[randint(0, len(emptyTiles) - 1)])
+    def __teleportGhost(self, ghost: Ghost):
+        """ teleports the ghost to a random empty tile that is not covered by
+        an actor, the key or the exit """
+        self.__updateCoveredPoints()
+        if len(self.emptyPoints) > 0:
+            ghost.move(self.emptyPoints.choose())
+
+
+    def __createEmptyPointSampler(self) -> TileSampler:
+        """ returns a sampler of the empty tiles of the floor plan without the
+        exit, which is never empty """
+        if isinstance(self.floorPlan, Level):
+            emptyPoints = TileSampler(self.floorPlan.getPointsOfTile(Tile.EMPTY))
+        else:
+            emptyPoints = TileSampler(self.floorPlan.getTraversablePointsInLayout([Tile.EMPTY]))
+        emptyPoints.remove(self.exitLocation)
+        return emptyPoints
+
+
+    def __updateCoveredPoints(self):
+        """ brings the empty point sampler in step with the actors (and the key
+        until it is collected), only the points covered now or at the last
+        update are touched so this does not depend on the size of the level """
+        covered = { actor.location for actor in self.allActors if actor.location is not None
+                and not actor.expelled and not actor.exited and not actor.disconnected }
+        if not self.keyCollected:
+            covered.add(self.keyLocation)
+        for point in self.__coveredPoints - covered:
+            self.emptyPoints.add(point)
+        newlyCovered = { point for point in covered - self.__coveredPoints
+                if self.emptyPoints.remove(point) }
+        self.__coveredPoints = (self.__coveredPoints & covered) | newlyCovered
 
 
     def __resetActor(self, actor: Actor):
@@ -13,11 +13,10 @@ from levelManager import LevelManager
 from hallway import Hallway
 from interactable import Interactable
 from level import Level
-from tile import Tile
 from point import Point
-from random import randint
 from room import Room
 from ruleChecker import RuleChecker
+from turnScheduler import TurnScheduler
 from observer import Observer
 
 
@@ -156,6 +155,23 @@ class LevelManagerBuilder:
         return self
 
 
+    def setTurnScheduler(self, turnScheduler: TurnScheduler):
+        """ sets the turn scheduler for the game """
+        self.__ensureType(turnScheduler, TurnScheduler, 'Turn scheduler')
+        self.turnScheduler = turnScheduler
+        return self
+
+
+    def setSimultaneousTurns(self, simultaneousTurns: bool, moveDeadline: float = None):
+        """ sets if every actor moves at once each round and the seconds a
+        move may take before the actor is left in place (None waits forever) """
+        self.__ensureType(simultaneousTurns, bool, 'Simultaneous turns')
+        self.__ensureType(moveDeadline, (int, float), 'Move deadline')
+        self.simultaneousTurns = simultaneousTurns
+        self.moveDeadline = moveDeadline
+        return self
+
+
     def setRandomStartingPoints(self, randomStartingPoints: bool):
         """ sets if random starting points will be used """
         self.__ensureType(randomStartingPoints, bool, 'Random starting points')
@@ -163,29 +179,40 @@ class LevelManagerBuilder:
         return self
 
 
-    def build(self):
-        """ builds the game from the set components """
+    def prepare(self):
+        """ creates the level and chooses the starting points, this does not
+        touch the registered actors so it may run on another thread while they
+        play a previous level, build calls it if it has not been called """
+        if self.prepared:
+            return self
         if self.level is None:
             self.level = Level(self.rooms, self.hallways)
         # append default starting points in case not enough were given
         invalidPoints = [self.keyLocation, self.exitLocation]
         if self.randomStartingPoints:
-            rooms = self.level.rooms
             self.__setRandomStartingPoints(self.playerStartingPoints,
-                    invalidPoints, rooms, len(self.players))
+                    invalidPoints, len(self.players))
             self.__setRandomStartingPoints(self.adversaryStartingPoints,
-                    invalidPoints, rooms, len(self.adversaries))
+                    invalidPoints, len(self.adversaries))
 
         else:
             defPlayerPoints, defAdversaryPoints = self.level.getPlayerAndAdversaryStartingPoints(
                     invalidPoints)
             self.playerStartingPoints += defPlayerPoints
             self.adversaryStartingPoints += defAdversaryPoints
+        self.prepared = True
+        return self
+
+
+    def build(self):
+        """ builds the game from the set components """
+        self.prepare()
         gm = LevelManager(self.level, self.players, self.adversaries,
                 self.__distinct(self.playerStartingPoints),
                 self.__distinct(self.adversaryStartingPoints),
                 self.keyLocation, self.exitLocation, self.keyCollected,
-                self.ruleChecker, self.observers)
+                self.ruleChecker, self.observers, turnScheduler = self.turnScheduler,
+                simultaneousTurns = self.simultaneousTurns, moveDeadline = self.moveDeadline)
         self.__clearLocals()
         return gm
 
@@ -205,24 +232,39 @@ class LevelManagerBuilder:
         self.exitLocation = None
         self.keyCollected = False
         self.ruleChecker = None
+        self.turnScheduler = None
+        self.simultaneousTurns = False
+        self.moveDeadline = None
         self.playerIds = set()
         self.names = set()
+        self.prepared = False
 
 
     def __setRandomStartingPoints(self, outputList: list, invalidPoints: list,
-            rooms: list, count: int):
-        """ adds random points in rooms to the output list count times """
+            count: int):
+        """ adds random points in rooms to the output list count times, they
+        are chosen from the level's sampler of room start points with the
+        invalid points taken out, which are put back in the reverse order
+        after, so this does not depend on the size of the level """
         outputList.clear()
-        emptyPoints = list()
-        for room in rooms:
-            emptyPoints += room.getTraversablePointsInLayout([Tile.EMPTY])
-        for _ in range(count):
-            while 1:
-                p = emptyPoints.pop(randint(0, len(emptyPoints) - 1))
-                if p not in invalidPoints:
-                    break
-            invalidPoints.append(p)
-            outputList.append(p)
+        startPoints = self.level.roomStartPointSampler
+        removed = list()
+        def take(point: Point):
+            index = startPoints.indexOf(point)
+            if index is not None:
+                startPoints.remove(point)
+                removed.append((point, index))
+        try:
+            for p in invalidPoints:
+                take(p)
+            for _ in range(count):
+                p = startPoints.choose()
+                take(p)
+                invalidPoints.append(p)
+                outputList.append(p)
+        finally:
+            for point, index in reversed(removed):
+                startPoints.insert(point, index)
 
 
     def __distinct(self, l: list):
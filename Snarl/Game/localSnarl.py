@@ -0,0 +1,252 @@
+#
+# localSnarl.py
+# authors: Michael Curley & Drake Moore
+#
+
+from argparse import ArgumentParser, ArgumentTypeError, Namespace
+from autoPlayerController import AutoPlayerController
+from consoleController import ConsoleController
+from controller import Controller, LocalGhostController, LocalZombieController, SingleLocalObserverController
+from gameManager import GameManager
+from levelCache import LevelCache
+from levelFactory import LevelFactory
+from levelManagerBuilder import LevelManagerBuilder
+from levelManager import LevelManager
+from metrics import MetricsRegistry
+from profiler import GameProfiler, describeLevel
+from replayLog import ReplayLog
+from snarlParser import SnarlParser
+from uuid import uuid1
+
+
+def main():
+    args = parseArguments()
+    levels = loadLevels(args)
+    levelBuilders = registerLevels(levels)
+    validateUserInput(args, levelBuilders)
+    registerPlayers(levelBuilders, args)
+    registerAdversaries(levelBuilders)
+    if args.observe:
+        registerObservers(levelBuilders)
+    annotations = describeGame(levelBuilders)
+    levelFactories = createLevelFactories(levelBuilders, levels, annotations)
+    replayLog = None if args.replay is None else ReplayLog(args.replay, args.seed)
+    metrics = createMetrics(args)
+    try:
+        gameManager = GameManager(levelFactories, args.start,
+                replayLog = replayLog, seed = args.seed, prefetch = args.prefetch,
+                metrics = metrics)
+        runGame(gameManager, args, annotations)
+    finally:
+        if replayLog is not None:
+            replayLog.close()
+        dumpMetrics(metrics, args)
+
+
+# ----- argument parsing -------------------------------------------------------
+
+def parseArguments() -> Namespace:
+    """ returns a Namespace containing the command line arguments, additional
+    verification is required for arguments that interact with each other """
+    ap = ArgumentParser(description = 'play a local game of snarl')
+    ap.add_argument('--levels', metavar = 'FILENAME', type = str, default = 'snarl.levels',
+            help = 'where FILENAME is the name of a file containing JSON level specifications')
+    ap.add_argument('--prefetch', action = 'store_true',
+            help = 'build the next level in the background while the current one is played')
+    ap.add_argument('--cache', metavar = 'DIR', type = str, default = None,
+            help = 'where DIR is a directory to cache the compiled levels in, speeding up later starts')
+    ap.add_argument('--players', metavar = 'N', type = playersType, default = 1,
+            help = 'where {0} <= N <= {1} is the number of players'.format(
+                LevelManager.MinPlayers, LevelManager.MaxPlayers))
+    ap.add_argument('--start', metavar = 'N', type = startType, default = 1,
+            help = 'where N is the level to start from')
+    ap.add_argument('--observe', action = 'store_true',
+            help = ('by default only the players\' view will be presented, if ' +
+                'this option is given, an observer view (the full level) will be ' +
+                'presented in addition to the player view, this implies --players 1'))
+    ap.add_argument('--auto', action = 'store_true',
+            help = 'the players are played automatically (named auto1, auto2, ...) rather than from the console')
+    ap.add_argument('--seed', metavar = 'N', type = int, default = None,
+            help = 'where N is the seed for the random number generator')
+    ap.add_argument('--replay', metavar = 'FILE', type = str, default = None,
+            help = 'where FILE is the name of a file to record a replay log to')
+    ap.add_argument('--metrics', metavar = 'FILE', type = str, default = None,
+            help = 'where FILE is the name of a file to write per turn timing metrics to at game end')
+    ap.add_argument('--metrics-port', metavar = 'NUM', type = int, default = None,
+            help = 'where NUM is a local port serving the timing metrics as json while the game runs')
+    ap.add_argument('--profile', metavar = 'PREFIX', type = str, default = None,
+            help = 'where PREFIX is the start of the name of the profile and report files written for the game')
+    ap.add_argument('--profile-mode', choices = list(GameProfiler.Modes), default = 'cprofile',
+            help = 'trace every call with cProfile or sample the stack on an interval')
+    return ap.parse_args()
+
+def playersType(n):
+    """ represents a type for players, ensures the number is valid """
+    n = int(n)
+    low = LevelManager.MinPlayers
+    high = LevelManager.MaxPlayers
+    if n < low or n > high:
+        raise ArgumentTypeError('player count must be between {0} and {1}'.format(
+            low, high))
+    return n
+
+def startType(n):
+    """ represents a type for start level, ensures the number is valid """
+    n = int(n)
+    if n < 1:
+        raise ArgumentTypeError('a game cannot start before level 1')
+    return n
+
+def loadLevels(args: Namespace) -> list:
+    """ returns a function per level of the levels file returning its
+    (level, keyLocation, exitLocation), only the json is read up front so a
+    level is parsed when its function is called, unless the levels come from
+    the level cache which holds them ready """
+    if args.cache is not None:
+        return [ lambda level = level: level
+                for level in LevelCache(args.cache).getLevels(args.levels, parseLevels) ]
+    with open(args.levels, 'r') as f:
+        return [ lambda jsonLevel = jsonLevel: createLevel(jsonLevel)
+                for jsonLevel in SnarlParser().readJsonLevels(f) ]
+
+def parseLevels(fileName: str) -> list:
+    """ parses the input file for a list of json levels and returns a list of
+    (level, keyLocation, exitLocation) """
+    with open(fileName, 'r') as f:
+        return [ (level, keyLocation, exitLocation)
+                for keyLocation, exitLocation, level in SnarlParser().readLevels(f) ]
+
+def createLevel(jsonLevel: dict) -> tuple:
+    """ parses the json level and returns its (level, keyLocation, exitLocation) """
+    keyLocation, exitLocation, level = SnarlParser().createLevel(jsonLevel)
+    return level, keyLocation, exitLocation
+
+
+# ----- input data validation --------------------------------------------------
+
+def validateUserInput(args: Namespace, levelBuilders: list):
+    """ validates the user input based on their relation to each other """
+    if args.start > len(levelBuilders):
+        raise ValueError('a game cannot start on a level that does not exist')
+    if args.observe and args.players > 1:
+        raise ValueError('an observed game can only have 1 player')
+
+
+# ----- game init --------------------------------------------------------------
+
+def describeGame(builders: list) -> dict:
+    """ returns the profile annotations of the game, every level's size and
+    actor counts, each level's description is filled in as it is created so
+    a level that is never played is left empty """
+    return { 'levels': [ dict() for _ in builders ] }
+
+def runGame(gameManager: GameManager, args: Namespace, annotations: dict):
+    """ runs the game, under the profiler if one was asked for """
+    if args.profile is None:
+        gameManager.run()
+    else:
+        GameProfiler(args.profile, args.profile_mode).annotate(annotations
+            ).run(gameManager.run)
+
+def createMetrics(args: Namespace) -> MetricsRegistry:
+    """ returns a metrics registry if metrics were asked for (served on the
+    local port if one is given), otherwise None """
+    if args.metrics is None and args.metrics_port is None:
+        return None
+    metrics = MetricsRegistry()
+    if args.metrics_port is not None:
+        metrics.serve('127.0.0.1', args.metrics_port)
+    return metrics
+
+def dumpMetrics(metrics: MetricsRegistry, args: Namespace):
+    """ writes the metrics to the metrics file, if one is given """
+    if metrics is not None and args.metrics is not None:
+        metrics.dump(args.metrics)
+
+def registerLevels(levels: list) -> list:
+    """ returns a new builder for each level, its level is added just before
+    it is played """
+    return [ LevelManagerBuilder() for _ in levels ]
+
+def registerPlayers(levelBuilders: list, args: Namespace):
+    """ registers local players with the builders, automated players are
+    named for their number """
+    bldr = LevelManagerBuilder()
+    for i in range(1, args.players + 1):
+        if args.auto:
+            name = 'auto{0}'.format(i)
+            bldr.registerPlayer(str(i), name, controller = AutoPlayerController(name))
+            continue
+        while 1:
+            name = input('player {0} enter a name: '.format(i))
+            try:
+                bldr.registerPlayer(str(i), name, controller = ConsoleController())
+                break
+            except ValueError as e:
+                print(e)
+    if not args.auto:
+        print()
+    for levelBuilder in levelBuilders:
+        levelBuilder.players = bldr.players
+
+def registerAdversaries(builders: list):
+    """ registers local adversaries with the builders """
+    level = 1
+    for builder in builders:
+        for _ in range(int((float(level) / 2.0) + 1.0)):
+            registerAdversary(builder, 'zombie', LocalZombieController())
+        for _ in range(int((float(level) - 1.0) / 2.0)):
+            registerAdversary(builder, 'ghost', LocalGhostController())
+        level += 1
+
+def registerAdversary(builder: LevelManagerBuilder, advType: str, controller: Controller):
+    """ registers an adversary with the builder """
+    while 1:
+        try:
+            # only a duplicate name should throw  exception
+            # the probability of a duplicat uuid is extremely low, however it is
+            # placed in this loop to be safe
+            builder.registerAdversary(advType, str(uuid1()), controller = controller)
+            return
+        except:
+            continue
+
+
+def registerObservers(builders: list):
+    """ registers an observer with each builder """
+    for builder in builders:
+        builder.registerObserver('mainObserver', SingleLocalObserverController())
+
+def createLevelFactories(builders: list, levels: list, annotations: dict) -> list:
+    """ hands each builder and its level over to a factory that builds it
+    just before the level is played, the lists are emptied so a finished
+    level can be released """
+    factories = [ LevelFactory(lambda b = b, l = l, d = d: buildLevel(b, l, d))
+            for b, l, d in zip(builders, levels, annotations['levels']) ]
+    builders.clear()
+    levels.clear()
+    return factories
+
+def buildLevel(builder: LevelManagerBuilder, createLevel, description: dict) -> LevelManagerBuilder:
+    """ creates the builder's level, describes it for the profile annotations
+    and returns the builder with the level and random starting points """
+    level, keyLocation, exitLocation = createLevel()
+    description.update(describeLevel(level, len(builder.players), len(builder.adversaries)))
+    return builder.addLevelComponent(level
+        ).setKeyLocation(keyLocation
+        ).setExitLocation(exitLocation
+        ).setRandomStartingPoints(True)
+
+
+# ----- main entry -------------------------------------------------------------
+
+if __name__ == '__main__':
+    main()
+
+
+# ----- end of file ------------------------------------------------------------
+
+
+
+
+
@@ -0,0 +1,144 @@
+#
+# metrics.py
+# authors: Michael Curley & Drake Moore
+#
+
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dump, dumps
+from threading import Lock, Thread
+from time import perf_counter
+
+
+class Histogram:
+    """ represents the distribution of recorded durations (in seconds), the
+    count, total, min and max are kept exactly and each duration is counted in
+    the first bucket whose upper bound it does not exceed """
+
+    # bucket upper bounds in seconds, from 10 microseconds up to 10 seconds,
+    # anything slower is counted in the last (unbounded) bucket
+    Bounds = [0.00001, 0.0001, 0.001, 0.01, 0.1, 1.0, 10.0]
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.buckets = [0] * (len(Histogram.Bounds) + 1)
+
+
+    def record(self, seconds: float):
+        """ adds the duration to the distribution """
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+        index = 0
+        while index < len(Histogram.Bounds) and seconds > Histogram.Bounds[index]:
+            index += 1
+        self.buckets[index] += 1
+
+
+    def toJson(self) -> dict:
+        """ returns the json form of the histogram, bucket keys are the upper
+        bound in seconds ('inf' for the last) """
+        bounds = [ str(bound) for bound in Histogram.Bounds ] + ['inf']
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count > 0 else None,
+            'min': self.min,
+            'max': self.max,
+            'buckets': dict(zip(bounds, self.buckets))
+        }
+
+
+
+class MetricsRegistry:
+    """ represents named timings and counts recorded while a game runs, every
+    metric may be split by a label (such as the actor or controller type), the
+    registry is shared by the level managers and server controllers it is
+    given to and is safe to record into from their threads """
+
+    def __init__(self):
+        self.histograms = dict()
+        self.counters = dict()
+        self.__lock = Lock()
+
+
+    def record(self, name: str, seconds: float, label: str = None):
+        """ records a duration in seconds to the named histogram """
+        with self.__lock:
+            histogram = self.histograms.setdefault(name, dict()).get(label, None)
+            if histogram is None:
+                histogram = Histogram()
+                self.histograms[name][label] = histogram
+            histogram.record(seconds)
+
+
+    def count(self, name: str, label: str = None, amount: int = 1):
+        """ adds the amount to the named counter """
+        with self.__lock:
+            counter = self.counters.setdefault(name, dict())
+            counter[label] = counter.get(label, 0) + amount
+
+
+    @contextmanager
+    def timer(self, name: str, label: str = None):
+        """ records the time spent in the with block to the named histogram,
+        the time is recorded even if the block raises """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, perf_counter() - start, label)
+
+
+    def toJson(self) -> dict:
+        """ returns the json form of every metric, an unlabelled metric is
+        keyed by 'all' """
+        with self.__lock:
+            return {
+                'timings': { name: { self.__labelKey(label): histogram.toJson()
+                        for label, histogram in labels.items() }
+                    for name, labels in self.histograms.items() },
+                'counts': { name: { self.__labelKey(label): count
+                        for label, count in labels.items() }
+                    for name, labels in self.counters.items() }
+            }
+
+
+    def dump(self, fileName: str):
+        """ writes the json form of every metric to the file """
+        with open(fileName, 'w') as f:
+            dump(self.toJson(), f, indent = 2)
+
+
+    def serve(self, address: str, port: int) -> ThreadingHTTPServer:
+        """ starts a local http endpoint on a daemon thread answering every GET
+        with the current metrics as json, returns the server so it can be shut
+        down """
+        registry = self
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = dumps(registry.toJson()).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+        server = ThreadingHTTPServer((address, port), MetricsHandler)
+        Thread(target = server.serve_forever, daemon = True).start()
+        return server
+
+
+    def __labelKey(self, label: str) -> str:
+        """ returns the json key of a label """
+        return 'all' if label is None else label
+
+
+
+# ----- end of file ------------------------------------------------------------
@@ -0,0 +1,234 @@
+#
+# pathfinder.py
+# authors: Michael Curley & Drake Moore
+#
+
+from heapq import heappop, heappush
+from level import Level
+from levelGraph import LevelGraph
+from point import Point
+from tile import Tile
+
+
+class HierarchicalPathfinder:
+    """ represents a hierarchical (HPA*) pathfinder over the rooms and hallways
+    of a level, the abstract graph has a node for every door and an edge
+    between every pair of doors of the same room or hallway, paths are found by
+    an A* search over the doors and then refined inside each room or hallway,
+    only the level's tiles are considered (actors, the key and exit are not) """
+
+    # the tiles walked on by players and zombies
+    DefaultTraversableTiles = [Tile.EMPTY, Tile.HALLWAY, Tile.DOOR]
+
+    # the order neighbors are walked in, up, down, left then right
+    NeighborDeltas = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+
+    def __init__(self, level: Level, traversableTiles: list = None):
+        """ initializes the pathfinder on the level, the distance tables from
+        each door through its rooms and hallways (and the abstract edges built
+        from them) are computed on first use and kept for the life of the
+        pathfinder so they carry across turns """
+        self.level = level
+        self.graph = level.graph
+        self.traversableTiles = set(HierarchicalPathfinder.DefaultTraversableTiles
+                if traversableTiles is None else traversableTiles)
+        self.__doorsByComponent = self.__createDoorsByComponent()
+        self.__componentsByDoor = dict()
+        for index, doors in enumerate(self.__doorsByComponent):
+            for door in doors:
+                self.__componentsByDoor.setdefault(door, list()).append(index)
+        self.__distances = dict()
+        self.__doorEdges = dict()
+
+
+    def findPath(self, start: Point, goal: Point) -> list:
+        """ returns the shortest list of points walked from the start (not
+        included) to the goal (included), or None if there is no path """
+        start = (start.X, start.Y)
+        goal = (goal.X, goal.Y)
+        if start == goal:
+            return list()
+        startIndex = self.__getComponentIndex(start)
+        goalIndex = self.__getComponentIndex(goal)
+        if startIndex == LevelGraph.NoComponent or goalIndex == LevelGraph.NoComponent:
+            return None
+        path = None
+        if startIndex == goalIndex:
+            path = self.__searchComponent(startIndex, start, goal)
+        abstractPath = self.__searchDoors(start, startIndex, goal, goalIndex,
+                LevelGraph.Unreachable if path is None else len(path))
+        if abstractPath is not None:
+            path = abstractPath
+        return None if path is None else [ Point(x, y) for x, y in path ]
+
+
+    def __searchDoors(self, start: tuple, startIndex: int, goal: tuple,
+            goalIndex: int, bound: int) -> list:
+        """ returns the path found by A* over the doors if it is shorter than
+        the bound (unless the bound is Unreachable), otherwise None """
+        goalX, goalY = goal
+        def heuristic(node: tuple) -> int:
+            return abs(node[0] - goalX) + abs(node[1] - goalY)
+        costs = { start: 0 }
+        parents = dict()
+        frontier = [(heuristic(start), 0, start)]
+        while frontier:
+            _, cost, node = heappop(frontier)
+            if node == goal:
+                return self.__refinePath(start, goal, parents)
+            if cost > costs[node]:
+                continue
+            for neighbor, edgeCost, componentIndex in self.__getEdges(node,
+                    startIndex, goal, goalIndex):
+                nextCost = cost + edgeCost
+                if bound != LevelGraph.Unreachable and nextCost >= bound:
+                    continue
+                if nextCost < costs.get(neighbor, nextCost + 1):
+                    costs[neighbor] = nextCost
+                    parents[neighbor] = (node, componentIndex)
+                    heappush(frontier, (nextCost + heuristic(neighbor), nextCost, neighbor))
+        return None
+
+
+    def __getEdges(self, node: tuple, startIndex: int, goal: tuple, goalIndex: int):
+        """ yields (neighbor, cost, component index) of each abstract edge from
+        the node, a start that is not a door is connected to the doors of its
+        room or hallway and so is a goal that is not a door """
+        if node not in self.__componentsByDoor:
+            yield from self.__createDoorEdges(node, [startIndex])
+            return
+        edges = self.__doorEdges.get(node, None)
+        if edges is None:
+            edges = self.__createDoorEdges(node, self.__componentsByDoor[node])
+            self.__doorEdges[node] = edges
+        yield from edges
+        if goalIndex in self.__componentsByDoor[node] and goal not in self.__componentsByDoor:
+            cost = self.__getDistances(goalIndex, node).get(goal, None)
+            if cost is not None:
+                yield goal, cost, goalIndex
+
+
+    def __createDoorEdges(self, node: tuple, componentIndices: list) -> list:
+        """ returns the (door, cost, component index) of every door reachable
+        from the node through the rooms and hallways """
+        edges = list()
+        for componentIndex in componentIndices:
+            for door in self.__doorsByComponent[componentIndex]:
+                if door != node:
+                    cost = self.__getDistances(componentIndex, door).get(node, None)
+                    if cost is not None:
+                        edges.append((door, cost, componentIndex))
+        return edges
+
+
+    def __refinePath(self, start: tuple, goal: tuple, parents: dict) -> list:
+        """ returns the tile path of the abstract path found, each abstract edge
+        ends at a door (or the goal) so it is walked down that door's distance
+        table (or the previous door's table backwards) """
+        segments = list()
+        node = goal
+        while node != start:
+            previous, componentIndex = parents[node]
+            if node in self.__componentsByDoor:
+                segment = self.__descend(self.__getDistances(componentIndex, node), previous)
+            else:
+                segment = self.__descend(self.__getDistances(componentIndex, previous), node)
+                segment = segment[-2::-1] + [node]
+            segments.append(segment)
+            node = previous
+        return [ point for segment in reversed(segments) for point in segment ]
+
+
+    def __descend(self, distances: dict, point: tuple) -> list:
+        """ returns the points walked from the point (not included) down the
+        distance table to its source (included) """
+        path = list()
+        distance = distances[point]
+        x, y = point
+        while distance != 0:
+            distance -= 1
+            for deltaX, deltaY in HierarchicalPathfinder.NeighborDeltas:
+                if distances.get((x + deltaX, y + deltaY), None) == distance:
+                    x += deltaX
+                    y += deltaY
+                    break
+            path.append((x, y))
+        return path
+
+
+    def __searchComponent(self, componentIndex: int, start: tuple, goal: tuple) -> list:
+        """ returns the shortest path from the start to the goal staying in the
+        room or hallway, or None if there is none """
+        distances = self.__createDistances(componentIndex, goal, start)
+        if start not in distances:
+            return None
+        return self.__descend(distances, start)
+
+
+    def __getDistances(self, componentIndex: int, door: tuple) -> dict:
+        """ returns the walking distance from the door to every point of the
+        room or hallway reachable from it, computed once """
+        key = (componentIndex, door)
+        distances = self.__distances.get(key, None)
+        if distances is None:
+            distances = self.__createDistances(componentIndex, door)
+            self.__distances[key] = distances
+        return distances
+
+
+    def __createDistances(self, componentIndex: int, source: tuple,
+            stop: tuple = None) -> dict:
+        """ returns the walking distance from the source to the points of the
+        room or hallway by breadth first search, stopping early once the stop
+        point is reached """
+        doors = self.__doorsByComponent[componentIndex]
+        distances = { source: 0 }
+        frontier = [source]
+        while frontier and stop not in distances:
+            nextFrontier = list()
+            for x, y in frontier:
+                distance = distances[(x, y)] + 1
+                for deltaX, deltaY in HierarchicalPathfinder.NeighborDeltas:
+                    neighbor = (x + deltaX, y + deltaY)
+                    if neighbor not in distances and self.__isWalkable(neighbor,
+                            componentIndex, doors):
+                        distances[neighbor] = distance
+                        nextFrontier.append(neighbor)
+            frontier = nextFrontier
+        return distances
+
+
+    def __isWalkable(self, point: tuple, componentIndex: int, doors: list) -> bool:
+        """ returns if the point is a traversable tile of the room or hallway,
+        the doors at either end of a hallway are part of it """
+        x, y = point
+        if self.graph.getComponentIndexAt(x, y) != componentIndex and point not in doors:
+            return False
+        row = y - self.level.upperLeftPosition.Y
+        column = x - self.level.upperLeftPosition.X
+        return self.level.layout[row][column] in self.traversableTiles
+
+
+    def __getComponentIndex(self, point: tuple) -> int:
+        """ returns the component index of the point if it is traversable """
+        componentIndex = self.graph.getComponentIndexAt(*point)
+        if componentIndex == LevelGraph.NoComponent or not self.__isWalkable(point,
+                componentIndex, self.__doorsByComponent[componentIndex]):
+            return LevelGraph.NoComponent
+        return componentIndex
+
+
+    def __createDoorsByComponent(self) -> list:
+        """ returns the absolute door coordinates of each room and hallway """
+        doors = list()
+        for room in self.graph.rooms:
+            doors.append([ (room.upperLeftPosition.X + door.X, room.upperLeftPosition.Y + door.Y)
+                    for door in room.relativeDoorLocations ])
+        for hallway in self.graph.hallways:
+            doors.append([ (hallway.entryDoorLocation.X, hallway.entryDoorLocation.Y),
+                    (hallway.exitDoorLocation.X, hallway.exitDoorLocation.Y) ])
+        return doors
+
+
+
+# ----- end of file ------------------------------------------------------------
@@ -0,0 +1,164 @@
+#
+# profiler.py
+# authors: Michael Curley & Drake Moore
+#
+
+from cProfile import Profile
+from json import dump
+from level import Level
+from pstats import Stats
+from sys import _current_frames
+from threading import Event, Thread, get_ident
+from time import perf_counter
+
+
+class GameProfiler:
+    """ represents a profiler run around a whole game, either cProfile (every
+    call is traced, written as a pstats file) or a sampling profiler (the
+    stack of the calling thread is sampled on an interval, written as
+    collapsed stacks for flame graphs, with far less overhead), either way a
+    json report of the hottest functions is written next to it along with the
+    given annotations (such as the level sizes and actor counts) so reports
+    from different releases can be compared """
+
+    # the profiling modes and the file extension each writes its output to
+    Modes = { 'cprofile': '.pstats', 'sample': '.collapsed' }
+
+    # the default seconds between samples and number of hot functions reported
+    DefaultInterval = 0.001
+    DefaultTop = 25
+
+    def __init__(self, prefix: str, mode: str = 'cprofile',
+            interval: float = DefaultInterval, top: int = DefaultTop):
+        """ the output is written to the prefix followed by the mode's
+        extension and the report to the prefix followed by .json """
+        if mode not in GameProfiler.Modes:
+            raise ValueError('A profiler mode must be one of: {0}.'.format(
+                ', '.join(GameProfiler.Modes)))
+        if not isinstance(interval, (int, float)) or interval <= 0:
+            raise ValueError('A profiler sampling interval must be a positive number of seconds.')
+        self.prefix = prefix
+        self.mode = mode
+        self.interval = interval
+        self.top = top
+        self.annotations = dict()
+
+
+    def annotate(self, annotations: dict):
+        """ adds the annotations to the report """
+        self.annotations.update(annotations)
+        return self
+
+
+    def run(self, function):
+        """ calls the function under the profiler, writes the output and the
+        report and returns the function's result """
+        start = perf_counter()
+        if self.mode == 'cprofile':
+            result, hotFunctions = self.__runTraced(function)
+        else:
+            result, hotFunctions = self.__runSampled(function)
+        self.__writeReport(perf_counter() - start, hotFunctions)
+        return result
+
+
+    def __runTraced(self, function) -> (any, list):
+        """ calls the function under cProfile, returns its result and the
+        functions with the most time spent in them """
+        profile = Profile()
+        try:
+            result = profile.runcall(function)
+        finally:
+            profile.dump_stats(self.prefix + GameProfiler.Modes[self.mode])
+        stats = Stats(profile).stats
+        hottest = sorted(stats.items(), key = lambda item: item[1][2], reverse = True)
+        return result, [ {
+            'function': self.__functionName(filename, line, name),
+            'calls': calls,
+            'seconds': totalTime,
+            'cumulativeSeconds': cumulativeTime
+        } for (filename, line, name), (_, calls, totalTime, cumulativeTime, _)
+            in hottest[:self.top] ]
+
+
+    def __runSampled(self, function) -> (any, list):
+        """ calls the function while a thread samples the calling thread's
+        stack, returns its result and the functions most often on top of the
+        stack, only the calling thread is sampled """
+        stacks = dict()
+        stopped = Event()
+        threadId = get_ident()
+        def sample():
+            while not stopped.wait(self.interval):
+                frame = _current_frames().get(threadId, None)
+                stack = list()
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(self.__functionName(code.co_filename,
+                            code.co_firstlineno, code.co_name))
+                    frame = frame.f_back
+                if len(stack) > 0:
+                    key = tuple(reversed(stack))
+                    stacks[key] = stacks.get(key, 0) + 1
+        sampler = Thread(target = sample, daemon = True)
+        sampler.start()
+        try:
+            result = function()
+        finally:
+            stopped.set()
+            sampler.join()
+            self.__writeCollapsed(stacks)
+        return result, self.__hottestSampled(stacks)
+
+
+    def __writeCollapsed(self, stacks: dict):
+        """ writes the sampled stacks one per line, root first and separated by
+        semicolons, followed by the number of samples """
+        with open(self.prefix + GameProfiler.Modes[self.mode], 'w') as f:
+            for stack, count in sorted(stacks.items()):
+                f.write('{0} {1}\n'.format(';'.join(stack), count))
+
+
+    def __hottestSampled(self, stacks: dict) -> list:
+        """ returns the functions with the most samples on top of the stack """
+        total = sum(stacks.values())
+        counts = dict()
+        for stack, count in stacks.items():
+            counts[stack[-1]] = counts.get(stack[-1], 0) + count
+        hottest = sorted(counts.items(), key = lambda item: item[1], reverse = True)
+        return [ { 'function': name, 'samples': count, 'share': count / total }
+                for name, count in hottest[:self.top] ]
+
+
+    def __writeReport(self, seconds: float, hotFunctions: list):
+        """ writes the json report of the run """
+        with open(self.prefix + '.json', 'w') as f:
+            dump({
+                'mode': self.mode,
+                'output': self.prefix + GameProfiler.Modes[self.mode],
+                'seconds': seconds,
+                'annotations': self.annotations,
+                'hottest': hotFunctions
+            }, f, indent = 2)
+
+
+    def __functionName(self, filename: str, line: int, name: str) -> str:
+        """ returns the pstats style name of a function """
+        return '{0}:{1}({2})'.format(filename, line, name)
+
+
+
+def describeLevel(level: Level, players: int, adversaries: int) -> dict:
+    """ returns the annotations of a level, its size and actor counts """
+    return {
+        'width': level.width,
+        'height': level.height,
+        'rooms': len(level.rooms),
+        'hallways': len(level.hallways),
+        'players': players,
+        'adversaries': adversaries
+    }
+
+
+
+# ----- end of file ------------------------------------------------------------
@@ -0,0 +1,311 @@
+#
+# replayLog.py
+# authors: Michael Curley & Drake Moore
+#
+
+from bisect import bisect_right
+from controller import NoMoveController
+from gameState import GameState
+from json import dumps, loads
+from levelManager import LevelManager
+from levelManagerBuilder import LevelManagerBuilder
+from moveResult import MoveResult
+from snarlParser import SnarlParser
+
+
+# ----- record types -----------------------------------------------------------
+
+GAME_RECORD = 'game'
+LEVEL_RECORD = 'level'
+KEYFRAME_RECORD = 'keyframe'
+MOVE_RECORD = 'move'
+DISCONNECT_RECORD = 'disconnect'
+LEVEL_END_RECORD = 'level-end'
+
+
+class ReplayLog:
+    """ represents an append-only json-lines log of a game, each line is one
+    record: the game header (seed), the start of every level (layout, key,
+    exit and actors), each actor's move with its MoveResult and periodic
+    keyframes holding every actor's full state so a Replayer can seek """
+
+    # the log format version, bumped whenever a record changes shape
+    Version = 1
+
+    # the default number of moves between keyframes
+    KeyframeInterval = 50
+
+    def __init__(self, fileName: str, seed: int = None,
+            keyframeInterval: int = KeyframeInterval):
+        """ opens the log file for writing, the seed is only recorded, it is up
+        to the caller to seed the random module with it """
+        if not isinstance(keyframeInterval, int) or keyframeInterval <= 0:
+            raise ValueError('A ReplayLog keyframe interval must be a positive integer.')
+        self.keyframeInterval = keyframeInterval
+        self.parser = SnarlParser()
+        self.turn = 0
+        self.file = open(fileName, 'w')
+        self.__write({ 'type': GAME_RECORD, 'version': self.Version, 'seed': seed })
+
+
+    def close(self):
+        """ flushes and closes the underlying file """
+        if not self.file.closed:
+            self.file.close()
+
+
+    def logLevelStart(self, levelManager: LevelManager):
+        """ records the level layout and the initial state of every actor """
+        self.turn = 0
+        self.__write({
+            'type': LEVEL_RECORD,
+            'level': levelManager.currentLevel,
+            'total': levelManager.totalLevels,
+            'layout': self.parser.levelToJson(levelManager.rooms,
+                levelManager.hallways, levelManager.keyLocation,
+                levelManager.exitLocation, False),
+            'key-collected': levelManager.keyCollected,
+            'actors': [ self.__actorToJson(actor) for actor in levelManager.allActors ]
+        })
+        self.__writeKeyframe(levelManager)
+
+
+    def logMove(self, levelManager: LevelManager, actorName: str,
+            destination, moveResult: MoveResult):
+        """ records a requested move, the resulting location is recorded too
+        since a ghost teleport is random """
+        actor = levelManager.getActorIfExists(actorName)
+        self.turn += 1
+        self.__write({
+            'type': MOVE_RECORD,
+            'turn': self.turn,
+            'actor': actorName,
+            'to': self.parser.pointToJson(destination),
+            'result': moveResult.name,
+            'position': self.parser.pointToJson(actor.location)
+        })
+        self.__writeKeyframeIfDue(levelManager)
+
+
+    def logDisconnect(self, levelManager: LevelManager, actorName: str):
+        """ records an actor disconnecting from the game """
+        self.turn += 1
+        self.__write({ 'type': DISCONNECT_RECORD, 'turn': self.turn, 'actor': actorName })
+        self.__writeKeyframeIfDue(levelManager)
+
+
+    def logLevelEnd(self, levelManager: LevelManager):
+        """ records the end of the level and flushes the log """
+        self.__write({
+            'type': LEVEL_END_RECORD,
+            'turn': self.turn,
+            'game-over': levelManager.gameOver,
+            'game-won': levelManager.gameWon
+        })
+        self.file.flush()
+
+
+    def __writeKeyframeIfDue(self, levelManager: LevelManager):
+        """ writes a keyframe every keyframeInterval turns """
+        if self.turn % self.keyframeInterval == 0:
+            self.__writeKeyframe(levelManager)
+
+
+    def __writeKeyframe(self, levelManager: LevelManager):
+        """ writes the full state of the level, flushing so that at most one
+        keyframe interval is lost if the process dies """
+        self.__write({
+            'type': KEYFRAME_RECORD,
+            'turn': self.turn,
+            'key-collected': levelManager.keyCollected,
+            'actors': [ {
+                'name': actor.name,
+                'position': self.parser.pointToJson(actor.location),
+                'expelled': actor.expelled,
+                'exited': actor.exited,
+                'disconnected': actor.disconnected,
+                'collected-key': actor.collectedKey,
+                'lifepoints': actor.lifepoints
+            } for actor in levelManager.allActors ]
+        })
+        self.file.flush()
+
+
+    def __actorToJson(self, actor) -> dict:
+        """ returns the static information needed to recreate an actor """
+        return {
+            'type': actor.__class__.__name__.lower(),
+            'id': actor.identifier,
+            'name': actor.name,
+            'position': self.parser.pointToJson(actor.location),
+            'hitpoints': actor.hitpoints,
+            'lifepoints': actor.originalLifepoints
+        }
+
+
+    def __write(self, record: dict):
+        """ appends a single record as one line """
+        self.file.write(dumps(record, separators = (',', ':')) + '\n')
+
+
+
+class Replayer:
+    """ represents a reader for a ReplayLog that can reconstruct the GameState
+    after any turn of any recorded level, the file is indexed once so a lookup
+    seeks to the closest keyframe and only applies the moves after it """
+
+    def __init__(self, fileName: str):
+        self.fileName = fileName
+        self.parser = SnarlParser()
+        self.seed = None
+        self.levels = list()
+        self.__levelCache = dict()
+        self.__indexLog()
+
+
+    def levelCount(self) -> int:
+        """ returns the number of levels recorded in the log """
+        return len(self.levels)
+
+
+    def turnCount(self, levelNumber: int) -> int:
+        """ returns the number of turns recorded for the level """
+        return self.__getLevelEntry(levelNumber)['turns']
+
+
+    def moves(self, levelNumber: int):
+        """ yields every move and disconnect record of the level in order """
+        entry = self.__getLevelEntry(levelNumber)
+        with open(self.fileName, 'rb') as f:
+            f.seek(entry['offset'])
+            f.readline() # the level record itself
+            for line in iter(f.readline, b''):
+                record = loads(line)
+                if record['type'] in [MOVE_RECORD, DISCONNECT_RECORD]:
+                    yield record
+                elif record['type'] in [LEVEL_END_RECORD, LEVEL_RECORD]:
+                    break
+
+
+    def gameStateAt(self, levelNumber: int, turn: int) -> GameState:
+        """ returns the observer GameState of the level after the given number
+        of turns, where turn 0 is the start of the level """
+        entry = self.__getLevelEntry(levelNumber)
+        if not isinstance(turn, int) or turn < 0 or turn > entry['turns']:
+            raise ValueError('Level {0} has no turn {1}.'.format(levelNumber, turn))
+        levelManager = self.__createLevelManager(levelNumber, entry)
+        keyframeTurns = [ t for t, _ in entry['keyframes'] ]
+        keyframeTurn, offset = entry['keyframes'][bisect_right(keyframeTurns, turn) - 1]
+        with open(self.fileName, 'rb') as f:
+            f.seek(offset)
+            self.__applyKeyframe(levelManager, loads(f.readline()))
+            currentTurn = keyframeTurn
+            while currentTurn < turn:
+                record = loads(f.readline())
+                if record['type'] == MOVE_RECORD:
+                    self.__applyMove(levelManager, record)
+                elif record['type'] == DISCONNECT_RECORD:
+                    self.__applyDisconnect(levelManager, record)
+                else:
+                    continue
+                currentTurn = record['turn']
+        return levelManager.getObserverGameState()
+
+
+    def __indexLog(self):
+        """ reads the log once, recording the byte offsets of each level and
+        its keyframes """
+        with open(self.fileName, 'rb') as f:
+            offset = f.tell()
+            for line in iter(f.readline, b''):
+                record = loads(line)
+                t = record['type']
+                if t == GAME_RECORD:
+                    if record.get('version', None) != ReplayLog.Version:
+                        raise ValueError('Replay log version {0} is not supported.'.format(
+                            record.get('version', None)))
+                    self.seed = record['seed']
+                elif t == LEVEL_RECORD:
+                    self.levels.append({ 'offset': offset, 'keyframes': list(), 'turns': 0 })
+                elif t == KEYFRAME_RECORD:
+                    self.levels[-1]['keyframes'].append((record['turn'], offset))
+                elif t in [MOVE_RECORD, DISCONNECT_RECORD]:
+                    self.levels[-1]['turns'] = record['turn']
+                offset = f.tell()
+
+
+    def __getLevelEntry(self, levelNumber: int) -> dict:
+        """ returns the index entry of a level, levels are numbered from 1 in
+        the order they were played """
+        if not isinstance(levelNumber, int) or levelNumber < 1 or levelNumber > len(self.levels):
+            raise ValueError('The replay log has no level {0}.'.format(levelNumber))
+        return self.levels[levelNumber - 1]
+
+
+    def __createLevelManager(self, levelNumber: int, entry: dict) -> LevelManager:
+        """ creates a level manager in the initial state of the level, the
+        parsed level is cached since it is never mutated, it is validated like
+        any other level since the replay file may have been edited """
+        with open(self.fileName, 'rb') as f:
+            f.seek(entry['offset'])
+            record = loads(f.readline())
+        if levelNumber not in self.__levelCache:
+            self.__levelCache[levelNumber] = SnarlParser().createLevel(record['layout'])
+        keyLocation, exitLocation, level = self.__levelCache[levelNumber]
+        builder = LevelManagerBuilder(
+            ).addLevelComponent(level
+            ).setKeyLocation(keyLocation
+            ).setExitLocation(exitLocation
+            ).setKeyCollected(record['key-collected'])
+        for actor in record['actors']:
+            location = self.parser.createPoint(actor['position'])
+            if actor['type'] == 'player':
+                builder.registerPlayer(actor['id'], actor['name'], location,
+                        NoMoveController(), actor['hitpoints'], actor['lifepoints'])
+            else:
+                builder.registerAdversary(actor['type'], actor['name'], location,
+                        NoMoveController(), actor['hitpoints'], actor['lifepoints'])
+        levelManager = builder.build()
+        levelManager.currentLevel = record['level']
+        levelManager.totalLevels = record['total']
+        return levelManager
+
+
+    def __applyKeyframe(self, levelManager: LevelManager, record: dict):
+        """ overwrites the state of the level manager with the keyframe """
+        levelManager.keyCollected = record['key-collected']
+        for state in record['actors']:
+            actor = levelManager.getActorIfExists(state['name'])
+            actor.location = self.parser.createPoint(state['position'])
+            actor.expelled = state['expelled']
+            actor.exited = state['exited']
+            actor.disconnected = state['disconnected']
+            actor.collectedKey = state['collected-key']
+            actor.lifepoints = state['lifepoints']
+
+
+    def __applyMove(self, levelManager: LevelManager, record: dict):
+        """ applies a recorded move, raises value error if the engine no longer
+        produces the recorded result """
+        levelManager.messages = list()
+        moveResult = levelManager.moveActor(record['actor'],
+                self.parser.createPoint(record['to']))
+        if moveResult.name != record['result']:
+            raise ValueError('Replay diverged at turn {0}: {1} expected {2} but got {3}.'.format(
+                record['turn'], record['actor'], record['result'], moveResult.name))
+        # a ghost teleport is random, the recorded position is authoritative
+        actor = levelManager.getActorIfExists(record['actor'])
+        actor.location = self.parser.createPoint(record['position'])
+
+
+    def __applyDisconnect(self, levelManager: LevelManager, record: dict):
+        """ applies a recorded disconnect """
+        actor = levelManager.getActorIfExists(record['actor'])
+        actor.expelled = True
+        actor.disconnected = True
+        levelManager.messages = ['{0} {1} disconnected'.format(
+            actor.__class__.__name__, actor.name)]
+
+
+
+# ----- end of file ------------------------------------------------------------
@@ -21,14 +21,16 @@ class Room(FloorPlan):
     # the minimum number of doors in a room
     MinimumDoorCount = 1
 
-    def __init__(self, upperLeftPosition: Point, layout: list):
-        """ layout is of the same type as floor plan """
-        FloorPlan.__init__(self, upperLeftPosition, layout)
-        self.__validateLayoutIsLargeEnough()
-        self.__validateLayoutBoundariesAreWallsOrDoors()
-        relativeDoorLocations = self.__getRelativeDoorLocations()
-        self.__validateMinimumDoorsPresent(relativeDoorLocations)
-        self.__validateDoorsAreOnBoundaries(relativeDoorLocations)
+    def __init__(self, upperLeftPosition: Point, layout: list, trusted: bool = False):
+        """ layout is of the same type as floor plan, the layout is validated in
+        a single sweep unless trusted, which is only for layouts that were
+        already validated as a room (such as a recorded level) """
+        FloorPlan.__init__(self, upperLeftPosition, layout, trusted)
+        if trusted:
+            relativeDoorLocations = self.__getRelativeDoorLocations()
+        else:
+            self.__validateLayoutIsLargeEnough()
+            relativeDoorLocations = self.__validateLayoutAndGetDoorLocations()
         self.relativeDoorLocations = relativeDoorLocations
         self.connectedHallways = list()
 
@@ -50,83 +52,56 @@ class Room(FloorPlan):
                 Room.MinimumLayoutSize))
 
 
-    def __validateLayoutBoundariesAreWallsOrDoors(self):
-        """ raises an error if the boundaries of the room are not all walls """
-        def raiseErrorFor(side: str):
-            raise ValueError('Room given a layout with {0} side containing non wall or door.'.format(
-                side))
-        if not self.__layoutRowIsAllWallsOrDoors(0):
-            raiseErrorFor('top') 
-        if not self.__layoutRowIsAllWallsOrDoors(-1):
-            raiseErrorFor('bottom')
-        if not self.__layoutColumnIsAllWallsOrDoors(0):
-            raiseErrorFor('left')
-        if not self.__layoutColumnIsAllWallsOrDoors(-1):
-            raiseErrorFor('right')
-
-
-    def __layoutRowIsAllWallsOrDoors(self, index: int) -> bool:
-        """ returns if all tiles in the row of self.layout are walls """
-        return all(self.__tileIsWallOrDoor(tile) for tile in self.layout[index])
-
-
-    def __layoutColumnIsAllWallsOrDoors(self, index: int) -> bool:
-        """ returns if all tiles in the column of self.layout are walls """
-        return all(self.__tileIsWallOrDoor(tile) for tile in
-                map(lambda row: row[index], self.layout))
-
-
-    def __tileIsWallOrDoor(self, tile: any) -> bool:
-        """ returns if the tile is a wall or door """
-        return tile in [Tile.WALL, Tile.DOOR]
-
-
-    def __getRelativeDoorLocations(self) -> list:
-        """ returns a list of Point locations of the doors based on the
-        FloorPlan layout """
+    def __validateLayoutAndGetDoorLocations(self) -> list:
+        """ checks the boundaries are all walls or doors and finds the doors in
+        one pass over the layout, raises an error for the first invalid side
+        (top, bottom, left then right), too few doors or any doors not on the
+        boundaries or in corners, otherwise returns the door locations """
+        wallOrDoor = [Tile.WALL, Tile.DOOR]
+        lastRow = self.height - 1
+        lastColumn = self.width - 1
+        invalidSides = set()
         relativeDoorLocations = list()
-        for row in range(self.height):
-            for column in range(self.width):
-                if self.layout[row][column] == Tile.DOOR:
-                    relativeDoorLocations.append(Point(column, row))
-        return relativeDoorLocations
-
-
-    def __validateMinimumDoorsPresent(self, relativeDoorLocations: list):
-        """ raises an error if the minimum number of doors are not present """
+        invalidLocations = list()
+        for y, row in enumerate(self.layout):
+            if y == 0 or y == lastRow:
+                if not all(tile in wallOrDoor for tile in row):
+                    invalidSides.add('top' if y == 0 else 'bottom')
+            else:
+                if row[0] not in wallOrDoor:
+                    invalidSides.add('left')
+                if row[lastColumn] not in wallOrDoor:
+                    invalidSides.add('right')
+            if Tile.DOOR not in row:
+                continue
+            for x, tile in enumerate(row):
+                if tile != Tile.DOOR:
+                    continue
+                location = Point(x, y)
+                relativeDoorLocations.append(location)
+                onSide = x == 0 or x == lastColumn
+                onTopOrBottom = y == 0 or y == lastRow
+                # a door must be on exactly one side, both is a corner
+                if onSide == onTopOrBottom:
+                    invalidLocations.append(location)
+        for side in ['top', 'bottom', 'left', 'right']:
+            if side in invalidSides:
+                raise ValueError('Room given a layout with {0} side containing non wall or door.'.format(
+                    side))
         if len(relativeDoorLocations) < Room.MinimumDoorCount:
             raise ValueError('Room not given enough doors (< {0}).'.format(
                 Room.MinimumDoorCount))
-
-
-    def __validateDoorsAreOnBoundaries(self, relativeDoorLocations: list):
-        """ raises an error detailing which door locations are invalid if any
-        are not on the boundaries of the room or if any are in corners """
-        invalidLocations = list()
-        for relativeDoorLocation in relativeDoorLocations:
-            # door is in corner...
-            if (relativeDoorLocation == Point(0, 0) # top left
-                    or relativeDoorLocation == Point(0, self.height - 1) # bottom left
-                    or relativeDoorLocation == Point(self.width - 1, 0) # top right
-                    or relativeDoorLocation == Point(self.width - 1, self.height - 1)): # bottom right
-                invalidLocations.append(relativeDoorLocation)
-
-            # door is on left or right side
-            if relativeDoorLocation.X in [0, self.width - 1]:
-                # door does not fall in bounds of the wall
-                if relativeDoorLocation.Y < 0 or relativeDoorLocation.Y >= self.height:
-                    invalidLocations.append(relativeDoorLocation)
-            # door is on top or bottom
-            elif relativeDoorLocation.Y in [0, self.height - 1]:
-                if relativeDoorLocation.X < 0 or relativeDoorLocation.X >= self.width:
-                    invalidLocations.append(relativeDoorLocation)
-            # door is not (on top or botton) and is not (on left or right)
-            else:
-                invalidLocations.append(relativeDoorLocation)
-        # raise the error if any doors are invalid
         if len(invalidLocations) != 0:
             raise ValueError('Room given doors not on boundaries or in corners: {0}.'.format(
                 ', '.join(map(str, invalidLocations))))
+        return relativeDoorLocations
+
+
+    def __getRelativeDoorLocations(self) -> list:
+        """ returns a list of Point locations of the doors based on the
+        FloorPlan layout """
+        return [ Point(x, y) for y, row in enumerate(self.layout) if Tile.DOOR in row
+                for x, tile in enumerate(row) if tile == Tile.DOOR ]
 
 
 # ----- end of file ------------------------------------------------------------
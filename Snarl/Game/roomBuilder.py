@@ -50,17 +50,31 @@ class RoomBuilder:
         return self
 
 
+    def addWallRectangle(self, upperLeft: Point, width: int, height: int):
+        """ adds a rectangle of walls to the room with its upper left corner at
+        the relative Point location """
+        self.wallRectangles.append(self.__createRectangle(upperLeft, width, height))
+        return self
+
+
+    def addDoorRectangle(self, upperLeft: Point, width: int, height: int):
+        """ adds a rectangle of doors to the room with its upper left corner at
+        the relative Point location, a run of doors along one side is a
+        rectangle with a width or height of 1 """
+        self.doorRectangles.append(self.__createRectangle(upperLeft, width, height))
+        return self
+
+
     def build(self) -> Room:
-        """ builds the room object """
-        layout = Tile.EMPTY.generateLayoutOfSize(self.width, self.height)
-        # set boundaries to all walls
-        for row in range(self.height):
-            if row == 0 or row == self.height - 1:
-                layout[row] = list(map(lambda t: Tile.WALL, layout[row]))
-            else:
-                layout[row][0] = Tile.WALL
-                layout[row][-1] = Tile.WALL
+        """ builds the room object, each row is created whole with walls on
+        the boundaries and rectangles are written a row slice at a time """
+        wallRow = [Tile.WALL] * self.width
+        innerRow = [Tile.WALL] + [Tile.EMPTY] * (self.width - 2) + [Tile.WALL]
+        layout = [ list(wallRow if row == 0 or row == self.height - 1 else innerRow)
+                for row in range(self.height) ]
+        self.__setRectanglesToTile(layout, self.wallRectangles, Tile.WALL, 'wall')
         self.__setLocationsToType(layout, self.walls, lambda: Tile.WALL, 'wall')
+        self.__setRectanglesToTile(layout, self.doorRectangles, Tile.DOOR, 'door')
         self.__setLocationsToType(layout, self.doors, lambda: Tile.DOOR, 'door')
         room = Room(self.upperLeftPosition, layout)
         self.__clearLocals()
@@ -77,6 +91,30 @@ class RoomBuilder:
             layout[loc.Y][loc.X] = tileProducer()
 
 
+    def __setRectanglesToTile(self, layout: list, rectangles: list, tile: Tile,
+            tileType: str):
+        """ sets every location of the rectangles in the layout to the tile """
+        for upperLeft, width, height in rectangles:
+            if (upperLeft.X < 0 or upperLeft.Y < 0 or upperLeft.X + width > self.width
+                    or upperLeft.Y + height > self.height):
+                raise ValueError('A {0} rectangle of size {1}x{2} was placed outside the room at: {3}'.format(
+                    tileType, width, height, str(upperLeft)))
+            tiles = [tile] * width
+            for row in range(upperLeft.Y, upperLeft.Y + height):
+                layout[row][upperLeft.X:upperLeft.X + width] = tiles
+
+
+    def __createRectangle(self, upperLeft: Point, width: int, height: int) -> tuple:
+        """ returns the rectangle (upperLeft, width, height), raises a value
+        error if it is invalid """
+        self.__ensureType(upperLeft, Point, 'Upper left location')
+        self.__ensureType(width, int, 'Width')
+        self.__ensureType(height, int, 'Height')
+        if width < 1 or height < 1:
+            raise ValueError('A rectangle must be at least of size 1x1')
+        return upperLeft, width, height
+
+
     def __clearLocals(self):
         """ clears the local fields to their default values """
         self.upperLeftPosition = Point(0, 0)
@@ -84,6 +122,8 @@ class RoomBuilder:
         self.height = Room.MinimumLayoutSize
         self.walls = list()
         self.doors = list()
+        self.wallRectangles = list()
+        self.doorRectangles = list()
 
 
     def __ensureLocationList(self, locations: list):
@@ -4,15 +4,8 @@
 #
 
 from actor import Actor, Player, Adversary
-from copy import deepcopy
 from floorPlan import FloorPlan
-from gameState import GameState
-from hallway import Hallway
-from interactable import Interactable
-from level import Level
-from tile import Tile
 from point import Point
-from room import Room
 
 
 class RuleChecker:
@@ -4,24 +4,49 @@
 #
 
 from actor import Actor, Adversary
+from codec import ID_TILE_MAP, JsonCodec, JsonFragment, jsonToPoint, pointToJson
 from controller import Controller
 from gameState import ActorGameState, GameState
 from interactable import Interactable
-from json import dumps, loads
+from jsonStream import JsonStreamReader
+from metrics import MetricsRegistry
 from moveResult import MoveResult
 from point import Point
 from snarlDisconnectError import SnarlDisconnectError
-from snarlParser import SnarlParser, ID_TILE_MAP
+from socket import IPPROTO_TCP, TCP_NODELAY
+from threading import Lock
 from tile import Tile
-from time import sleep
+from time import perf_counter, sleep
 
 
 class ServerController(Controller):
     """ represents a controller that manages a tcp connection to a ClientController """
 
-    def __init__(self, connection, useLayoutAnchor: bool = False):
+    def __init__(self, connection, useLayoutAnchor: bool = False,
+            metrics: MetricsRegistry = None, batchWrites: bool = False,
+            codec: JsonCodec = None):
+        """ if a MetricsRegistry is given the time spent encoding and sending
+        and receiving and decoding each message (not counting the sleep before
+        it) is recorded to it by message type, along with the bytes moved, with
+        batched writes messages are queued rather than sent one at a time after
+        a second's sleep and every queued message is sent in one write when the
+        queue is flushed (the client must read a stream of json messages), so
+        Nagle's algorithm is turned off as it would only delay the flush, the
+        codec defaults to the fastest installed json library, the queue and
+        the connection's writes are locked since a simultaneous turn may still
+        be waiting on this actor's late move while it is updated """
         self.connection = connection
         self.useAnchor = useLayoutAnchor
+        self.metrics = metrics
+        self.batchWrites = batchWrites
+        self.codec = JsonCodec() if codec is None else codec
+        self.queue = list()
+        self.writeLock = Lock()
+        self.reader = JsonStreamReader(self.__receive, codec = self.codec)
+        self.__bytesReceived = 0
+        self.__levelLayout = None
+        if batchWrites and connection is not None:
+            connection.setsockopt(IPPROTO_TCP, TCP_NODELAY, 1)
 
     def __copy__(self):
         return None
@@ -37,26 +62,76 @@ class ServerController(Controller):
             pass
 
     def sendMsg(self, msg: any):
-        """ sends any json object over the connection, rasies SnarlDisconnectError """
+        """ sends any json object over the connection (or queues it with batched
+        writes), rasies SnarlDisconnectError """
+        if self.batchWrites:
+            start = perf_counter()
+            data = self.codec.encode(msg)
+            with self.writeLock:
+                self.queue.append(data)
+            self.__record('send', start, msg, len(data))
+            return
         try:
             if self.connection is not None:
                 sleep(1)
-                self.connection.sendall(dumps(msg).encode())
+                start = perf_counter()
+                data = self.codec.encode(msg)
+                with self.writeLock:
+                    self.connection.sendall(data)
+                self.__record('send', start, msg, len(data))
         except Exception as e:
             self.connection = None
             raise SnarlDisconnectError(str(e))
 
+    def flush(self):
+        """ sends every queued message in one write, rasies SnarlDisconnectError """
+        with self.writeLock:
+            if len(self.queue) == 0:
+                return
+            data = b''.join(self.queue)
+            count = len(self.queue)
+            self.queue.clear()
+            try:
+                if self.connection is not None:
+                    start = perf_counter()
+                    self.connection.sendall(data)
+                    if self.metrics is not None:
+                        self.metrics.record('flush', perf_counter() - start)
+                        self.metrics.count('flushMessages', None, count)
+            except Exception as e:
+                self.connection = None
+                raise SnarlDisconnectError(str(e))
+
     def recvMsg(self) -> any:
         """ receives any json object over the connection, rasies SnarlDisconnectError """
         try:
             if self.connection is None:
                 raise RuntimeError('trying to receive data over a broken connection')
-            sleep(1)
-            return loads(self.connection.recv(1024).decode())
+            if not self.batchWrites:
+                sleep(1)
+            start = perf_counter()
+            self.__bytesReceived = 0
+            msg = self.reader.readMessage()
+            self.__record('recv', start, msg, self.__bytesReceived)
+            return msg
         except Exception as e:
             self.connection = None
             raise SnarlDisconnectError(str(e))
 
+    def __receive(self, size: int) -> bytes:
+        """ reads from the connection for the stream reader """
+        data = self.connection.recv(size)
+        self.__bytesReceived += len(data)
+        return data
+
+    def __record(self, name: str, start: float, msg: any, size: int):
+        """ records the time since the start and the size of the message to the
+        metrics, if any """
+        if self.metrics is not None:
+            label = msg.get('type', None) if isinstance(msg, dict) else str(msg)
+            self.metrics.record(name, perf_counter() - start, label)
+            self.metrics.count(name + 'Bytes', label, size)
+
     def updateGameState(self, gameState: ActorGameState):
         """ generates a player-update or an end level message"""
         if gameState.levelOver:
@@ -96,7 +171,8 @@ class ServerController(Controller):
         if isinstance(gameState.actor, Adversary):
             self.updateGameState(gameState)
         self.sendMsg('move')
-        return SnarlParser().createPoint(self.recvMsg()['to'])
+        self.flush()
+        return jsonToPoint(self.recvMsg()['to'])
 
     def updateMoveResult(self, moveResult: MoveResult):
         """ sends the move result to the player"""
@@ -108,20 +184,40 @@ class ServerController(Controller):
             stat['type'] = 'player-score'
         self.sendMsg({ 'type': 'end-game',
                        'scores': finalStats })
+        self.flush()
 
     def getAnchor(self, gameState) -> list:
         """ returns the json upper left position of the layout """
-        return SnarlParser().pointToJson(gameState.floorPlan.upperLeftPosition)
+        return pointToJson(gameState.floorPlan.upperLeftPosition)
 
-    def getLayout(self, gameState) -> list:
-        """ returns the layout replaced by tile id's """
+    def getLayout(self, gameState) -> any:
+        """ returns the layout replaced by tile id's, an actor that sees the
+        whole level (an adversary) is sent a layout encoded once per level """
         if self.useAnchor:
-            return [ [
-                ID_TILE_MAP[tile.replacedTile if isinstance(tile, Actor) else tile]
-                    for tile in row ]
-            for row in gameState.floorPlan.layout ]
+            if gameState.actor.viewRadius <= 0:
+                return self.__getLevelLayout(gameState)
+            return self.__getAnchoredLayout(gameState)
         return self.getNonAnchoredLayout(gameState)
 
+    def __getAnchoredLayout(self, gameState) -> list:
+        """ returns the floor plan's layout replaced by tile id's """
+        return [ [
+            ID_TILE_MAP[tile.replacedTile if isinstance(tile, Actor) else tile]
+                for tile in row ]
+        for row in gameState.floorPlan.layout ]
+
+    def __getLevelLayout(self, gameState) -> JsonFragment:
+        """ returns the encoded layout of the whole level, actors are sent as
+        the tile under them and the key and exit as floor so it only changes
+        with the level """
+        floorPlan = gameState.floorPlan
+        ul = floorPlan.upperLeftPosition
+        key = (gameState.currentLevel, ul.X, ul.Y, floorPlan.width, floorPlan.height)
+        if self.__levelLayout is None or self.__levelLayout[0] != key:
+            self.__levelLayout = (key,
+                    JsonFragment(self.codec.encode(self.__getAnchoredLayout(gameState))))
+        return self.__levelLayout[1]
+
     def getNonAnchoredLayout(self, gameState) -> list:
         """ returns a relative layout based on the actor's fov """
         layout = list()
@@ -171,7 +267,7 @@ class ServerController(Controller):
 
     def getPosition(self, gameState) -> list:
         """ returns the actor position in json form for the update message """
-        return SnarlParser().pointToJson(gameState.actor.location)
+        return pointToJson(gameState.actor.location)
 
     def getObjectsAndActors(self, gameState: ActorGameState) -> (list, list):
         """ returns a tuple of objects json list and actors json list for the update message """
@@ -182,7 +278,6 @@ class ServerController(Controller):
         for col in range(floorPlan.width):
             for row in range(gameState.floorPlan.height):
                 loc = anchor + Point(col, row)
-                pos = SnarlParser().pointToJson(loc)
                 tile = floorPlan.getTileInLayout(loc)
                 if isinstance(tile, Actor):
                     actor = tile
@@ -191,12 +286,12 @@ class ServerController(Controller):
                         actors.append({
                             'type': actor.__class__.__name__.lower(),
                             'name': actor.name,
-                            'position': pos
+                            'position': pointToJson(loc)
                         })
                 if isinstance(tile, Interactable):
                     objects.append({
                         'type': 'key' if tile == Interactable.KEY else 'exit',
-                        'position': pos
+                        'position': pointToJson(loc)
                     })
         return objects, actors
 
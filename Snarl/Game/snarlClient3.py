@@ -0,0 +1,60 @@
+#
+# snarlClient3.py
+# authors: Michael Curley & Drake Moore
+# notes:
+#   - this is a copy of the original snarlClient and may be used the exact same
+#     way, only difference being this client allows the user to register as an
+#     adversary and play via command line, however is no argument is specified
+#     the same behavior follows so we are using this as our updated client to
+#     not have as many duplicated files
+#
+
+from argparse import ArgumentParser, Namespace
+from autoPlayerController import AutoPlayerController
+from clientController import ClientController
+from consoleController import ConsoleController
+from controller import Controller, LocalGhostController, LocalZombieController
+
+
+def main():
+    args = parseArguments()
+    controller = ClientController(getController(args), args.address, args.port, args.type)
+    controller.run()
+
+def parseArguments() -> Namespace:
+    """ returns a Namespace containing the command line arguments, additional
+    verification is required for arguments that interact with each other """
+    ap = ArgumentParser(description = 'play a remote game of snarl over a network')
+    ap.add_argument('--address', metavar = 'IP', type = str, default = '127.0.0.1',
+            help = 'where IP is an IP address the client should connect to')
+    ap.add_argument('--port', metavar = 'NUM', type = int, default = 45678,
+            help = 'where NUM is the port number the client should connect to')
+    ap.add_argument('--type', metavar = 'TYPE', type = str, default = None,
+            help = 'the type of client you wish to be, either player, ghost or zombie')
+    ap.add_argument('--auto', action = 'store_true',
+            help = 'the client is played automatically rather than from the console')
+    ap.add_argument('--name', metavar = 'NAME', type = str, default = None,
+            help = 'where NAME is the name an automated player registers with, a unique one is made if none is given')
+    return ap.parse_args()
+
+def getController(args: Namespace) -> Controller:
+    """ returns the console controller, or the automated controller of the
+    client type if --auto is given """
+    if not args.auto:
+        return ConsoleController()
+    if args.type == 'ghost':
+        return LocalGhostController()
+    if args.type == 'zombie':
+        return LocalZombieController()
+    return AutoPlayerController(args.name)
+
+if __name__ == '__main__':
+    main()
+
+
+# ----- end of file ------------------------------------------------------------
+
+
+
+
+
@@ -4,12 +4,12 @@
 #
 
 from actor import Player, Zombie, Ghost
+from codec import ID_TILE_MAP, TILE_ID_MAP
 from levelManagerBuilder import LevelManagerBuilder
 from levelManager import LevelManager
 from gameState import GameState
 from hallway import Hallway
-from interactable import Interactable
-from json import dumps as jsonToStr, loads as strToJson
+from json import dumps as jsonToStr, loads as strToJson, JSONDecoder, JSONDecodeError
 from level import Level
 from point import Point
 from room import Room
@@ -49,21 +49,6 @@ COLUMNS_KEY = 'columns'
 FROM_KEY = 'from'
 TO_KEY = 'to'
 WAYPOINTS_KEY = 'waypoints'
-TILE_ID_MAP = {
-    0: Tile.WALL,
-    1: Tile.EMPTY,
-    2: Tile.DOOR
-}
-ID_TILE_MAP = {
-    Tile.WALL: 0,
-    Tile.NONE: 0,
-    Tile.UNKNOWN: 0,
-    Tile.HALLWAY: 1,
-    Tile.EMPTY: 1,
-    Interactable.KEY: 1,
-    Interactable.EXIT: 1,
-    Tile.DOOR: 2
-}
 
 
 # ----- main -------------------------------------------------------------------
@@ -145,15 +130,24 @@ class SnarlParser:
 
     def createRoom(self, jsonRoom: dict) -> Room:
         """ creates the custom implementation of Room from the json room """
-        global ORIGIN_KEY, LAYOUT_KEY, TILE_ID_MAP
+        global ORIGIN_KEY, LAYOUT_KEY
         jsonOrigin = jsonRoom[ORIGIN_KEY]
         upperLeftPosition = self.createPoint(jsonOrigin)
         jsonLayout = jsonRoom[LAYOUT_KEY]
-        layout = list(map(lambda row: list(map(TILE_ID_MAP.get, row)), jsonLayout))
+        layout = list(map(lambda row: list(map(self.createTile, row)), jsonLayout))
         self.rooms.append(Room(upperLeftPosition, layout))
         return self.rooms[-1]
 
 
+    def createTile(self, tileId: int) -> Tile:
+        """ creates the tile of the json tile id, raises value error if the id
+        is not a known tile """
+        global TILE_ID_MAP
+        if isinstance(tileId, bool) or not isinstance(tileId, int) or tileId not in TILE_ID_MAP:
+            raise ValueError('room layout given unknown tile id {0}'.format(tileId))
+        return TILE_ID_MAP[tileId]
+
+
     def createHallway(self, jsonHallway: dict) -> Hallway:
         """ creates the custom implementation of Hallway from the json hallway """
         global FROM_KEY, TO_KEY, WAYPOINTS_KEY
@@ -281,6 +275,88 @@ class SnarlParser:
             EXIT_LOCKED_KEY: not state.exitUnlocked
         }
 
+    # ----- streaming input ----------------------------------------------------
+
+    def readLevels(self, stream) -> iter:
+        """ lazily yields (keyLocation, exitLocation, level) for each level of a
+        levels stream (a count followed by json levels) """
+        for jsonLevel in self.readJsonLevels(stream):
+            yield SnarlParser().createLevel(jsonLevel)
+
+
+    def readJsonLevels(self, stream) -> iter:
+        """ lazily yields each json level of a levels stream, raises value
+        error if the leading count is missing or does not match the number of
+        levels """
+        global TYPE_KEY, LEVEL_KEY
+        values = self.readJsonValues(stream)
+        n = next(values, None)
+        if isinstance(n, bool) or not isinstance(n, int) or n < 0:
+            raise ValueError('input json file must start with a level count')
+        count = 0
+        for jsonLevel in values:
+            count += 1
+            if count > n or not isinstance(jsonLevel, dict) or \
+                    jsonLevel.get(TYPE_KEY, None) != LEVEL_KEY:
+                raise ValueError('input json file given invalid level count')
+            yield jsonLevel
+        if count != n:
+            raise ValueError('input json file given invalid level count')
+
+
+    def readJsonValues(self, stream, chunkSize: int = 1 << 16) -> iter:
+        """ lazily yields each whitespace separated json value of a text
+        stream, only the unread part of the stream and the value being decoded
+        are kept in memory and the read size grows with the buffer so a large
+        value is decoded in linear time, raises value error with the line and
+        column of invalid json """
+        decoder = JSONDecoder()
+        buffer = ''
+        position = 0
+        line = 1 # line and column of the position in the buffer
+        column = 1
+        eof = False
+        while 1:
+            start = position
+            while start < len(buffer) and buffer[start].isspace():
+                start += 1
+            if start < len(buffer):
+                try:
+                    value, end = decoder.raw_decode(buffer, start)
+                    # a number is only complete once whitespace follows it, the
+                    # rest of it may not have been read yet
+                    isNumber = isinstance(value, (int, float)) and not isinstance(value, bool)
+                    if eof or (end < len(buffer) and (not isNumber or buffer[end].isspace())):
+                        line, column = self.__advancePosition(buffer, position, end,
+                                line, column)
+                        position = end
+                        yield value
+                        continue
+                except JSONDecodeError as e:
+                    if eof:
+                        errorLine, errorColumn = self.__advancePosition(buffer,
+                                position, e.pos, line, column)
+                        raise ValueError('invalid json at line {0} column {1}: {2}'.format(
+                            errorLine, errorColumn, e.msg))
+            elif eof:
+                return
+            line, column = self.__advancePosition(buffer, position, start, line, column)
+            buffer = buffer[start:]
+            position = 0
+            chunk = stream.read(max(chunkSize, len(buffer)))
+            eof = len(chunk) == 0
+            buffer += chunk
+
+
+    def __advancePosition(self, text: str, start: int, end: int,
+            line: int, column: int) -> (int, int):
+        """ returns the line and column of text[end] given the line and column
+        of text[start] """
+        newlines = text.count('\n', start, end)
+        if newlines == 0:
+            return line, column + end - start
+        return line + newlines, end - text.rfind('\n', start, end)
+
     # add more stuff as needed
 
 
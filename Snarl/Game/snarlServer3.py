@@ -0,0 +1,337 @@
+#
+# snarlServer3.py
+# authors: Michael Curley & Drake Moore
+# notes:
+#   - this is just a copy of the original snarlServer, except now the
+#     registerPlayers function is more abstract and allows registering both
+#     players and adversaries
+#
+
+from actor import Zombie
+from argparse import ArgumentParser, ArgumentTypeError, Namespace
+from controller import Controller, LocalGhostController, LocalZombieController, SingleLocalObserverController
+from gameManager import GameManager
+from levelCache import LevelCache
+from levelFactory import LevelFactory
+from levelManagerBuilder import LevelManagerBuilder
+from levelManager import LevelManager
+from metrics import MetricsRegistry
+from profiler import GameProfiler, describeLevel
+from replayLog import ReplayLog
+from json import loads, dumps
+from serverController import ServerController
+from signal import alarm, signal, SIGALRM
+from snarlParser import SnarlParser
+from socket import socket, AF_INET, SOCK_STREAM, timeout as SocketTimeout
+from time import sleep
+
+
+def main():
+    # sig handler for linux processes, for our case only need the alarm handler
+    def timeoutError(signum, frame):
+        raise TimeoutError
+    signal(SIGALRM, timeoutError)
+    args = parseArguments()
+    levels = loadLevels(args)
+    levelBuilders = registerLevels(levels, args.simultaneous, args.move_deadline)
+    replayLog = None
+    metrics = createMetrics(args)
+    with createSocket(args.address, args.port, args.wait) as soc:
+        try:
+            adversaries = registerActors(levelBuilders, args.players, args.adversaries,
+                    soc, args.wait, metrics, args.batch_writes)
+            registerRemainingAdversaries(levelBuilders, adversaries)
+            if args.observe:
+                registerObservers(levelBuilders)
+            annotations = describeGame(levelBuilders)
+            levelFactories = createLevelFactories(levelBuilders, levels, annotations)
+            replayLog = None if args.replay is None else ReplayLog(args.replay, args.seed)
+            gameManager = GameManager(levelFactories, replayLog = replayLog,
+                    seed = args.seed, prefetch = args.prefetch, metrics = metrics)
+            runGame(gameManager, args, annotations)
+        except Exception as e:
+            print(f'Server {type(e)}: {e}')
+        finally:
+            if replayLog is not None:
+                replayLog.close()
+            dumpMetrics(metrics, args)
+
+
+# ----- argument parsing -------------------------------------------------------
+
+def parseArguments() -> Namespace:
+    """ returns a Namespace containing the command line arguments, additional
+    verification is required for arguments that interact with each other """
+    ap = ArgumentParser(description = 'start a snarl server')
+    ap.add_argument('--levels', metavar = 'FILE', type = str, default = 'snarl.levels',
+            help = 'where FILE is the name of a file containing JSON level specifications')
+    ap.add_argument('--prefetch', action = 'store_true',
+            help = 'build the next level in the background while the current one is played')
+    ap.add_argument('--cache', metavar = 'DIR', type = str, default = None,
+            help = 'where DIR is a directory to cache the compiled levels in, speeding up later starts')
+    ap.add_argument('--players', metavar = 'N', type = playersType, default = 4,
+            help = 'where {0} <= N <= {1} is the number of player clients'.format(
+                LevelManager.MinPlayers, LevelManager.MaxPlayers))
+    ap.add_argument('--adversaries', metavar = 'N', type = adversariesType, default = 0,
+            help = 'where N <= {0} is the number of adversary clients'.format(
+                LevelManager.MaxPlayers))
+    ap.add_argument('--wait', metavar = 'N', type = waitType, default = 60,
+            help = 'where N is the number of seconds to wait for the next client to connect (determines reg_timeout)')
+    ap.add_argument('--simultaneous', action = 'store_true',
+            help = 'every actor moves at once each round, resolved in turn order')
+    ap.add_argument('--move-deadline', metavar = 'SECONDS', type = deadlineType, default = None,
+            help = 'where SECONDS is how long a simultaneous move may take before the actor stays in place')
+    ap.add_argument('--observe', action = 'store_true',
+            help = 'will start a local observer to display the progress of the game')
+    ap.add_argument('--address', metavar = 'IP', type = str, default = '127.0.0.1',
+            help = 'where IP is an IP address on which the server should listen for connections')
+    ap.add_argument('--port', metavar = 'NUM', type = int, default = 45678,
+            help = 'where NUM is the port number the server will listen on')
+    ap.add_argument('--seed', metavar = 'N', type = int, default = None,
+            help = 'where N is the seed for the random number generator')
+    ap.add_argument('--replay', metavar = 'FILE', type = str, default = None,
+            help = 'where FILE is the name of a file to record a replay log to')
+    ap.add_argument('--metrics', metavar = 'FILE', type = str, default = None,
+            help = 'where FILE is the name of a file to write per turn timing metrics to at game end')
+    ap.add_argument('--metrics-port', metavar = 'NUM', type = int, default = None,
+            help = 'where NUM is a local port serving the timing metrics as json while the game runs')
+    ap.add_argument('--batch-writes', action = 'store_true',
+            help = 'queue the messages of each turn and send them to a client in one write, the client must read a stream of json messages')
+    ap.add_argument('--profile', metavar = 'PREFIX', type = str, default = None,
+            help = 'where PREFIX is the start of the name of the profile and report files written for the game')
+    ap.add_argument('--profile-mode', choices = list(GameProfiler.Modes), default = 'cprofile',
+            help = 'trace every call with cProfile or sample the stack on an interval')
+    args = ap.parse_args()
+    if args.move_deadline is not None and not args.batch_writes:
+        # without batched writes every message is sent after a second's sleep,
+        # so no move could be made within a deadline
+        ap.error('--move-deadline requires --batch-writes')
+    return args
+
+def playersType(n):
+    """ represents a type for player clients, ensures the number is valid """
+    n = int(n)
+    low = LevelManager.MinPlayers
+    high = LevelManager.MaxPlayers
+    if n < low or n > high:
+        raise ArgumentTypeError('player client count must be between {0} and {1}'.format(
+            low, high))
+    return n
+
+def adversariesType(n):
+    """ represents a type for adversary clients, ensures the number is valid """
+    n = int(n)
+    high = LevelManager.MaxPlayers
+    if n < 0 or n > high:
+        raise ArgumentTypeError('adversary client count must be between 0 and {0}'.format(
+            high))
+    return n
+
+def waitType(n):
+    """ represents a type for wait time, ensures the number is valid """
+    n = int(n)
+    if n < 1:
+        raise ArgumentTypeError('a game cannot wait 0 seconds for a client to join')
+    return n
+
+def deadlineType(n):
+    """ represents a type for the move deadline, ensures the number is valid """
+    n = float(n)
+    if n <= 0:
+        raise ArgumentTypeError('the move deadline must be a positive number of seconds')
+    return n
+
+def loadLevels(args: Namespace) -> list:
+    """ returns a function per level of the levels file returning its
+    (level, keyLocation, exitLocation), only the json is read up front so a
+    level is parsed when its function is called, unless the levels come from
+    the level cache which holds them ready """
+    if args.cache is not None:
+        return [ lambda level = level: level
+                for level in LevelCache(args.cache).getLevels(args.levels, parseLevels) ]
+    with open(args.levels, 'r') as f:
+        return [ lambda jsonLevel = jsonLevel: createLevel(jsonLevel)
+                for jsonLevel in SnarlParser().readJsonLevels(f) ]
+
+def parseLevels(fileName: str) -> list:
+    """ parses the input file for a list of json levels and returns a list of
+    (level, keyLocation, exitLocation) """
+    with open(fileName, 'r') as f:
+        return [ (level, keyLocation, exitLocation)
+                for keyLocation, exitLocation, level in SnarlParser().readLevels(f) ]
+
+def createLevel(jsonLevel: dict) -> tuple:
+    """ parses the json level and returns its (level, keyLocation, exitLocation) """
+    keyLocation, exitLocation, level = SnarlParser().createLevel(jsonLevel)
+    return level, keyLocation, exitLocation
+
+
+# ----- game init --------------------------------------------------------------
+
+def registerLevels(levels: list, simultaneous: bool, moveDeadline: float) -> list:
+    """ returns a new builder with the turn mode for each level, its level is
+    added just before it is played """
+    return [ LevelManagerBuilder().setSimultaneousTurns(simultaneous, moveDeadline)
+            for _ in levels ]
+
+def describeGame(builders: list) -> dict:
+    """ returns the profile annotations of the game, every level's size and
+    actor counts, each level's description is filled in as it is created so
+    a level that is never played is left empty """
+    return { 'levels': [ dict() for _ in builders ] }
+
+def runGame(gameManager: GameManager, args: Namespace, annotations: dict):
+    """ runs the game, under the profiler if one was asked for """
+    if args.profile is None:
+        gameManager.run()
+    else:
+        GameProfiler(args.profile, args.profile_mode).annotate(annotations
+            ).run(gameManager.run)
+
+def createMetrics(args: Namespace) -> MetricsRegistry:
+    """ returns a metrics registry if metrics were asked for (served on the
+    local port if one is given), otherwise None """
+    if args.metrics is None and args.metrics_port is None:
+        return None
+    metrics = MetricsRegistry()
+    if args.metrics_port is not None:
+        metrics.serve('127.0.0.1', args.metrics_port)
+    return metrics
+
+def dumpMetrics(metrics: MetricsRegistry, args: Namespace):
+    """ writes the metrics to the metrics file, if one is given """
+    if metrics is not None and args.metrics is not None:
+        metrics.dump(args.metrics)
+
+def createSocket(address: str, port: int, wait: int) -> socket:
+    """ creates a socket instance to return """
+    s = socket(AF_INET, SOCK_STREAM)
+    s.settimeout(wait)
+    s.bind((address, port))
+    return s
+
+def registerActors(levelBuilders: list, players: int, adversaries: int, soc: socket,
+        timeout: int, metrics: MetricsRegistry, batchWrites: bool) -> list:
+    """ registers local players/adversaries with the builders, returns (zombies, ghosts) """
+    bldr = LevelManagerBuilder()
+    playerId = 0
+    zombieId = 0
+    ghostId = 0
+    for i in range(players + adversaries):
+        try:
+            connection, t, controller = acceptClient(soc, timeout, metrics, batchWrites)
+            actorType = t.lower()
+            if actorType == 'player':
+                checkClientNumber(playerId, players, 'players')
+            else:
+                checkClientNumber(zombieId + ghostId, adversaries, 'adversaries')
+        except SocketTimeout:
+            print(f'Client {i} failed to connect in time.')
+            continue
+        while 1:
+            if not batchWrites:
+                sleep(1)
+            connection.sendall(dumps('name').encode())
+            name = loads(connection.recv(1024).decode())
+            try:
+                if actorType == 'player':
+                    bldr.registerPlayer(str(playerId), name, controller = controller)
+                    playerId += 1
+                elif actorType in ['zombie', 'ghost']:
+                    if actorType == 'zombie':
+                        advId = zombieId
+                        zombieId += 1
+                    else:
+                        advId = ghostId
+                        ghostId += 1
+                    bldr.registerAdversary(actorType, actorType + str(advId), controller = controller)
+                else:
+                    continue
+                break
+            except ValueError as e:
+                print(e)
+    for levelBuilder in levelBuilders:
+        levelBuilder.players = list(bldr.players)
+        levelBuilder.adversaries = list(bldr.adversaries)
+    return bldr.adversaries
+
+def acceptClient(soc: socket, timeout: int, metrics: MetricsRegistry,
+        batchWrites: bool) -> (any, str, ServerController):
+    """ returns a server controller after accepting a client """
+    soc.listen()
+    connection, _ = soc.accept()
+    connection.sendall(dumps({
+        'type': 'welcome',
+        'info': 'Lonande'
+    }).encode())
+    alarm(10)
+    try:
+        actorType = loads(connection.recv(64).decode())
+    except TimeoutError:
+        actorType = 'player'
+    finally:
+        alarm(0)
+    return connection, actorType, ServerController(connection,
+            # backwards compatible, only use new anchoring protocol if its not a player
+            useLayoutAnchor = actorType != 'player', metrics = metrics,
+            batchWrites = batchWrites)
+
+def checkClientNumber(numClients: int, clientMax: int, clientType: str):
+    """ raises runtime error if numClients exceeds clientMax """
+    if numClients >= clientMax:
+        raise RuntimeError(f'More than {clientMax} {clientType} tried to register.')
+
+def registerRemainingAdversaries(builders: list, adversaries: list):
+    """ registers local adversaries with the builders """
+    level = 1
+    zombieCount = len([z for z in adversaries if isinstance(z, Zombie)])
+    ghostCount = len(adversaries) - zombieCount
+    for builder in builders:
+        for i in range(max(int((float(level) / 2.0) + 1.0) - zombieCount, 0)):
+            registerAdversary(builder, 'zombie', i + zombieCount, LocalZombieController())
+        for i in range(max(int((float(level) - 1.0) / 2.0) - ghostCount, 0)):
+            registerAdversary(builder, 'ghost', i + ghostCount, LocalGhostController())
+        level += 1
+
+def registerAdversary(builder: LevelManagerBuilder, advType: str, i: int, controller: Controller):
+    """ registers an adversary with the builder """
+    builder.registerAdversary(advType, advType + str(i), controller = controller)
+
+def registerObservers(builders: list):
+    """ registers an observer with each builder """
+    for builder in builders:
+        builder.registerObserver('mainObserver', SingleLocalObserverController())
+
+def createLevelFactories(builders: list, levels: list, annotations: dict) -> list:
+    """ hands each builder and its level over to a factory that builds it
+    just before the level is played, the lists are emptied so a finished
+    level can be released """
+    factories = [ LevelFactory(lambda b = b, l = l, d = d: buildLevel(b, l, d))
+            for b, l, d in zip(builders, levels, annotations['levels']) ]
+    builders.clear()
+    levels.clear()
+    return factories
+
+def buildLevel(builder: LevelManagerBuilder, createLevel, description: dict) -> LevelManagerBuilder:
+    """ creates the builder's level, describes it for the profile annotations
+    and returns the builder with the level and random starting points """
+    level, keyLocation, exitLocation = createLevel()
+    description.update(describeLevel(level, len(builder.players), len(builder.adversaries)))
+    return builder.addLevelComponent(level
+        ).setKeyLocation(keyLocation
+        ).setExitLocation(exitLocation
+        ).setRandomStartingPoints(True)
+
+
+# ----- main entry -------------------------------------------------------------
+
+if __name__ == '__main__':
+    main()
+
+
+# ----- end of file ------------------------------------------------------------
+
+
+
+
+
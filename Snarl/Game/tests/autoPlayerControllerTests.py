@@ -0,0 +1,119 @@
+#
+# autoPlayerControllerTests.py
+# authors: Michael Curley & Drake Moore
+#
+
+from autoPlayerController import AutoPlayerController
+from exploredMap import ExploredMap
+from gameManager import GameManager
+from hallway import Hallway
+from point import Point
+from room import Room
+from tile import Tile
+from levelManagerBuilder import LevelManagerBuilder
+from unittest import TestCase
+
+
+class AutoPlayerControllerTests(TestCase):
+    """ tests for the automated player controller """
+
+    def setUp(self):
+        self.controller = AutoPlayerController('mike')
+        self.builder = LevelManagerBuilder(
+            ).setKeyLocation(Point(1, 3)
+            ).setExitLocation(Point(12, 13)
+            ).addLevelComponent(Room(Point(0, 0), [
+                [Tile.WALL, Tile.WALL,  Tile.WALL,  Tile.WALL,  Tile.WALL],
+                [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
+                [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
+                [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
+                [Tile.WALL, Tile.WALL,  Tile.DOOR,  Tile.WALL,  Tile.WALL]
+            ])).addLevelComponent(Room(Point(10, 10), [
+                [Tile.WALL, Tile.WALL,  Tile.WALL,  Tile.WALL, Tile.WALL],
+                [Tile.DOOR, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
+                [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
+                [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
+                [Tile.WALL, Tile.WALL,  Tile.WALL,  Tile.WALL, Tile.WALL]
+            ])).addLevelComponent(Hallway([
+                Point(2, 4), Point(2, 6), Point(7, 6), Point(7, 8), Point(0, 8),
+                Point(0, 12), Point(5, 12), Point(5, 11), Point(10, 11)
+            ])).registerPlayer('m', 'mike', Point(1, 1), self.controller)
+
+
+    def testReachesKeyThenExit_Success(self):
+        levelManager = self.builder.build()
+        GameManager([levelManager]).run()
+        self.assertTrue(levelManager.keyCollected)
+        self.assertTrue(levelManager.allActors[0].exited)
+        self.assertTrue(self.controller.keyCollected)
+        # the whole walk from the start room to the exit room was remembered
+        self.assertTrue(self.controller.exploredMap.isExplored(Point(0, 10)))
+        self.assertEqual(Tile.DOOR, self.controller.exploredMap.getTile(Point(2, 4)))
+
+
+    def testMergesOnlyTheView_Success(self):
+        levelManager = self.builder.build()
+        self.controller.requestMove(levelManager.getActorGameState('mike'))
+        self.assertEqual(20, self.controller.exploredMap.countExplored())
+        self.assertFalse(self.controller.exploredMap.isExplored(Point(2, 4)))
+        gameState = levelManager.getActorGameState('mike')
+        gameState.exploredMap = ExploredMap()
+        gameState.exploredMap.merge(Point(0, 0), [[Tile.WALL]])
+        self.controller.requestMove(gameState)
+        # a remote game state's explored map is used rather than its own
+        self.assertEqual(20, self.controller.exploredMap.countExplored())
+
+
+    def testExploresWithoutTarget_Success(self):
+        gameState = self.builder.build().getActorGameState('mike')
+        gameState.keyLocation = None
+        gameState.exitLocation = None
+        move = self.controller.requestMove(gameState)
+        # the nearest seen tiles next to unseen ones, right and down
+        self.assertIn(move, [Point(3, 1), Point(1, 3)])
+
+
+    def testKeyFoundBetweenTurns_Success(self):
+        levelManager = self.builder.build()
+        def remoteGameState(messages: list):
+            # a remote player's game state neither shows the unseen key nor
+            # unlocks the exit
+            gameState = levelManager.getActorGameState('mike')
+            gameState.keyLocation = None
+            gameState.exitUnlocked = False
+            gameState.messages = messages
+            return gameState
+        self.controller.requestMove(remoteGameState(None))
+        self.controller.updateGameState(remoteGameState(['Player drake found the key']))
+        self.controller.updateGameState(remoteGameState(['Zombie zombie0 moved']))
+        gameState = remoteGameState(None)
+        move = self.controller.requestMove(gameState)
+        self.assertTrue(self.controller.keyCollected)
+        self.assertEqual((12, 13), self.controller.target)
+        self.assertIn(move, gameState.listValidMoves())
+        self.assertNotEqual(gameState.actor.location, move)
+
+
+    def testWaitsByExitWhenExplored_Success(self):
+        levelManager = self.builder.build()
+        gameState = levelManager.getActorGameState('mike')
+        gameState.keyLocation = None
+        gameState.exploredMap = ExploredMap()
+        gameState.exploredMap.merge(levelManager.floorPlan.upperLeftPosition,
+                levelManager.floorPlan.produceTileLayout())
+        move = self.controller.requestMove(gameState)
+        # no tile is left to explore, so it heads for the exit but stops short
+        self.assertEqual(Point(1, 3), move)
+        self.assertEqual((11, 13), self.controller.path[-1])
+
+
+    def testKeepsAwayFromAdversaries_Success(self):
+        self.builder.registerAdversary('zombie', 'zombie0', Point(2, 3))
+        gameState = self.builder.build().getActorGameState('mike')
+        move = self.controller.requestMove(gameState)
+        self.assertIn(move, gameState.listValidMoves())
+        self.assertTrue(abs(move.X - 2) > 1 or abs(move.Y - 3) > 1)
+
+
+
+# ----- end of file ------------------------------------------------------------
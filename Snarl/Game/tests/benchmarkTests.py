@@ -0,0 +1,91 @@
+#
+# benchmarkTests.py
+# authors: Michael Curley & Drake Moore
+#
+
+from benchmark import Benchmark, LoadTestController, addImportCases, createGeneratedLevel, \
+        createLevelManager, createSeededGame, createSerpentineWaypoints
+from hallway import Hallway
+from json import loads
+from unittest import TestCase
+
+
+class BenchmarkTests(TestCase):
+    """ tests for the Benchmark runner and its level/game helpers """
+
+    def testRunReportsEveryCase_Success(self):
+        calls = list()
+        benchmark = Benchmark(repeat = 2, minRepeatTime = 0.001
+            ).addCase('first', lambda: calls.append(1), params = { 'n': 1 }
+            ).addCase('second', lambda s: calls.append(s), setup = lambda: 2)
+        reported = list()
+        results = benchmark.run(report = reported.append)
+        self.assertEqual(['first', 'second'], [r['name'] for r in results])
+        self.assertEqual(results, reported)
+        self.assertEqual({ 'n': 1 }, results[0]['params'])
+        self.assertTrue(all(r['min'] <= r['median'] <= r['max'] for r in results))
+        self.assertEqual(2, len(loads(benchmark.toJson(results))['results']))
+
+
+    def testRunFilter_Success(self):
+        benchmark = Benchmark(repeat = 1, minRepeatTime = 0.001
+            ).addCase('keep', lambda: None
+            ).addCase('drop', lambda: None)
+        self.assertEqual(['keep'], [r['name'] for r in benchmark.run('ke')])
+
+
+    def testImportCasesImportEachModuleAlone_Success(self):
+        # each module is imported first in a new interpreter, so an import
+        # cycle between them fails the run
+        modules = ['floorPlan', 'gameState', 'actor', 'controller', 'hallway']
+        benchmark = Benchmark(repeat = 1, minRepeatTime = 0.001)
+        addImportCases(benchmark, modules)
+        results = benchmark.run()
+        self.assertEqual(modules, [r['params']['module'] for r in results])
+
+
+    def testInvalidRepeat_ValueError(self):
+        with self.assertRaises(ValueError):
+            Benchmark(repeat = 0)
+
+
+    def testCreateGeneratedLevelIsSeeded_Success(self):
+        keyLocation, exitLocation, level = createGeneratedLevel(3, 5)
+        self.assertEqual(3, len(level.rooms))
+        self.assertTrue(len(level.hallways) >= 2)
+        otherKeyLocation, otherExitLocation, otherLevel = createGeneratedLevel(3, 5)
+        self.assertEqual(keyLocation, otherKeyLocation)
+        self.assertEqual(exitLocation, otherExitLocation)
+        self.assertEqual(level.layout, otherLevel.layout)
+
+
+    def testSerpentineHallway_Success(self):
+        hallway = Hallway(createSerpentineWaypoints(9, 5))
+        self.assertEqual(7, len(hallway.waypointsEntryToExit))
+        self.assertEqual((8, 10), (hallway.width, hallway.height))
+
+
+    def testSeededGameIsDeterministic_Success(self):
+        def play() -> list:
+            keyLocation, exitLocation, level = createGeneratedLevel(2, 6)
+            gm = createSeededGame(level, keyLocation, exitLocation, 3, 11)
+            gm.run()
+            return [(a.name, a.exited, a.expelled, a.location)
+                    for a in gm.currentLevelManager.allActors]
+        self.assertEqual(play(), play())
+
+
+    def testLoadTestControllerRecordsTurns_Success(self):
+        keyLocation, exitLocation, level = createGeneratedLevel(2, 6)
+        levelManager = createLevelManager(level, keyLocation, exitLocation, 2)
+        gameState = levelManager.getActorGameState(levelManager.allActors[0].name)
+        controller = LoadTestController(0)
+        moves = [ controller.requestMove(gameState) for _ in range(3) ]
+        self.assertTrue(all(move in gameState.listValidMoves() for move in moves))
+        latencies = controller.getTurnLatencies()
+        self.assertEqual(2, len(latencies))
+        self.assertTrue(all(latency >= 0 for latency in latencies))
+
+
+
+# ----- end of file ------------------------------------------------------------
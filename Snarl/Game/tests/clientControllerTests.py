@@ -0,0 +1,154 @@
+#
+# clientControllerTests.py
+# authors: Michael Curley & Drake Moore
+#
+
+from actor import Player, Zombie
+from clientController import ClientController
+from controller import Controller
+from gameState import GameState
+from interactable import Interactable
+from json import dumps
+from os import path
+from point import Point
+from socket import create_server
+from subprocess import run
+from sys import executable
+from threading import Thread
+from tile import Tile
+from unittest import TestCase
+
+
+class RecordingController(Controller):
+    """ a controller keeping every game state it is updated with and its
+    explored map at the time """
+
+    def __init__(self):
+        self.gameStates = list()
+        self.exploredFloorPlans = list()
+        self.finalStats = None
+
+
+    def getName(self) -> str:
+        return 'mike'
+
+
+    def updateGameState(self, gameState: GameState):
+        self.gameStates.append(gameState)
+        self.exploredFloorPlans.append(gameState.exploredMap.toFloorPlan())
+
+
+    def updateFinalStats(self, finalStats: list):
+        self.finalStats = finalStats
+
+
+
+class ClientControllerTests(TestCase):
+    """ tests for the client controller's game state reconstruction """
+
+    def createUpdate(self, position: list, layout: list, actors: list) -> dict:
+        """ returns a player-update message """
+        return { 'type': 'player-update', 'layout': layout, 'position': position,
+                'objects': [ { 'type': 'key', 'position': [2, 3] } ],
+                'actors': actors, 'message': None }
+
+
+    def playMessages(self, messages: list) -> RecordingController:
+        """ serves the messages to a client in one write and returns its
+        controller once the client has processed them """
+        listener = create_server(('127.0.0.1', 0))
+        def serve():
+            connection, _ = listener.accept()
+            connection.sendall(dumps({ 'type': 'welcome', 'info': 'test' }).encode())
+            connection.recv(64) # the client type
+            connection.sendall(''.join(dumps(msg) for msg in messages).encode())
+            connection.recv(1024) # the name
+            connection.close()
+        server = Thread(target = serve, daemon = True)
+        server.start()
+        controller = RecordingController()
+        try:
+            ClientController(controller, '127.0.0.1', listener.getsockname()[1], 'player').run()
+        finally:
+            server.join()
+            listener.close()
+        return controller
+
+
+    def testUpdatesKeepActorsAndTiles_Success(self):
+        layout = [
+            [0, 0, 0, 0, 0],
+            [0, 1, 1, 1, 0],
+            [0, 1, 1, 1, 0],
+            [0, 1, 1, 1, 0],
+            [0, 0, 2, 0, 0]
+        ]
+        moved = [ list(row) for row in layout ]
+        moved[4] = [0, 0, 1, 0, 0]
+        controller = self.playMessages(['name',
+            { 'type': 'start-level', 'level': 1, 'players': ['mike', 'drake'] },
+            self.createUpdate([2, 2], layout, [
+                { 'type': 'player', 'name': 'drake', 'position': [1, 1] },
+                { 'type': 'zombie', 'name': 'jim', 'position': [3, 3] }]),
+            self.createUpdate([2, 2], moved, [
+                { 'type': 'zombie', 'name': 'jim', 'position': [3, 2] },
+                { 'type': 'player', 'name': 'drake', 'position': [1, 2] }]),
+            { 'type': 'end-game', 'scores': [] }])
+        first, second = controller.gameStates
+        self.assertIsInstance(first.allActors[0], Player)
+        self.assertIsInstance(first.allActors[1], Zombie)
+        self.assertIs(first.allActors[0], second.allActors[1])
+        self.assertIs(first.allActors[1], second.allActors[0])
+        self.assertEqual(Point(2, 1), second.allActors[1].location)
+        self.assertEqual('1', second.allActors[1].identifier)
+        self.assertEqual(Tile.DOOR, first.floorPlan.getTileInLayout(Point(2, 4)))
+        self.assertEqual(Tile.EMPTY, second.floorPlan.getTileInLayout(Point(2, 4)))
+        self.assertEqual(Interactable.KEY, second.floorPlan.getTileInLayout(Point(3, 2)))
+        self.assertIs(second.allActors[0], second.floorPlan.getTileInLayout(Point(2, 3)))
+        self.assertEqual(Tile.EMPTY, second.floorPlan.getTileInLayout(Point(3, 3)))
+        self.assertIs(first.exploredMap, second.exploredMap)
+        self.assertEqual(25, second.exploredMap.countExplored())
+        self.assertEqual(Tile.EMPTY, second.exploredMap.getTile(Point(2, 4)))
+        self.assertEqual([], controller.finalStats)
+
+
+    def testExploredMapRemembersWindows_Success(self):
+        window = [
+            [0, 0, 0, 0, 0],
+            [1, 1, 1, 1, 1],
+            [1, 1, 1, 1, 1],
+            [1, 1, 1, 1, 1],
+            [0, 0, 2, 0, 0]
+        ]
+        controller = self.playMessages(['name',
+            { 'type': 'start-level', 'level': 1, 'players': ['mike'] },
+            self.createUpdate([2, 2], window, []),
+            self.createUpdate([2, 4], window, []),
+            { 'type': 'start-level', 'level': 2, 'players': ['mike'] },
+            self.createUpdate([2, 2], window, []),
+            { 'type': 'end-game', 'scores': [] }])
+        first, second, third = controller.exploredFloorPlans
+        self.assertEqual(Point(4, 4), first.lowerRightPosition)
+        self.assertEqual(Point(6, 4), second.lowerRightPosition)
+        # the first window's left columns are remembered out of view
+        self.assertEqual(Tile.EMPTY, second.getTileInLayout(Point(0, 1)))
+        self.assertEqual(Tile.WALL, second.getTileInLayout(Point(2, 4)))
+        self.assertEqual(Tile.DOOR, second.getTileInLayout(Point(4, 4)))
+        self.assertEqual(Point(4, 4), third.lowerRightPosition)
+        self.assertEqual(Tile.DOOR, third.getTileInLayout(Point(2, 4)))
+
+
+    def testImportLeavesOutServerModules_Success(self):
+        # imported alone in a new interpreter, as the client command does, the
+        # level building and parsing modules are not loaded
+        directory = path.dirname(path.dirname(path.abspath(__file__)))
+        result = run([executable, '-c', 'import sys, clientController; print(*sys.modules)'],
+                cwd = directory, capture_output = True, text = True, check = True)
+        modules = result.stdout.split()
+        self.assertIn('clientController', modules)
+        for module in ['levelManager', 'level', 'room', 'hallway', 'snarlParser', 'metrics']:
+            self.assertNotIn(module, modules)
+
+
+
+# ----- end of file ------------------------------------------------------------
@@ -0,0 +1,75 @@
+#
+# codecTests.py
+# authors: Michael Curley & Drake Moore
+#
+
+from benchmark import SerializingController, createGeneratedLevel, createLevelManager
+from codec import JsonCodec, JsonFragment, jsonToPoint, listJsonLibraries, pointToJson
+from json import loads
+from point import Point
+from random import seed as seedRandom
+from unittest import TestCase
+
+
+class CodecTests(TestCase):
+    """ tests for the JsonCodec object and the json point conversions """
+
+    def testEncodeDecodeEveryLibrary_Success(self):
+        msg = { 'type': 'player-update', 'layout': [[0, 1, 2]], 'position': [1, 2],
+                'message': 'Player é exited', 'health': None }
+        for library in listJsonLibraries():
+            codec = JsonCodec(library)
+            data = codec.encode(msg)
+            self.assertIsInstance(data, bytes)
+            self.assertEqual(msg, loads(data.decode()))
+            self.assertEqual(msg, codec.decode(data))
+            self.assertEqual(msg, codec.decode(data.decode()))
+            with self.assertRaises(ValueError):
+                codec.decode('"OK" "move"')
+
+
+    def testEncodeFragments_Success(self):
+        for library in listJsonLibraries():
+            codec = JsonCodec(library)
+            data = codec.encode({ 'type': 'player-update',
+                    'layout': JsonFragment(b'[[0,1],[2,0]]') })
+            self.assertEqual({ 'type': 'player-update', 'layout': [[0, 1], [2, 0]] },
+                    loads(data.decode()))
+            self.assertEqual({ 'layout': [1] },
+                    loads(codec.encode({ 'layout': JsonFragment(b'[1]') }).decode()))
+
+
+    def testUnknownLibrary_Failure(self):
+        self.assertEqual('json', listJsonLibraries()[-1])
+        with self.assertRaises(ValueError):
+            JsonCodec('simplejson')
+
+
+    def testPointConversion_Success(self):
+        self.assertEqual([3, 5], pointToJson(Point(5, 3)))
+        self.assertEqual(Point(5, 3), jsonToPoint([3, 5]))
+        self.assertIsNone(pointToJson(None))
+        self.assertIsNone(jsonToPoint(None))
+
+
+    def testLevelLayoutEncodedOncePerLevel_Success(self):
+        keyLocation, exitLocation, level = createGeneratedLevel(4, 0)
+        seedRandom(0)
+        levelManager = createLevelManager(level, keyLocation, exitLocation, 4)
+        adversary = levelManager.allActors[-1]
+        controller = SerializingController(True)
+        controller.updateGameState(levelManager.getActorGameState(adversary.name))
+        first = controller.lastMessage['layout']
+        controller.updateGameState(levelManager.getActorGameState(adversary.name))
+        self.assertIs(first, controller.lastMessage['layout'])
+        layout = loads(first.data.decode())
+        self.assertEqual(level.height, len(layout))
+        self.assertEqual(level.width, len(layout[0]))
+        levelManager.currentLevel = 2
+        controller.updateGameState(levelManager.getActorGameState(adversary.name))
+        self.assertIsNot(first, controller.lastMessage['layout'])
+        self.assertEqual(layout, loads(controller.lastMessage['layout'].data.decode()))
+
+
+
+# ----- end of file ------------------------------------------------------------
@@ -0,0 +1,61 @@
+#
+# exploredMapTests.py
+# authors: Michael Curley & Drake Moore
+#
+
+from exploredMap import ExploredMap
+from point import Point
+from tile import Tile
+from unittest import TestCase
+
+
+class ExploredMapTests(TestCase):
+    """ tests for the ExploredMap object """
+
+    def setUp(self):
+        self.exploredMap = ExploredMap()
+        self.exploredMap.merge(Point(0, 0), [
+            [Tile.WALL, Tile.WALL,  Tile.WALL],
+            [Tile.WALL, Tile.EMPTY, Tile.DOOR]
+        ])
+
+
+    def testMergeRemembersSeenTiles_Success(self):
+        self.exploredMap.merge(Point(2, 1), [
+            [Tile.EMPTY,   Tile.HALLWAY],
+            [Tile.UNKNOWN, Tile.HALLWAY]
+        ])
+        self.assertEqual(Tile.EMPTY, self.exploredMap.getTile(Point(1, 1)))
+        self.assertEqual(Tile.EMPTY, self.exploredMap.getTile(Point(2, 1)))
+        self.assertEqual(Tile.HALLWAY, self.exploredMap.getTile(Point(3, 2)))
+        self.assertEqual(Tile.UNKNOWN, self.exploredMap.getTile(Point(2, 2)))
+        self.assertFalse(self.exploredMap.isExplored(Point(2, 2)))
+        self.assertEqual(8, self.exploredMap.countExplored())
+        self.assertEqual(Point(3, 2), self.exploredMap.lowerRightPosition)
+
+
+    def testMergeOnlyGivenRows_Success(self):
+        self.exploredMap.merge(Point(0, 0), [
+            [Tile.EMPTY, Tile.EMPTY, Tile.EMPTY],
+            [Tile.EMPTY, Tile.EMPTY, Tile.EMPTY]
+        ], [1])
+        self.assertEqual(Tile.WALL, self.exploredMap.getTile(Point(1, 0)))
+        self.assertEqual(Tile.EMPTY, self.exploredMap.getTile(Point(2, 1)))
+
+
+    def testToFloorPlan_Success(self):
+        self.exploredMap.merge(Point(-1, 3), [[Tile.HALLWAY]])
+        floorPlan = self.exploredMap.toFloorPlan()
+        self.assertEqual(Point(-1, 0), floorPlan.upperLeftPosition)
+        self.assertEqual(Point(2, 3), floorPlan.lowerRightPosition)
+        self.assertEqual(Tile.DOOR, floorPlan.getTileInLayout(Point(2, 1)))
+        self.assertEqual(Tile.HALLWAY, floorPlan.getTileInLayout(Point(-1, 3)))
+        self.assertEqual(Tile.UNKNOWN, floorPlan.getTileInLayout(Point(0, 3)))
+        self.exploredMap.reset()
+        self.assertEqual(0, self.exploredMap.countExplored())
+        with self.assertRaises(ValueError):
+            self.exploredMap.toFloorPlan()
+
+
+
+# ----- end of file ------------------------------------------------------------
@@ -0,0 +1,69 @@
+#
+# fixtures.py
+# authors: Michael Curley & Drake Moore
+#
+
+from controller import Controller
+from gameState import GameState
+from hallway import Hallway
+from levelManagerBuilder import LevelManagerBuilder
+from moveResult import MoveResult
+from point import Point
+from room import Room
+from snarlDisconnectError import SnarlDisconnectError
+from tile import Tile
+from time import sleep
+
+
+class ScriptedController(Controller):
+    """ a controller making the given moves in order (sleeping first for the
+    given seconds) and disconnecting once they run out, the move results it
+    is sent are recorded """
+
+    def __init__(self, moves: list, delays: list = list()):
+        self.moves = list(moves)
+        self.delays = list(delays)
+        self.results = list()
+
+
+    def requestMove(self, gameState: GameState) -> Point:
+        if len(self.delays) > 0:
+            sleep(self.delays.pop(0))
+        if len(self.moves) == 0:
+            raise SnarlDisconnectError()
+        return self.moves.pop(0)
+
+
+    def updateMoveResult(self, moveResult: MoveResult):
+        self.results.append(moveResult)
+
+
+
+class Fixtures:
+    """ the level components shared by the tests """
+
+    @staticmethod
+    def addTwoRooms(builder: LevelManagerBuilder) -> LevelManagerBuilder:
+        """ adds two 5x5 rooms to the builder and returns it, one at (0, 0)
+        with a door at (2, 4) and one at (10, 10) with a door at (10, 11),
+        joined by a hallway """
+        return builder.addLevelComponent(Room(Point(0, 0), [
+                [Tile.WALL, Tile.WALL,  Tile.WALL,  Tile.WALL,  Tile.WALL],
+                [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
+                [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
+                [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
+                [Tile.WALL, Tile.WALL,  Tile.DOOR,  Tile.WALL,  Tile.WALL]
+            ])).addLevelComponent(Room(Point(10, 10), [
+                [Tile.WALL, Tile.WALL,  Tile.WALL,  Tile.WALL,  Tile.WALL],
+                [Tile.DOOR, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
+                [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
+                [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
+                [Tile.WALL, Tile.WALL,  Tile.WALL,  Tile.WALL,  Tile.WALL]
+            ])).addLevelComponent(Hallway([
+                Point(2, 4), Point(2, 6), Point(7, 6), Point(7, 8), Point(0, 8),
+                Point(0, 12), Point(5, 12), Point(5, 11), Point(10, 11)
+            ]))
+
+
+
+# ----- end of file ------------------------------------------------------------
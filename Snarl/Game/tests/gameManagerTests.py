@@ -3,18 +3,19 @@
 # authors: Michael Curley & Drake Moore
 #
 
-from hallway import Hallway
 from interactable import Interactable
 from level import Level
 from point import Point
-from room import Room
-from tile import Tile
 from actor import Actor
 from levelManagerBuilder import LevelManagerBuilder
 from gameState import GameState
 from levelManager import LevelManager
 from floorPlan import FloorPlan
+from controller import Controller
 from gameManager import GameManager
+from fixtures import Fixtures, ScriptedController
+from levelFactory import LevelFactory
+from threading import current_thread, main_thread
 from unittest import TestCase
 
 
@@ -22,48 +23,18 @@ class GameManagerTests(TestCase):
     """ tests for game manager """
 
     def setUp(self):
-        self.builder = LevelManagerBuilder(
+        self.builder = Fixtures.addTwoRooms(LevelManagerBuilder(
             ).setKeyLocation(Point(1, 3)
             ).setExitLocation(Point(2, 3)
-            ).addLevelComponent(Room(Point(0, 0), [
-                [Tile.WALL, Tile.WALL,  Tile.WALL,  Tile.WALL,  Tile.WALL],
-                [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
-                [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
-                [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
-                [Tile.WALL, Tile.WALL,  Tile.DOOR,  Tile.WALL,  Tile.WALL]
-            ])).addLevelComponent(Room(Point(10, 10), [
-                [Tile.WALL, Tile.WALL,  Tile.WALL,  Tile.WALL, Tile.WALL],
-                [Tile.DOOR, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
-                [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
-                [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
-                [Tile.WALL, Tile.WALL,  Tile.WALL,  Tile.WALL, Tile.WALL]
-            ])).addLevelComponent(Hallway([
-                Point(2, 4), Point(2, 6), Point(7, 6), Point(7, 8), Point(0, 8),
-                Point(0, 12), Point(5, 12), Point(5, 11), Point(10, 11)
-            ]))
+            ))
 
         self.registerDefaultPlayersAndAdversaries()
         levelManager1 = self.builder.build()
 
-        self.builder = LevelManagerBuilder(
+        self.builder = Fixtures.addTwoRooms(LevelManagerBuilder(
         ).setKeyLocation(Point(12, 13)
         ).setExitLocation(Point(1, 3)
-        ).addLevelComponent(Room(Point(0, 0), [
-            [Tile.WALL, Tile.WALL, Tile.WALL, Tile.WALL, Tile.WALL],
-            [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
-            [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
-            [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
-            [Tile.WALL, Tile.WALL, Tile.DOOR, Tile.WALL, Tile.WALL]
-        ])).addLevelComponent(Room(Point(10, 10), [
-            [Tile.WALL, Tile.WALL, Tile.WALL, Tile.WALL, Tile.WALL],
-            [Tile.DOOR, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
-            [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
-            [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
-            [Tile.WALL, Tile.WALL, Tile.WALL, Tile.WALL, Tile.WALL]
-        ])).addLevelComponent(Hallway([
-            Point(2, 4), Point(2, 6), Point(7, 6), Point(7, 8), Point(0, 8),
-            Point(0, 12), Point(5, 12), Point(5, 11), Point(10, 11)
-        ]))
+        ))
         self.registerDefaultPlayersAndAdversaries()
         levelManager2 = self.builder.build()
         self.gm = GameManager([levelManager1, levelManager2])
@@ -82,6 +53,41 @@ class GameManagerTests(TestCase):
         pass
 
 
+    def createExitingBuilder(self, controller: Controller) -> LevelManagerBuilder:
+        """ a level where the player at (2, 2) can collect the key and exit """
+        self.builderThreads.append(current_thread())
+        return Fixtures.addTwoRooms(LevelManagerBuilder(
+            ).setKeyLocation(Point(1, 3)
+            ).setExitLocation(Point(2, 3)
+            )).registerPlayer('m', 'mike', Point(2, 2), controller)
+
+
+    def testLevelFactoriesAreBuiltLazilyAndReleased_Success(self):
+        self.builderThreads = list()
+        controller = ScriptedController([Point(1, 3), Point(2, 3)] * 2)
+        gm = GameManager([ LevelFactory(lambda: self.createExitingBuilder(controller))
+                for _ in range(2) ])
+        self.assertEqual(0, len(self.builderThreads))
+        self.assertIsNone(gm.currentLevelManager)
+        gm.run()
+        self.assertTrue(gm.currentLevelManager.players['mike'].exited)
+        self.assertEqual(2, len(self.builderThreads))
+        self.assertEqual([None, None], gm.levelManagers)
+
+
+    def testPrefetchPreparesNextLevelInBackground_Success(self):
+        self.builderThreads = list()
+        controller = ScriptedController([Point(1, 3), Point(2, 3)] * 3)
+        gm = GameManager([ LevelFactory(lambda: self.createExitingBuilder(controller))
+                for _ in range(3) ], prefetch = True)
+        gm.run()
+        self.assertTrue(gm.currentLevelManager.players['mike'].exited)
+        self.assertEqual(main_thread(), self.builderThreads[0])
+        self.assertTrue(all(t != main_thread() for t in self.builderThreads[1:]))
+        self.assertFalse(GameManager([ LevelFactory(lambda: None) ], seed = 1,
+                prefetch = True).prefetch)
+
+
 
 
 
@@ -0,0 +1,163 @@
+#
+# jsonStreamTests.py
+# authors: Michael Curley & Drake Moore
+#
+
+from codec import JsonCodec
+from json import dumps
+from jsonStream import JsonStreamReader
+from moveResult import MoveResult
+from serverController import ServerController
+from snarlDisconnectError import SnarlDisconnectError
+from socket import create_connection, create_server
+from threading import Thread
+from time import sleep
+from unittest import TestCase
+
+
+class CountingCodec(JsonCodec):
+    """ a codec counting the messages it decodes """
+
+    def __init__(self):
+        JsonCodec.__init__(self)
+        self.decodes = 0
+
+
+    def decode(self, data: any) -> any:
+        self.decodes += 1
+        return JsonCodec.decode(self, data)
+
+
+
+class SwitchingQueue(list):
+    """ a message queue letting other threads run whenever its length is
+    read, as a thread switch could at any point """
+
+    def __len__(self):
+        sleep(0.0005)
+        return list.__len__(self)
+
+
+
+class JsonStreamTests(TestCase):
+    """ tests for the JsonStreamReader object and batched server writes """
+
+    def createReader(self, chunks: list) -> JsonStreamReader:
+        """ returns a reader over the chunks, one per read """
+        chunks = list(chunks)
+        return JsonStreamReader(lambda size: chunks.pop(0) if len(chunks) > 0 else b'')
+
+
+    def testReadSplitMessage_Success(self):
+        reader = self.createReader([b'{"type": "mo', b've", "to": [1, ', '2]}'.encode()])
+        self.assertEqual({ 'type': 'move', 'to': [1, 2] }, reader.readMessage())
+
+
+    def testReadSeveralMessagesInOneRead_Success(self):
+        # the last message's two byte character is split across reads
+        reader = self.createReader([b'"OK"{"type": "end-level"} "move" "\xc3', b'\xa9"'])
+        self.assertEqual('OK', reader.readMessage())
+        self.assertEqual({ 'type': 'end-level' }, reader.readMessage())
+        self.assertEqual('move', reader.readMessage())
+        self.assertEqual('é', reader.readMessage())
+
+
+    def testReadLargeMessageInSmallChunks_Success(self):
+        # over a megabyte of layout, with brackets, quotes and escapes inside
+        # its strings, read 512 bytes at a time and decoded only once
+        message = { 'type': 'player-update', 'message': 'a "[}" \\ é',
+                'layout': [ [ i % 3 for i in range(500) ] for _ in range(1100) ] }
+        data = (dumps(message) + ' "move"').encode()
+        self.assertGreater(len(data), 1 << 20)
+        chunks = [ data[i:i + 512] for i in range(0, len(data), 512) ]
+        codec = CountingCodec()
+        reader = JsonStreamReader(lambda size: chunks.pop(0) if len(chunks) > 0 else b'',
+                codec = codec)
+        self.assertEqual(message, reader.readMessage())
+        self.assertEqual(1, codec.decodes)
+        self.assertEqual('move', reader.readMessage())
+
+
+    def testReadSplitEscapesAndScalars_Success(self):
+        # an escaped backslash and an escaped quote each split across reads
+        reader = self.createReader([b'"a\\\\', b'"', b'"b\\', b'"c" 12', b' true{"x": "}\\\\"}'])
+        self.assertEqual('a\\', reader.readMessage())
+        self.assertEqual('b"c', reader.readMessage())
+        self.assertEqual(12, reader.readMessage())
+        self.assertEqual(True, reader.readMessage())
+        self.assertEqual({ 'x': '}\\' }, reader.readMessage())
+
+
+    def testReadInvalidMessage_ValueError(self):
+        reader = self.createReader([b'nope "move"'])
+        with self.assertRaises(ValueError):
+            reader.readMessage()
+
+
+    def testReadEndedStream_Failure(self):
+        reader = self.createReader([b'{"type": '])
+        with self.assertRaises(ConnectionError):
+            reader.readMessage()
+
+
+    def testBatchedWritesFlushTogether_Success(self):
+        listener = create_server(('127.0.0.1', 0))
+        client = create_connection(listener.getsockname())
+        server, _ = listener.accept()
+        listener.close()
+        try:
+            controller = ServerController(server, batchWrites = True)
+            controller.updateMoveResult(MoveResult.OK)
+            controller.sendMsg({ 'type': 'end-level' })
+            client.setblocking(False)
+            with self.assertRaises(BlockingIOError):
+                client.recv(4096)
+            controller.flush()
+            client.setblocking(True)
+            reader = JsonStreamReader(client.recv)
+            self.assertEqual('OK', reader.readMessage())
+            self.assertEqual({ 'type': 'end-level' }, reader.readMessage())
+            self.assertEqual(0, len(controller.queue))
+            client.close()
+            controller.sendMsg('move')
+            with self.assertRaises(SnarlDisconnectError):
+                controller.flush()
+                controller.recvMsg()
+        finally:
+            server.close()
+
+
+    def testBatchedWritesFromTwoThreads_Success(self):
+        # as a late move request's worker and the turn's updates do
+        listener = create_server(('127.0.0.1', 0))
+        client = create_connection(listener.getsockname())
+        server, _ = listener.accept()
+        listener.close()
+        try:
+            controller = ServerController(server, batchWrites = True)
+            controller.queue = SwitchingQueue()
+            def send(name: str):
+                for i in range(200):
+                    controller.sendMsg({ 'type': name, 'i': i })
+                    controller.flush()
+            senders = [ Thread(target = send, args = (name,)) for name in ['a', 'b'] ]
+            received = list()
+            reader = JsonStreamReader(client.recv)
+            receiver = Thread(target = lambda: received.extend(
+                    reader.readMessage() for _ in range(400)), daemon = True)
+            receiver.start()
+            for sender in senders:
+                sender.start()
+            for sender in senders:
+                sender.join()
+            receiver.join(10)
+            for name in ['a', 'b']:
+                self.assertEqual(list(range(200)),
+                        [ msg['i'] for msg in received if msg['type'] == name ])
+        finally:
+            client.close()
+            server.close()
+
+
+
+# ----- end of file ------------------------------------------------------------
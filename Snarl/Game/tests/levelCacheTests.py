@@ -0,0 +1,71 @@
+#
+# levelCacheTests.py
+# authors: Michael Curley & Drake Moore
+#
+
+from json import loads
+from levelCache import LevelCache
+from levelGenerator import LevelGenerator, writeLevelsFile
+from os import path
+from snarlParser import SnarlParser
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+
+class LevelCacheTests(TestCase):
+    """ tests for the LevelCache """
+
+    def setUp(self):
+        self.tempDir = TemporaryDirectory()
+        self.fileName = path.join(self.tempDir.name, 'snarl.levels')
+        self.cache = LevelCache(path.join(self.tempDir.name, 'cache'))
+        self.parseCount = 0
+        writeLevelsFile(self.fileName, [ LevelGenerator().setRoomCount(3).setSeed(i).generateJson()
+                for i in range(2) ])
+
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+
+    def parseLevels(self, fileName: str) -> list:
+        self.parseCount += 1
+        with open(fileName, 'r') as f:
+            return [ SnarlParser().createLevel(loads(line))
+                    for line in f.read().splitlines()[1:] ]
+
+
+    def testCacheHitSkipsParsing_Success(self):
+        parsed = self.cache.getLevels(self.fileName, self.parseLevels)
+        cached = self.cache.getLevels(self.fileName, self.parseLevels)
+        self.assertEqual(1, self.parseCount)
+        self.assertEqual(len(parsed), len(cached))
+        for (keyA, exitA, levelA), (keyB, exitB, levelB) in zip(parsed, cached):
+            self.assertEqual(keyA, keyB)
+            self.assertEqual(exitA, exitB)
+            self.assertEqual(levelA.layout, levelB.layout)
+            self.assertEqual(len(levelA.rooms), len(levelB.rooms))
+            self.assertIs(levelB.hallways[0].entryRoom, levelB.rooms[
+                levelA.rooms.index(levelA.hallways[0].entryRoom)])
+
+
+    def testChangedFileMisses_Success(self):
+        self.cache.getLevels(self.fileName, self.parseLevels)
+        writeLevelsFile(self.fileName, [ LevelGenerator().setRoomCount(2).generateJson() ])
+        levels = self.cache.getLevels(self.fileName, self.parseLevels)
+        self.assertEqual(2, self.parseCount)
+        self.assertEqual(1, len(levels))
+
+
+    def testCorruptCacheIsReparsed_Success(self):
+        self.cache.getLevels(self.fileName, self.parseLevels)
+        with open(self.cache.getCacheFileName(self.fileName), 'wb') as f:
+            f.write(b'not a pickle')
+        self.assertEqual(2, len(self.cache.getLevels(self.fileName, self.parseLevels)))
+        self.assertEqual(2, self.parseCount)
+        self.cache.getLevels(self.fileName, self.parseLevels)
+        self.assertEqual(2, self.parseCount)
+
+
+
+# ----- end of file ------------------------------------------------------------
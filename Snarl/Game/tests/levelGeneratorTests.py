@@ -0,0 +1,93 @@
+#
+# levelGeneratorTests.py
+# authors: Michael Curley & Drake Moore
+#
+
+from json import loads
+from levelGenerator import LevelGenerator, writeLevelsFile
+from os import path
+from point import Point
+from snarlParser import SnarlParser
+from tempfile import TemporaryDirectory
+from tile import Tile
+from unittest import TestCase
+
+
+class LevelGeneratorTests(TestCase):
+    """ tests for the LevelGenerator """
+
+    def assertConnected(self, level, start: Point):
+        """ asserts every room and hallway tile is reachable from start """
+        traversable = [Tile.EMPTY, Tile.HALLWAY, Tile.DOOR]
+        seen = { start }
+        frontier = [start]
+        while len(frontier) != 0:
+            loc = frontier.pop()
+            for delta in [Point(0, -1), Point(0, 1), Point(-1, 0), Point(1, 0)]:
+                p = loc + delta
+                if p not in seen and level.tilePositionWithinBounds(p) \
+                        and level.getTileInLayout(p) in traversable:
+                    seen.add(p)
+                    frontier.append(p)
+        for floorPlan in level.rooms + level.hallways:
+            for p in floorPlan.getTraversablePointsInLayout(traversable):
+                self.assertIn(p, seen)
+
+
+    def testGenerate_Success(self):
+        keyLocation, exitLocation, level = LevelGenerator(
+            ).setRoomCount(7
+            ).setRoomSize(5, 9
+            ).setHallwayWaypoints(4
+            ).setDensity(0.5
+            ).setSeed(3
+            ).generate()
+        self.assertEqual(7, len(level.rooms))
+        self.assertTrue(len(level.hallways) >= 6)
+        self.assertTrue(all(len(h.waypointsEntryToExit) <= 4 for h in level.hallways))
+        self.assertEqual(Tile.EMPTY, level.getTileInLayout(keyLocation))
+        self.assertEqual(Tile.EMPTY, level.getTileInLayout(exitLocation))
+        self.assertConnected(level, keyLocation)
+
+
+    def testGenerateIsSeeded_Success(self):
+        def generate():
+            return LevelGenerator().setRoomCount(5).setDensity(1).setSeed(9).generateJson()
+        self.assertEqual(generate(), generate())
+
+
+    def testGenerateLarge_Success(self):
+        _, _, level = LevelGenerator().setRoomCount(120).setDensity(0.2).setSeed(1).generate()
+        self.assertTrue(level.width * level.height > 10 ** 4)
+        self.assertConnected(level, level.rooms[0].getTraversablePointsInLayout([Tile.EMPTY])[0])
+
+
+    def testWriteLevelsFile_Success(self):
+        generator = LevelGenerator().setRoomCount(3).setSeed(4)
+        jsonLevels = [ generator.generateJson() for _ in range(2) ]
+        with TemporaryDirectory() as tempDir:
+            fileName = path.join(tempDir, 'generated.levels')
+            writeLevelsFile(fileName, jsonLevels)
+            with open(fileName, 'r') as f:
+                lines = f.read().splitlines()
+        self.assertEqual('2', lines[0])
+        self.assertEqual(jsonLevels, [ loads(line) for line in lines[1:] ])
+        keyLocation, exitLocation, level = SnarlParser().createLevel(jsonLevels[0])
+        self.assertEqual(3, len(level.rooms))
+
+
+    def testInvalidSettings_ValueError(self):
+        with self.assertRaises(ValueError):
+            LevelGenerator().setRoomCount(1)
+        with self.assertRaises(ValueError):
+            LevelGenerator().setRoomSize(6, 5)
+        with self.assertRaises(ValueError):
+            LevelGenerator().setRoomSize(3, 4)
+        with self.assertRaises(ValueError):
+            LevelGenerator().setHallwayWaypoints(3)
+        with self.assertRaises(ValueError):
+            LevelGenerator().setDensity(1.5)
+
+
+
+# ----- end of file ------------------------------------------------------------
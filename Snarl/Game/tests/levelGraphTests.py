@@ -0,0 +1,71 @@
+#
+# levelGraphTests.py
+# authors: Michael Curley & Drake Moore
+#
+
+from hallway import Hallway
+from level import Level
+from levelGenerator import LevelGenerator
+from levelGraph import LevelGraph
+from point import Point
+from room import Room
+from tile import Tile
+from unittest import TestCase
+
+
+class LevelGraphTests(TestCase):
+    """ tests for the LevelGraph object """
+
+    def setUp(self):
+        self.topRoom = Room(Point(0, 0), [
+            [Tile.WALL, Tile.WALL,  Tile.WALL,  Tile.WALL,  Tile.WALL],
+            [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
+            [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
+            [Tile.WALL, Tile.WALL,  Tile.DOOR,  Tile.WALL,  Tile.WALL]
+        ])
+        self.bottomRoom = Room(Point(0, 8), [
+            [Tile.WALL, Tile.WALL,  Tile.DOOR,  Tile.WALL,  Tile.WALL],
+            [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
+            [Tile.WALL, Tile.WALL,  Tile.WALL,  Tile.WALL,  Tile.WALL]
+        ])
+        self.hallway = Hallway([Point(2, 3), Point(2, 8)])
+        self.level = Level([self.topRoom, self.bottomRoom], [self.hallway])
+
+
+    def testComponentLookup_Success(self):
+        graph = self.level.graph
+        self.assertIs(self.topRoom, graph.getComponent(Point(1, 1)))
+        self.assertIs(self.topRoom, graph.getComponent(Point(2, 3)))
+        self.assertIs(self.hallway, graph.getComponent(Point(2, 5)))
+        self.assertIs(self.bottomRoom, graph.getComponent(Point(4, 10)))
+        self.assertEqual(LevelGraph.NoComponent, graph.getComponentIndex(Point(1, 5)))
+        self.assertEqual(LevelGraph.NoComponent, graph.getComponentIndex(Point(-1, 0)))
+        self.assertEqual([[2], [2], [0, 1]], graph.adjacency)
+        self.assertEqual([0, 2, 1], graph.getRoomRoute(0, 1))
+
+
+    def testRoomHopsAndRoutes_Success(self):
+        keyLocation, exitLocation, level = LevelGenerator(
+                ).setRoomCount(9).setSeed(3).generate()
+        graph = level.graph
+        roomCount = len(level.rooms)
+        for fromRoom in range(roomCount):
+            for toRoom in range(roomCount):
+                hops = graph.getRoomHops(fromRoom, toRoom)
+                self.assertEqual(hops, graph.getRoomHops(toRoom, fromRoom))
+                route = graph.getRoomRoute(fromRoom, toRoom)
+                self.assertEqual(2 * hops + 1, len(route))
+                self.assertEqual((fromRoom, toRoom), (route[0], route[-1]))
+                for current, following in zip(route, route[1:]):
+                    self.assertIn(following, graph.adjacency[current])
+
+
+    def testInvalidRoomIndex_ValueError(self):
+        with self.assertRaises(ValueError):
+            self.level.graph.getRoomHopsFrom(2)
+        with self.assertRaises(ValueError):
+            self.level.graph.getIndex(Room(Point(0, 0), self.topRoom.layout))
+
+
+
+# ----- end of file ------------------------------------------------------------
@@ -12,6 +12,7 @@ from actor import Actor, Player, Zombie, Ghost
 from levelManagerBuilder import LevelManagerBuilder
 from gameState import GameState
 from floorPlan import FloorPlan
+from random import seed
 from unittest import TestCase
 
 
@@ -69,6 +70,31 @@ class LevelManagerBuilderTests(TestCase):
             gm.getActorIfExists('bob') # is not in the game
 
 
+    def testRandomStartingPointsRestoreLevelSampler_Success(self):
+        self.builder.registerPlayer('M', 'mike').registerPlayer('D', 'drake'
+            ).registerAdversary('zombie', 'zombay').setRandomStartingPoints(True)
+        seed(5)
+        level = self.builder.prepare().level
+        locations = self.builder.playerStartingPoints + self.builder.adversaryStartingPoints
+        self.assertEqual(3, len(set(locations)))
+        self.assertNotIn(Point(1, 3), locations)
+        self.assertNotIn(Point(12, 11), locations)
+        for location in locations:
+            self.assertIn(location, level.roomStartPointSampler)
+        # the level's sampler is left as it was, so the same seed chooses the
+        # same points on a later build
+        points = list(level.roomStartPointSampler.points)
+        first = self.builder.build()
+        self.assertEqual(points, level.roomStartPointSampler.points)
+        seed(5)
+        second = LevelManagerBuilder().addLevelComponent(level
+            ).setKeyLocation(Point(1, 3)).setExitLocation(Point(12, 11)
+            ).registerPlayer('M', 'mike').registerPlayer('D', 'drake'
+            ).registerAdversary('zombie', 'zombay').setRandomStartingPoints(True).build()
+        self.assertEqual([ a.location for a in first.allActors ],
+                [ a.location for a in second.allActors ])
+
+
     def testLevelManagerBuilderTooManyPlayers_ValueError(self):
         # mike already registered, > 4 players is an error
         self.__registerDefaults()
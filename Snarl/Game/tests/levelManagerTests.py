@@ -3,43 +3,54 @@
 # authors: Michael Curley & Drake Moore
 #
 
-from hallway import Hallway
 from interactable import Interactable
 from level import Level
 from point import Point
-from room import Room
 from tile import Tile
 from actor import Actor
+from controller import Controller
+from moveResult import MoveResult
+from threading import Lock
+from time import sleep
 from levelManagerBuilder import LevelManagerBuilder
 from gameState import GameState
 from levelManager import LevelManager
+from metrics import MetricsRegistry
 from floorPlan import FloorPlan
+from fixtures import Fixtures, ScriptedController
 from unittest import TestCase
 
 
+class LateController(Controller):
+    """ a controller answering every request late by staying in place, it
+    counts the most requests it was answering at once """
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.answering = 0
+        self.mostAnswering = 0
+        self.lock = Lock()
+
+
+    def requestMove(self, gameState: GameState) -> Point:
+        with self.lock:
+            self.answering += 1
+            self.mostAnswering = max(self.mostAnswering, self.answering)
+        sleep(self.delay)
+        with self.lock:
+            self.answering -= 1
+        return gameState.actor.location
+
+
+
 class LevelManagerTests(TestCase):
     """ tests for game manager """
 
     def setUp(self):
-        self.builder = LevelManagerBuilder(
+        self.builder = Fixtures.addTwoRooms(LevelManagerBuilder(
             ).setKeyLocation(Point(1, 3)
             ).setExitLocation(Point(12, 13)
-            ).addLevelComponent(Room(Point(0, 0), [
-                [Tile.WALL, Tile.WALL,  Tile.WALL,  Tile.WALL,  Tile.WALL],
-                [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
-                [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
-                [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
-                [Tile.WALL, Tile.WALL,  Tile.DOOR,  Tile.WALL,  Tile.WALL]
-            ])).addLevelComponent(Room(Point(10, 10), [
-                [Tile.WALL, Tile.WALL,  Tile.WALL,  Tile.WALL, Tile.WALL],
-                [Tile.DOOR, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
-                [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
-                [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
-                [Tile.WALL, Tile.WALL,  Tile.WALL,  Tile.WALL, Tile.WALL]
-            ])).addLevelComponent(Hallway([
-                Point(2, 4), Point(2, 6), Point(7, 6), Point(7, 8), Point(0, 8),
-                Point(0, 12), Point(5, 12), Point(5, 11), Point(10, 11)
-            ]))
+            ))
 
 
     def registerDefaultPlayersAndAdversaries(self):
@@ -95,6 +106,82 @@ class LevelManagerTests(TestCase):
                          '                      X X X X X', gm.asciiRender())
 
 
+    def testGhostTeleportsToEmptyTile_Success(self):
+        self.registerDefaultPlayersAndAdversaries()
+        gm = self.builder.build()
+        occupied = [ a.location for a in gm.allActors if a.name != 'ghost1' ] + \
+                [gm.keyLocation, gm.exitLocation]
+        for _ in range(20):
+            ghost = gm.getActorIfExists('ghost1')
+            ghost.location = Point(12, 12)
+            gm.moveActor('ghost1', Point(11, 12))
+            self.assertEqual(Tile.EMPTY, gm.floorPlan.getTileInLayout(ghost.location))
+            self.assertNotIn(ghost.location, occupied)
+
+
+    def testSimultaneousConflictResolvedInActorOrder_Success(self):
+        mike = ScriptedController([Point(2, 2)])
+        drake = ScriptedController([Point(2, 2)])
+        gm = self.builder.registerPlayer('m', 'mike', controller = mike
+            ).registerPlayer('d', 'drake', controller = drake
+            ).setSimultaneousTurns(True).build()
+        gm.run()
+        self.assertEqual([MoveResult.OK], mike.results)
+        self.assertEqual([MoveResult.Invalid], drake.results)
+        self.assertEqual(Point(2, 2), gm.getActorIfExists('mike').location)
+        self.assertEqual(Point(2, 1), gm.getActorIfExists('drake').location)
+        self.assertTrue(gm.getActorIfExists('drake').disconnected)
+
+
+    def testSimultaneousLateMoveStaysInPlace_Success(self):
+        mike = ScriptedController([Point(2, 2), Point(3, 2)])
+        drake = ScriptedController([Point(3, 1), Point(2, 3)], [0.3])
+        gm = self.builder.registerPlayer('m', 'mike', controller = mike
+            ).registerPlayer('d', 'drake', controller = drake
+            ).setSimultaneousTurns(True, 0.05).build()
+        gm.run()
+        self.assertEqual([MoveResult.OK, MoveResult.OK], mike.results)
+        self.assertEqual([MoveResult.OK], drake.results)
+        self.assertEqual(Point(2, 3), gm.getActorIfExists('drake').location)
+
+
+    def testSimultaneousLateMoveDrainedAtLevelEnd_Success(self):
+        zombie = LateController(0.3)
+        gm = self.builder.registerPlayer('m', 'mike', controller = ScriptedController([Point(2, 2)])
+            ).registerAdversary('zombie', 'zombie0', controller = zombie
+            ).setSimultaneousTurns(True, 0.05).build()
+        gm.run()
+        # the level ended with the zombie's answer late, it was waited for
+        self.assertEqual(0, zombie.answering)
+        self.setUp()
+        gm = self.builder.registerPlayer('m', 'mike', controller = ScriptedController([])
+            ).registerAdversary('zombie', 'zombie0', controller = zombie
+            ).setSimultaneousTurns(True, 0.05).build()
+        gm.run()
+        self.assertEqual(1, zombie.mostAnswering)
+        self.assertEqual(0, zombie.answering)
+
+
+    def testRunRecordsMetrics_Success(self):
+        metrics = MetricsRegistry()
+        gm = self.builder.registerPlayer('m', 'mike', controller = ScriptedController([Point(2, 2)])
+            ).registerAdversary('zombie', 'zombie0').build()
+        gm.run(metrics = metrics)
+        json = metrics.toJson()
+        self.assertEqual(2, json['timings']['requestMove']['Player/ScriptedController']['count'])
+        self.assertEqual(1, json['timings']['moveActor']['Player']['count'])
+        self.assertEqual(2, json['counts']['moveResult']['OK'])
+        self.assertEqual(1, json['counts']['moveResult']['Eject'])
+        self.assertIn('Zombie', json['timings']['turn'])
+        self.assertIn('updatePlayers', json['timings'])
+
+
+    def testInvalidMoveDeadline_ValueError(self):
+        self.registerDefaultPlayersAndAdversaries()
+        with self.assertRaises(ValueError):
+            self.builder.setSimultaneousTurns(True, 0).build()
+
+
     def testLevelManagerTooManyPlayers_ValueError(self):
         self.builder.registerPlayer('m', 'mike'
             ).registerPlayer('d', 'drake'
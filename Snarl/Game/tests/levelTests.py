@@ -83,6 +83,23 @@ class LevelTests(TestCase):
         ], adversaryPoints)
 
 
+    def testPointsAreIndexedByTile_Success(self):
+        for tile in [Tile.EMPTY, Tile.WALL, Tile.DOOR, Tile.HALLWAY]:
+            self.assertEqual(self.baseLevel.getTraversablePointsInLayout([tile]),
+                    self.baseLevel.getPointsOfTile(tile))
+        self.assertEqual([], self.baseLevel.getPointsOfTile(Tile.NONE))
+        for room in self.baseLevel.rooms:
+            self.assertEqual(room.getTraversablePointsInLayout([Tile.EMPTY]),
+                    self.baseLevel.getRoomStartPoints(room))
+
+
+    def testRandomTraversablePoint_Success(self):
+        tiles = [Tile.DOOR, Tile.HALLWAY]
+        points = self.baseLevel.getTraversablePointsInLayout(tiles)
+        for _ in range(20):
+            self.assertIn(self.baseLevel.getRandomTraversablePointInLayout(tiles), points)
+
+
     def testNeighboringRoomsAreSet_Success(self):
         self.assertCountEqual([self.topLeftToBottomRightHallway],
                 self.topLeftRoomForKey.connectedHallways)
@@ -151,6 +168,27 @@ class LevelTests(TestCase):
                 [self.topLeftToBottomRightHallway, topLeftToTopRightHallwayOverlapsBottomRightRoom])
 
 
+    def testOverlapReportsEachOverlappingCoordinate_ValueError(self):
+        self.topLeftKeyLayout[2][4] = Tile.DOOR
+        topLeftRoomNewDoor = Room(Point(0, 0), self.topLeftKeyLayout)
+        overlappingHallway = Hallway([
+            Point(4, 2), Point(6, 2), Point(6, 7), Point(10, 7), Point(10, -4), Point(20, -4)
+        ])
+        self.__clearConnectedAreas(self.baseLevel)
+        with self.assertRaises(ValueError) as context:
+            Level([topLeftRoomNewDoor, self.bottomRightRoomForExit, self.topRightRoom],
+                    [self.topLeftToBottomRightHallway, overlappingHallway])
+        self.assertEqual('Overlap occurs at coordinates: {0}, {1}.'.format(
+                Point(6, 6), Point(7, 7)), str(context.exception))
+
+
+    def testDoorConnectedToTwoHallways_ValueError(self):
+        self.__clearConnectedAreas(self.baseLevel)
+        with self.assertRaises(ValueError):
+            Level([self.topLeftRoomForKey, self.bottomRightRoomForExit],
+                    [self.topLeftToBottomRightHallway, Hallway(self.topLeftToBottomRightWaypoints)])
+
+
     def __clearConnectedAreas(self, level):
         for room in level.rooms:
             room.connectedHallways = list()
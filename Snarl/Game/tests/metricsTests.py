@@ -0,0 +1,57 @@
+#
+# metricsTests.py
+# authors: Michael Curley & Drake Moore
+#
+
+from json import loads
+from metrics import Histogram, MetricsRegistry
+from unittest import TestCase
+from urllib.request import urlopen
+
+
+class MetricsTests(TestCase):
+    """ tests for the Histogram and MetricsRegistry objects """
+
+    def testHistogramBuckets_Success(self):
+        histogram = Histogram()
+        for seconds in [0.000005, 0.00001, 0.05, 20.0]:
+            histogram.record(seconds)
+        json = histogram.toJson()
+        self.assertEqual(4, json['count'])
+        self.assertEqual(0.000005, json['min'])
+        self.assertEqual(20.0, json['max'])
+        self.assertEqual(2, json['buckets']['1e-05'])
+        self.assertEqual(1, json['buckets']['0.1'])
+        self.assertEqual(1, json['buckets']['inf'])
+        self.assertEqual(4, sum(json['buckets'].values()))
+
+
+    def testRegistryLabelsAndTimer_Success(self):
+        metrics = MetricsRegistry()
+        metrics.record('send', 0.5, 'move')
+        metrics.record('send', 0.25, 'move')
+        metrics.count('moveResult', 'OK')
+        metrics.count('moveResult', 'OK', 2)
+        with self.assertRaises(RuntimeError):
+            with metrics.timer('turn'):
+                raise RuntimeError()
+        json = metrics.toJson()
+        self.assertEqual(0.75, json['timings']['send']['move']['total'])
+        self.assertEqual(1, json['timings']['turn']['all']['count'])
+        self.assertEqual({ 'OK': 3 }, json['counts']['moveResult'])
+
+
+    def testServe_Success(self):
+        metrics = MetricsRegistry()
+        metrics.count('moveResult', 'Exit')
+        server = metrics.serve('127.0.0.1', 0)
+        try:
+            with urlopen('http://127.0.0.1:{0}/'.format(server.server_address[1])) as response:
+                self.assertEqual(metrics.toJson(), loads(response.read().decode()))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+
+# ----- end of file ------------------------------------------------------------
@@ -0,0 +1,89 @@
+#
+# pathfinderTests.py
+# authors: Michael Curley & Drake Moore
+#
+
+from hallway import Hallway
+from level import Level
+from levelGenerator import LevelGenerator
+from pathfinder import HierarchicalPathfinder
+from point import Point
+from random import Random
+from room import Room
+from tile import Tile
+from unittest import TestCase
+
+
+class PathfinderTests(TestCase):
+    """ tests for the HierarchicalPathfinder object """
+
+    def setUp(self):
+        self.topRoom = Room(Point(0, 0), [
+            [Tile.WALL, Tile.WALL,  Tile.WALL,  Tile.WALL,  Tile.WALL],
+            [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
+            [Tile.WALL, Tile.WALL,  Tile.EMPTY, Tile.EMPTY, Tile.WALL],
+            [Tile.WALL, Tile.WALL,  Tile.DOOR,  Tile.WALL,  Tile.WALL]
+        ])
+        self.bottomRoom = Room(Point(0, 8), [
+            [Tile.WALL, Tile.WALL,  Tile.DOOR,  Tile.WALL,  Tile.WALL],
+            [Tile.WALL, Tile.EMPTY, Tile.EMPTY, Tile.EMPTY, Tile.WALL],
+            [Tile.WALL, Tile.WALL,  Tile.WALL,  Tile.WALL,  Tile.WALL]
+        ])
+        self.level = Level([self.topRoom, self.bottomRoom],
+                [Hallway([Point(2, 3), Point(2, 8)])])
+
+
+    def testPathThroughHallway_Success(self):
+        path = HierarchicalPathfinder(self.level).findPath(Point(1, 1), Point(3, 9))
+        self.assertEqual([Point(2, 1), Point(2, 2)], path[:2])
+        self.assertEqual([Point(2, y) for y in range(3, 9)], path[2:8])
+        self.assertEqual([Point(2, 9), Point(3, 9)], path[-2:])
+        self.assertEqual(10, len(path))
+
+
+    def testNoPath_Success(self):
+        pathfinder = HierarchicalPathfinder(self.level)
+        self.assertIsNone(pathfinder.findPath(Point(1, 1), Point(1, 2)))
+        self.assertIsNone(pathfinder.findPath(Point(1, 1), Point(1, 5)))
+        self.assertEqual([], pathfinder.findPath(Point(1, 1), Point(1, 1)))
+
+
+    def testPathsAreShortest_Success(self):
+        random = Random(4)
+        for seed in range(4):
+            keyLocation, exitLocation, level = LevelGenerator().setRoomCount(6
+                ).setSeed(seed).setDensity(0.5).generate()
+            pathfinder = HierarchicalPathfinder(level)
+            points = level.getTraversablePointsInLayout(
+                    HierarchicalPathfinder.DefaultTraversableTiles)
+            for _ in range(10):
+                start = random.choice(points)
+                distances = self.__walkingDistances(level, start)
+                goal = random.choice(points)
+                path = pathfinder.findPath(start, goal)
+                self.assertEqual(distances[goal], len(path))
+                for current, following in zip([start] + path, path):
+                    self.assertEqual(1, abs(current.X - following.X) + abs(current.Y - following.Y))
+                    self.assertIn(level.getTileInLayout(following),
+                            HierarchicalPathfinder.DefaultTraversableTiles)
+
+
+    def __walkingDistances(self, level: Level, start: Point) -> dict:
+        """ returns the grid walking distance from the start to every point """
+        distances = { start: 0 }
+        frontier = [start]
+        while len(frontier) != 0:
+            nextFrontier = list()
+            for loc in frontier:
+                for delta in [Point(0, -1), Point(0, 1), Point(-1, 0), Point(1, 0)]:
+                    p = loc + delta
+                    if p not in distances and level.tilePositionWithinBounds(p) and \
+                            level.getTileInLayout(p) in HierarchicalPathfinder.DefaultTraversableTiles:
+                        distances[p] = distances[loc] + 1
+                        nextFrontier.append(p)
+            frontier = nextFrontier
+        return distances
+
+
+
+# ----- end of file ------------------------------------------------------------
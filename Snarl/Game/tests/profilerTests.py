@@ -0,0 +1,71 @@
+#
+# profilerTests.py
+# authors: Michael Curley & Drake Moore
+#
+
+from benchmark import createGeneratedLevel, createHeadlessGame
+from json import load
+from os import path
+from profiler import GameProfiler, describeLevel
+from pstats import Stats
+from tempfile import TemporaryDirectory
+from time import sleep
+from unittest import TestCase
+
+
+class ProfilerTests(TestCase):
+    """ tests for the GameProfiler """
+
+    def setUp(self):
+        self.tempDir = TemporaryDirectory()
+        self.prefix = path.join(self.tempDir.name, 'game')
+        self.levels = [createGeneratedLevel(3, 0)]
+
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+
+    def readReport(self) -> dict:
+        with open(self.prefix + '.json', 'r') as f:
+            return load(f)
+
+
+    def testProfileGame_Success(self):
+        gameManager = createHeadlessGame(self.levels, 2, 0)
+        _, _, level = self.levels[0]
+        GameProfiler(self.prefix).annotate({ 'levels': [describeLevel(level, 1, 1)] }
+            ).run(gameManager.run)
+        report = self.readReport()
+        self.assertEqual('cprofile', report['mode'])
+        self.assertEqual({ 'width': level.width, 'height': level.height, 'rooms': 3,
+                'hallways': len(level.hallways), 'players': 1, 'adversaries': 1 },
+                report['annotations']['levels'][0])
+        self.assertEqual(GameProfiler.DefaultTop, len(report['hottest']))
+        self.assertGreater(Stats(self.prefix + '.pstats').total_calls, 0)
+
+
+    def testSampleCollapsedStacks_Success(self):
+        def waitAWhile():
+            sleep(0.05)
+            return 'done'
+        profiler = GameProfiler(self.prefix, 'sample', interval = 0.005)
+        self.assertEqual('done', profiler.run(waitAWhile))
+        with open(self.prefix + '.collapsed', 'r') as f:
+            lines = f.read().splitlines()
+        self.assertGreater(len(lines), 0)
+        stack, count = lines[0].rsplit(' ', 1)
+        self.assertTrue(stack.endswith('(waitAWhile)'))
+        self.assertGreater(int(count), 0)
+        self.assertTrue(self.readReport()['hottest'][0]['function'].endswith('(waitAWhile)'))
+
+
+    def testInvalidMode_ValueError(self):
+        with self.assertRaises(ValueError):
+            GameProfiler(self.prefix, 'trace')
+        with self.assertRaises(ValueError):
+            GameProfiler(self.prefix, 'sample', interval = 0)
+
+
+
+# ----- end of file ------------------------------------------------------------
@@ -0,0 +1,89 @@
+#
+# replayLogTests.py
+# authors: Michael Curley & Drake Moore
+#
+
+from controller import NoMoveController
+from fixtures import Fixtures, ScriptedController
+from json import dumps, loads
+from levelManagerBuilder import LevelManagerBuilder
+from os import path
+from point import Point
+from replayLog import ReplayLog, Replayer
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+
+class ReplayLogTests(TestCase):
+    """ tests for the ReplayLog and Replayer """
+
+    def setUp(self):
+        self.tempDir = TemporaryDirectory()
+        self.fileName = path.join(self.tempDir.name, 'game.replay')
+        self.levelManager = Fixtures.addTwoRooms(LevelManagerBuilder(
+            ).setKeyLocation(Point(1, 3)
+            ).setExitLocation(Point(3, 1)
+            )).registerPlayer('A', 'actor', Point(2, 2), ScriptedController([
+                Point(1, 3), Point(2, 2), Point(3, 1)])
+            ).registerAdversary('zombie', 'undead jim', Point(3, 3), NoMoveController()
+            ).build()
+        log = ReplayLog(self.fileName, seed = 7, keyframeInterval = 2)
+        self.levelManager.run(1, 1, dict(), log)
+        log.close()
+        self.replayer = Replayer(self.fileName)
+
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+
+    def testLogIsIndexed_Success(self):
+        self.assertEqual(7, self.replayer.seed)
+        self.assertEqual(1, self.replayer.levelCount())
+        self.assertEqual(5, self.replayer.turnCount(1))
+        self.assertEqual([0, 2, 4], [t for t, _ in self.replayer.levels[0]['keyframes']])
+        self.assertEqual(['Key', 'OK', 'OK', 'OK', 'Exit'],
+                [m['result'] for m in self.replayer.moves(1)])
+
+
+    def testGameStateAtStart_Success(self):
+        gs = self.replayer.gameStateAt(1, 0)
+        self.assertFalse(gs.exitUnlocked)
+        self.assertEqual(Point(2, 2), gs.allActors[0].location)
+        self.assertEqual(Point(3, 3), gs.allActors[1].location)
+
+
+    def testGameStateBetweenKeyframes_Success(self):
+        gs = self.replayer.gameStateAt(1, 3)
+        self.assertTrue(gs.exitUnlocked)
+        self.assertEqual(Point(2, 2), gs.allActors[0].location)
+        self.assertFalse(gs.allActors[0].exited)
+        gs = self.replayer.gameStateAt(1, 5)
+        self.assertTrue(gs.allActors[0].exited)
+        self.assertEqual(Point(3, 1), gs.allActors[0].location)
+
+
+    def testGameStateInvalidTurn_ValueError(self):
+        with self.assertRaises(ValueError):
+            self.replayer.gameStateAt(1, 6)
+        with self.assertRaises(ValueError):
+            self.replayer.gameStateAt(2, 0)
+
+
+    def testGameStateEditedLevel_ValueError(self):
+        # an unknown tile id and a row cut short are both rejected rather than
+        # trusted since the level was recorded from a valid one
+        for edit in [lambda layout: layout[2].__setitem__(2, 7),
+                lambda layout: layout[2].pop()]:
+            with open(self.fileName, 'r') as f:
+                records = [ loads(line) for line in f ]
+            level = next(r for r in records if r['type'] == 'level')
+            edit(level['layout']['rooms'][0]['layout'])
+            with open(self.fileName + '.edited', 'w') as f:
+                f.writelines(dumps(r) + '\n' for r in records)
+            with self.assertRaises(ValueError):
+                Replayer(self.fileName + '.edited').gameStateAt(1, 0)
+
+
+
+# ----- end of file ------------------------------------------------------------
@@ -99,6 +99,31 @@ class RoomBuilderTests(TestCase):
         with self.assertRaises(ValueError):
             self.builder.build()
 
+    def testRoomBuilderRectangles_Success(self):
+        """ tests rectangles of walls and doors are added to the room """
+        self.builder.setSize(6, 5)
+        self.builder.addDoorRectangle(Point(0, 1), 1, 3)
+        self.builder.addWallRectangle(Point(2, 1), 2, 2)
+        room = self.builder.build()
+        self.assertEqual('X X X X X X\n' +
+                         '    X X   X\n' +
+                         '    X X   X\n' +
+                         '          X\n' +
+                         'X X X X X X',
+                         room.asciiRender())
+        self.assertEqual([Point(0, 1), Point(0, 2), Point(0, 3)], room.relativeDoorLocations)
+
+    def testRoomBuilderOutsideRectangle_ValueError(self):
+        """ tests a rectangle reaching outside the room throws an error """
+        self.builder.setSize(5, 5)
+        self.builder.addDoors([Point(0, 2)])
+        self.builder.addWallRectangle(Point(3, 3), 3, 1)
+
+        with self.assertRaises(ValueError):
+            self.builder.build()
+        with self.assertRaises(ValueError):
+            self.builder.addDoorRectangle(Point(0, 1), 0, 2)
+
 
 # ----- end of file ------------------------------------------------------------
 
@@ -84,6 +84,35 @@ class RoomTests(TestCase):
         self.assertEqual([Point(0, 1)], r.relativeDoorLocations)
 
 
+    def testRoomReportsFirstInvalidSideThenDoors_ValueError(self):
+        with self.assertRaises(ValueError) as context:
+            Room(Point(0, 0), [
+                [Tile.WALL, Tile.WALL, Tile.WALL],
+                [Tile.EMPTY, Tile.DOOR, Tile.WALL],
+                [Tile.WALL, Tile.EMPTY, Tile.WALL]
+            ])
+        self.assertIn('bottom side', str(context.exception))
+        with self.assertRaises(ValueError) as context:
+            Room(Point(0, 0), [
+                [Tile.DOOR, Tile.WALL, Tile.WALL, Tile.WALL],
+                [Tile.WALL, Tile.DOOR, Tile.EMPTY, Tile.DOOR],
+                [Tile.WALL, Tile.WALL, Tile.WALL, Tile.WALL]
+            ])
+        self.assertIn('(0, 0), (1, 1)', str(context.exception))
+
+
+    def testRoomTrustedSkipsValidation_Success(self):
+        layout = [
+            [Tile.WALL, Tile.WALL, Tile.WALL],
+            [Tile.WALL, Tile.DOOR, Tile.DOOR],
+            [Tile.WALL, Tile.WALL, Tile.WALL]
+        ]
+        with self.assertRaises(ValueError):
+            Room(Point(0, 0), layout)
+        r = Room(Point(0, 0), layout, True)
+        self.assertEqual([Point(1, 1), Point(2, 1)], r.relativeDoorLocations)
+
+
 # ----- end of file ------------------------------------------------------------
 
 
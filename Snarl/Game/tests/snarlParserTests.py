@@ -0,0 +1,51 @@
+#
+# snarlParserTests.py
+# authors: Michael Curley & Drake Moore
+#
+
+from io import StringIO
+from json import dumps
+from levelGenerator import LevelGenerator
+from snarlParser import SnarlParser
+from unittest import TestCase
+
+
+class SnarlParserTests(TestCase):
+    """ tests for the SnarlParser streaming input """
+
+    def setUp(self):
+        generator = LevelGenerator().setRoomCount(3).setSeed(5)
+        self.jsonLevels = [ generator.generateJson() for _ in range(3) ]
+
+
+    def testReadJsonValuesAcrossChunks_Success(self):
+        text = '1 23\n{"a": [1, 2]}\n  "x"  4.5\n'
+        self.assertEqual([1, 23, { 'a': [1, 2] }, 'x', 4.5],
+                list(SnarlParser().readJsonValues(StringIO(text), chunkSize = 1)))
+
+
+    def testReadLevelsIsLazy_Success(self):
+        text = '3\n' + '\n'.join(dumps(level, indent = 2) for level in self.jsonLevels[:2])
+        levels = SnarlParser().readLevels(StringIO(text + '\n{ invalid'))
+        keyLocation, exitLocation, level = next(levels)
+        self.assertEqual(3, len(level.rooms))
+        next(levels)
+        with self.assertRaises(ValueError):
+            next(levels)
+
+
+    def testReadJsonLevelsInvalidCount_ValueError(self):
+        for text in ['', '"3"', '4\n' + '\n'.join(map(dumps, self.jsonLevels)),
+                '2\n' + '\n'.join(map(dumps, self.jsonLevels))]:
+            with self.assertRaises(ValueError):
+                list(SnarlParser().readJsonLevels(StringIO(text)))
+
+
+    def testReadJsonValuesReportsPosition_ValueError(self):
+        with self.assertRaises(ValueError) as context:
+            list(SnarlParser().readJsonValues(StringIO('1\n{"a": \n  ]}'), chunkSize = 2))
+        self.assertIn('line 3 column 3', str(context.exception))
+
+
+
+# ----- end of file ------------------------------------------------------------
@@ -0,0 +1,57 @@
+#
+# tileSamplerTests.py
+# authors: Michael Curley & Drake Moore
+#
+
+from point import Point
+from random import seed
+from tileSampler import TileSampler
+from unittest import TestCase
+
+
+class TileSamplerTests(TestCase):
+    """ tests for the TileSampler object """
+
+    def setUp(self):
+        self.points = [ Point(x, y) for x in range(3) for y in range(2) ]
+        self.sampler = TileSampler(self.points)
+
+
+    def testAddAndRemove_Success(self):
+        self.assertEqual(6, len(self.sampler))
+        self.assertFalse(self.sampler.add(Point(0, 0)))
+        self.assertTrue(self.sampler.remove(Point(0, 0)))
+        self.assertFalse(self.sampler.remove(Point(0, 0)))
+        self.assertNotIn(Point(0, 0), self.sampler)
+        self.assertCountEqual(self.points[1:], self.sampler.points)
+        for point, index in self.sampler.indices.items():
+            self.assertEqual(point, self.sampler.points[index])
+
+
+    def testInsertUndoesRemovals_Success(self):
+        before = list(self.sampler.points)
+        removed = list()
+        for point in [Point(0, 1), Point(2, 1), Point(1, 0)]:
+            removed.append((point, self.sampler.indexOf(point)))
+            self.sampler.remove(point)
+        self.assertIsNone(self.sampler.indexOf(Point(0, 1)))
+        for point, index in reversed(removed):
+            self.sampler.insert(point, index)
+        self.assertEqual(before, self.sampler.points)
+        for point, index in self.sampler.indices.items():
+            self.assertEqual(point, self.sampler.points[index])
+
+
+    def testPopIsSeededAndDrains_Success(self):
+        seed(3)
+        popped = [ self.sampler.pop() for _ in self.points ]
+        self.assertCountEqual(self.points, popped)
+        seed(3)
+        sampler = TileSampler(self.points)
+        self.assertEqual(popped, [ sampler.pop() for _ in self.points ])
+        with self.assertRaises(ValueError):
+            self.sampler.choose()
+
+
+
+# ----- end of file ------------------------------------------------------------
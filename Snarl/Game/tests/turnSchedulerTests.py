@@ -0,0 +1,56 @@
+#
+# turnSchedulerTests.py
+# authors: Michael Curley & Drake Moore
+#
+
+from actor import Player, Zombie
+from turnScheduler import InitiativeScheduler, RoundRobinScheduler
+from unittest import TestCase
+
+
+class TurnSchedulerTests(TestCase):
+    """ tests for the RoundRobinScheduler and InitiativeScheduler objects """
+
+    def setUp(self):
+        self.actors = [Player('a', 'mike'), Player('b', 'drake'),
+                Zombie('zombie0'), Zombie('zombie1')]
+
+
+    def names(self, scheduler, count: int) -> list:
+        return [ scheduler.nextActor().name for _ in range(count) ]
+
+
+    def testRoundRobinSkipsFinishedActors_Success(self):
+        scheduler = RoundRobinScheduler()
+        scheduler.reset(self.actors)
+        self.assertEqual(['mike', 'drake', 'zombie0'], self.names(scheduler, 3))
+        self.actors[1].exited = True
+        self.actors[3].expelled = True
+        self.assertEqual(['mike', 'zombie0', 'mike', 'zombie0'], self.names(scheduler, 4))
+        self.actors[0].expelled = True
+        self.actors[2].expelled = True
+        self.assertIsNone(scheduler.nextActor())
+
+
+    def testInitiativeOrdersByDelay_Success(self):
+        scheduler = InitiativeScheduler(lambda actor: 1 if isinstance(actor, Player) else 2)
+        scheduler.reset(self.actors)
+        self.assertEqual(['mike', 'drake', 'mike', 'drake', 'zombie0', 'zombie1', 'mike'],
+                self.names(scheduler, 7))
+        self.actors[0].exited = True
+        self.assertEqual(['drake', 'drake', 'zombie0', 'zombie1'], self.names(scheduler, 4))
+
+
+    def testInitiativeDefaultIsRoundRobin_Success(self):
+        scheduler = InitiativeScheduler()
+        scheduler.reset(self.actors)
+        self.assertEqual([a.name for a in self.actors] * 2, self.names(scheduler, 8))
+
+
+    def testInitiativeInvalidDelay_ValueError(self):
+        with self.assertRaises(ValueError):
+            InitiativeScheduler(lambda actor: 0).reset(self.actors)
+
+
+
+# ----- end of file ------------------------------------------------------------
@@ -0,0 +1,88 @@
+#
+# tileSampler.py
+# authors: Michael Curley & Drake Moore
+#
+
+from point import Point
+from random import randint
+
+
+class TileSampler:
+    """ represents a set of points with constant time add, remove and uniform
+    random choice, the points are kept in a list alongside a map from each
+    point to its index so a removal swaps the last point into its place, the
+    random module is used so a seeded game samples the same points """
+
+    def __init__(self, points: list = None):
+        """ initializes the sampler with the given points, duplicates are
+        only added once """
+        self.points = list()
+        self.indices = dict()
+        for point in [] if points is None else points:
+            self.add(point)
+
+
+    def add(self, point: Point) -> bool:
+        """ adds the point, returns False if it was already present """
+        if point in self.indices:
+            return False
+        self.indices[point] = len(self.points)
+        self.points.append(point)
+        return True
+
+
+    def remove(self, point: Point) -> bool:
+        """ removes the point, returns False if it was not present """
+        index = self.indices.pop(point, None)
+        if index is None:
+            return False
+        last = self.points.pop()
+        if index != len(self.points):
+            self.points[index] = last
+            self.indices[last] = index
+        return True
+
+
+    def insert(self, point: Point, index: int):
+        """ adds the point at the index, moving the point there to the end,
+        removals are undone exactly (so the same random choices follow) by
+        inserting their points back at their old indices in reverse order """
+        if index == len(self.points):
+            self.points.append(point)
+        else:
+            moved = self.points[index]
+            self.indices[moved] = len(self.points)
+            self.points.append(moved)
+            self.points[index] = point
+        self.indices[point] = index
+
+
+    def indexOf(self, point: Point) -> int:
+        """ returns the index of the point, None if it is not present """
+        return self.indices.get(point, None)
+
+
+    def choose(self) -> Point:
+        """ returns a random point, raises a value error if there are none """
+        if len(self.points) == 0:
+            raise ValueError('There are no points to choose from.')
+        return self.points[randint(0, len(self.points) - 1)]
+
+
+    def pop(self) -> Point:
+        """ removes and returns a random point """
+        point = self.choose()
+        self.remove(point)
+        return point
+
+
+    def __contains__(self, point: Point) -> bool:
+        return point in self.indices
+
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+
+
+# ----- end of file ------------------------------------------------------------
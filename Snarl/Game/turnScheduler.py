@@ -0,0 +1,120 @@
+#
+# turnScheduler.py
+# authors: Michael Curley & Drake Moore
+#
+
+from actor import Actor
+from heapq import heappop, heappush
+
+
+class TurnScheduler:
+    """ represents the order actors take their turns in a level, an actor that
+    has exited or been expelled is finished and never given another turn """
+
+    def reset(self, actors: list):
+        """ starts scheduling the given actors, in their given order """
+        raise NotImplementedError
+
+
+    def nextActor(self) -> Actor:
+        """ returns the actor whose turn is next, or None if every actor is
+        finished """
+        raise NotImplementedError
+
+
+    def isFinished(self, actor: Actor) -> bool:
+        """ returns if the actor will take no more turns in the level """
+        return actor.expelled or actor.exited
+
+
+
+class RoundRobinScheduler(TurnScheduler):
+    """ represents turns taken in the given order, lap after lap, the active
+    actors are kept in a ring (a map to the next and previous actor) so a
+    finished actor is unlinked in constant time the first time it comes up and
+    is never skipped over again """
+
+    def __init__(self):
+        self.reset(list())
+
+
+    def reset(self, actors: list):
+        """ links the actors into a ring starting at the first """
+        self.nextIndex = dict()
+        self.previousIndex = dict()
+        self.actors = list(actors)
+        count = len(self.actors)
+        for i in range(count):
+            self.nextIndex[i] = (i + 1) % count
+            self.previousIndex[i] = (i - 1) % count
+        self.current = 0 if count > 0 else None
+
+
+    def nextActor(self) -> Actor:
+        """ returns the next active actor, unlinking finished actors """
+        while self.current is not None:
+            index = self.current
+            actor = self.actors[index]
+            if not self.isFinished(actor):
+                self.current = self.nextIndex[index]
+                return actor
+            self.__unlink(index)
+        return None
+
+
+    def __unlink(self, index: int):
+        """ removes the actor at the index from the ring, moving the current
+        position on to the next actor """
+        nextIndex = self.nextIndex.pop(index)
+        previousIndex = self.previousIndex.pop(index)
+        if nextIndex == index:
+            self.current = None
+            return
+        self.nextIndex[previousIndex] = nextIndex
+        self.previousIndex[nextIndex] = previousIndex
+        self.current = nextIndex
+
+
+
+class InitiativeScheduler(TurnScheduler):
+    """ represents turns taken by initiative, each actor waits a number of
+    ticks between its turns given by the delay function (an actor with delay 1
+    moves twice as often as one with delay 2), the actor with the earliest
+    turn goes next and ties go in the given order, actors are kept in a heap
+    and finished actors are dropped when they reach the top """
+
+    def __init__(self, delay = None):
+        """ delay is a function of an actor returning a positive int, every
+        actor has a delay of 1 by default (the same order as round robin) """
+        self.delay = (lambda actor: 1) if delay is None else delay
+        self.reset(list())
+
+
+    def reset(self, actors: list):
+        """ schedules every actor's first turn after its delay """
+        self.turns = list()
+        for order, actor in enumerate(actors):
+            heappush(self.turns, (self.__getDelay(actor), order, actor))
+
+
+    def nextActor(self) -> Actor:
+        """ returns the active actor with the earliest turn and schedules its
+        following turn """
+        while len(self.turns) > 0:
+            tick, order, actor = heappop(self.turns)
+            if not self.isFinished(actor):
+                heappush(self.turns, (tick + self.__getDelay(actor), order, actor))
+                return actor
+        return None
+
+
+    def __getDelay(self, actor: Actor) -> int:
+        """ returns the delay of the actor, raises a value error if invalid """
+        delay = self.delay(actor)
+        if not isinstance(delay, int) or delay < 1:
+            raise ValueError('An actor\'s turn delay must be a positive integer.')
+        return delay
+
+
+
+# ----- end of file ------------------------------------------------------------